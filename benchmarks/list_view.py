@@ -0,0 +1,76 @@
+"""
+    Compares list view rendering time of the default list template and
+    the precomputed rows template.
+
+    Usage::
+
+        python benchmarks/list_view.py [rows] [iterations]
+"""
+import sys
+import timeit
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_admin import Admin
+from flask_admin.contrib.sqla import ModelView
+
+
+def create_app(rows):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = '1'
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    db = SQLAlchemy(app)
+
+    class Item(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String(100))
+        description = db.Column(db.Text)
+        price = db.Column(db.Float)
+        active = db.Column(db.Boolean)
+
+    db.create_all()
+    db.session.add_all(Item(name='Item %d' % i,
+                            description='Description <%d>' % i,
+                            price=i * 1.5,
+                            active=bool(i % 2))
+                       for i in range(rows))
+    db.session.commit()
+
+    admin = Admin(app, template_mode='bootstrap3')
+
+    class ItemView(ModelView):
+        page_size = rows
+        can_view_details = True
+        column_editable_list = ['name', 'price']
+
+    class FastItemView(ItemView):
+        list_template = 'admin/model/list_fast.html'
+
+    admin.add_view(ItemView(Item, db.session, endpoint='list'))
+    admin.add_view(FastItemView(Item, db.session, endpoint='list_fast'))
+
+    return app
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    app = create_app(rows)
+    client = app.test_client()
+
+    for endpoint in ('list', 'list_fast'):
+        url = '/admin/%s/' % endpoint
+
+        # Warm up template and formatter caches
+        client.get(url)
+
+        best = min(timeit.repeat(lambda: client.get(url), number=iterations, repeat=3))
+        print('%-10s %d rows: %.2f ms per page' % (endpoint, rows, best * 1000 / iterations))
+
+
+if __name__ == '__main__':
+    main()
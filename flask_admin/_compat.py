@@ -39,6 +39,7 @@ if not PY2:
     # Various tools
     from functools import reduce
     from urllib.parse import urljoin, urlparse
+    from inspect import getfullargspec as getargspec
 else:
     text_type = unicode
     string_types = (str, unicode)
@@ -62,6 +63,7 @@ else:
     # Helpers
     reduce = __builtins__['reduce'] if isinstance(__builtins__, dict) else __builtins__.reduce
     from urlparse import urljoin, urlparse
+    from inspect import getargspec
 
 
 def with_metaclass(meta, *bases):
@@ -1,35 +1,116 @@
 import warnings
+import errno
+import json
 from datetime import datetime
 import os
 import os.path as op
 import platform
 import re
 import shutil
+import stat
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from math import ceil
 from operator import itemgetter
 
-from flask import flash, redirect, abort, request, send_file
+from flask import flash, redirect, abort, request, send_file, Response
 from werkzeug import secure_filename
+from werkzeug.datastructures import FileStorage, MultiDict
 from wtforms import fields, validators
 
 from flask_admin import form, helpers
 from flask_admin._compat import urljoin, as_unicode
+from flask_admin.tools import open_private_file
 from flask_admin.base import BaseView, expose
 from flask_admin.actions import action, ActionsMixin
 from flask_admin.babel import gettext, lazy_gettext
 
+from .uploads import UploadStore
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+
+def get_file_mode(directory):
+    """
+        Return permissions a new file gets in the `directory`.
+
+        Chunked uploads are received into private files and get these
+        permissions once completed, same as files saved by the regular
+        upload. Umask can only be read by changing it for the whole
+        process, so a probe file is created instead.
+
+        :param directory:
+            Directory path
+    """
+    probe = op.join(directory, '.%s.mode' % uuid.uuid4().hex)
+    fd = os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+    try:
+        return stat.S_IMODE(os.fstat(fd).st_mode)
+    finally:
+        os.close(fd)
+        os.remove(probe)
+
+
+def sort_files(items, sort=None, desc=False):
+    """
+        Return sorted copy of the file tuple list.
+
+        :param items:
+            List of file tuples
+        :param sort:
+            Index of the file tuple element to sort by. If not set, files
+            are sorted by name in descending order.
+        :param desc:
+            Sort in descending order
+    """
+    if sort is None:
+        # File names are unique in the directory
+        return sorted(items, key=itemgetter(0), reverse=True)
+
+    return sorted(items, key=itemgetter(sort), reverse=bool(desc))
+
 
 class LocalFileStorage(object):
-    def __init__(self, base_path):
+    def __init__(self, base_path, cache_size=0, upload_dir=None):
         """
             Constructor.
 
             :param base_path:
                 Base file storage location
+            :param cache_size:
+                Maximum number of directory listings to cache. Cached listing
+                is reused while modification time of the directory does not
+                change, least recently used listings are evicted first. Set
+                to 0 to disable the cache.
+
+                Directory modification time only changes when files are
+                added, removed or renamed, so sizes and modification times
+                of the files in the cached listing can be outdated.
+            :param upload_dir:
+                Directory for unfinished chunked uploads. Defaults to the
+                system temporary directory. Files are moved into place with
+                a rename, which is only atomic if both directories are on
+                the same file system.
         """
         self.base_path = as_unicode(base_path)
 
         self.separator = os.sep
 
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.uploads = UploadStore(upload_dir)
+
         if not self.path_exists(self.base_path):
             raise IOError('FileAdmin path "%s" does not exist or is not accessible' % self.base_path)
 
@@ -61,16 +142,109 @@ class LocalFileStorage(object):
             the relative path, a flag signifying if it is a directory, the file
             size in bytes and the time last modified in seconds since the epoch
         """
+        items, _ = self._get_listing(path, directory)
+        return list(items)
+
+    def get_files_page(self, path, directory, offset, limit, sort=None, desc=False):
+        """
+            Gets a window of the directory listing. Returns tuple with
+            the total number of files in the `directory` and list of file
+            tuples in the same format as `get_files`.
+
+            :param path:
+                The path up to the directory
+            :param directory:
+                The directory that will have its files listed
+            :param offset:
+                Number of files to skip
+            :param limit:
+                Maximum number of files to return
+            :param sort:
+                Index of the file tuple element to sort by. If not set,
+                files are sorted by name in descending order.
+            :param desc:
+                Sort in descending order
+
+            Sorted listings are kept along with the cached directory
+            listing, so paging through large directories does not list and
+            sort the directory for every page.
+        """
+        items = self._get_sorted_files(path, directory, sort, desc)
+        return len(items), items[offset:offset + limit]
+
+    def _get_listing(self, path, directory):
+        if not self.cache_size:
+            return self._list_dir(path, directory), {}
+
+        key = (path, op.normpath(directory))
+        mtime = os.stat(directory).st_mtime
+
+        with self._cache_lock:
+            cached = self._cache.pop(key, None)
+            if cached is not None and cached[0] == mtime:
+                self._cache[key] = cached
+                return cached[1], cached[2]
+
+        items = self._list_dir(path, directory)
+        index = {}
+
+        # File system timestamps can be too coarse to notice changes made
+        # right after the listing, so recently modified directories are not cached
+        if time.time() - mtime < 2:
+            return items, index
+
+        with self._cache_lock:
+            self._cache[key] = (mtime, items, index)
+
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return items, index
+
+    def _get_sorted_files(self, path, directory, sort, desc):
+        items, index = self._get_listing(path, directory)
+
+        key = (sort, bool(desc))
+        if key not in index:
+            index[key] = sort_files(items, sort, desc)
+
+        return index[key]
+
+    def _list_dir(self, path, directory):
         items = []
-        for f in os.listdir(directory):
-            fp = op.join(directory, f)
-            rel_path = op.join(path, f)
-            is_dir = self.is_dir(fp)
-            size = op.getsize(fp)
-            last_modified = op.getmtime(fp)
-            items.append((f, rel_path, is_dir, size, last_modified))
+
+        if scandir is None:
+            for f in os.listdir(directory):
+                fp = op.join(directory, f)
+                st = self._stat(fp)
+                items.append((f, op.join(path, f), stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime))
+            return items
+
+        for entry in scandir(directory):
+            try:
+                st = entry.stat()
+            except OSError:
+                # Broken symbolic link
+                st = entry.stat(follow_symlinks=False)
+
+            items.append((entry.name, op.join(path, entry.name),
+                          stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime))
+
         return items
 
+    def _stat(self, path):
+        try:
+            return os.stat(path)
+        except OSError:
+            return os.lstat(path)
+
+    def clear_cache(self):
+        """
+            Remove all cached directory listings
+        """
+        with self._cache_lock:
+            self._cache.clear()
+
     def delete_tree(self, directory):
         """
             Deletes the directory `directory` and all its files and subdirectories
@@ -103,9 +277,13 @@ class LocalFileStorage(object):
 
     def send_file(self, file_path):
         """
-            Sends the file located at `file_path` to the user
+            Sends the file located at `file_path` to the user.
+
+            File is streamed from the disk and response supports
+            conditional and range requests, so interrupted downloads
+            can be resumed.
         """
-        return send_file(file_path)
+        return send_file(file_path, conditional=True)
 
     def save_file(self, path, file_data):
         """
@@ -118,6 +296,70 @@ class LocalFileStorage(object):
         """
         file_data.save(path)
 
+    def start_upload(self, path, size=None):
+        """
+            Start chunked upload of the file and return `Upload` object.
+
+            :param path:
+                Path to save to
+            :param size:
+                Expected file size, if known
+        """
+        upload = self.uploads.create(path, size)
+        open_private_file(upload.part_path).close()
+        return upload
+
+    def write_upload(self, upload, stream):
+        """
+            Append data from the `stream` to the upload.
+
+            :param upload:
+                `Upload` object
+            :param stream:
+                File-like object with the chunk data
+        """
+        with open(upload.part_path, 'r+b') as f:
+            # Drop data of the chunk that failed half way
+            f.seek(upload.offset)
+            f.truncate()
+
+            shutil.copyfileobj(stream, f, 64 * 1024)
+            upload.offset = f.tell()
+
+        upload.save()
+
+    def complete_upload(self, upload):
+        """
+            Move uploaded file into place.
+
+            :param upload:
+                `Upload` object
+        """
+        try:
+            os.rename(upload.part_path, upload.path)
+        except OSError as ex:
+            if ex.errno != errno.EXDEV:
+                raise
+
+            # Upload directory is on another file system, copy the file
+            # next to the destination first, so it still appears atomically
+            tmp_path = op.join(op.dirname(upload.path), '.%s.part' % upload.id)
+            shutil.copyfile(upload.part_path, tmp_path)
+            os.rename(tmp_path, upload.path)
+
+        os.chmod(upload.path, get_file_mode(op.dirname(upload.path)))
+
+        self.uploads.remove(upload)
+
+    def abort_upload(self, upload):
+        """
+            Cancel chunked upload and remove received data.
+
+            :param upload:
+                `Upload` object
+        """
+        self.uploads.remove(upload)
+
 
 class BaseFileAdmin(BaseView, ActionsMixin):
 
@@ -151,6 +393,21 @@ class BaseFileAdmin(BaseView, ActionsMixin):
         Is file and directory renaming allowed.
     """
 
+    upload_chunk_size = None
+    """
+        Size of the chunk in bytes for chunked uploads. If set, upload form
+        sends the file in chunks of this size, so large uploads are not
+        limited by the request size and can be resumed after network errors.
+
+        Requires storage with chunked upload support. S3 storage requires
+        chunks of at least 5 MB.
+
+        Example::
+
+            class MyAdmin(FileAdmin):
+                upload_chunk_size = 8 * 1024 * 1024
+    """
+
     allowed_extensions = None
     """
         List of allowed extensions for uploads, in lower case.
@@ -269,6 +526,25 @@ class BaseFileAdmin(BaseView, ActionsMixin):
     date_format = '%Y-%m-%d %H:%M:%S'
     """Date column display format."""
 
+    page_size = None
+    """
+        Number of files to display on one page. Pagination is disabled
+        by default.
+
+        Storage backends that implement `get_files_page` only return files
+        for the requested page, others list the whole directory.
+
+        If `is_accessible_path` is overridden, the whole directory is
+        listed and filtered before it is split into pages, so pages and
+        page count only include accessible files.
+
+        Note that `S3Storage` can only page through the keys in ascending
+        order, so unsorted paged S3 listings are ordered by name in
+        ascending order, while other storages and unpaged listings order
+        files by name in descending order. Sorting by a column lists the
+        whole S3 directory and orders files the same way as other storages.
+    """
+
     def __init__(self, base_url=None, name=None, category=None, endpoint=None,
                  url=None, verify_path=True, menu_class_name=None,
                  menu_icon_type=None, menu_icon_value=None, storage=None):
@@ -331,6 +607,38 @@ class BaseFileAdmin(BaseView, ActionsMixin):
         """
         return self.storage.get_base_path()
 
+    def get_files_page(self, path, directory, offset, limit, sort=None, desc=False):
+        """
+            Return tuple with the number of accessible files in the
+            directory, or `None` if storage can not count them, and list of
+            accessible files for the requested page.
+
+            :param path:
+                Relative path of the directory
+            :param directory:
+                Full path of the directory
+            :param offset:
+                Number of files to skip
+            :param limit:
+                Maximum number of files to return
+            :param sort:
+                Index of the column in `possible_columns` to sort by. If not
+                set, files are returned in the storage default order.
+            :param desc:
+                Sort in descending order
+        """
+        # Storage does not know about custom access checks, so files are
+        # filtered before the page is cut out of the listing
+        custom_access = type(self).is_accessible_path != BaseFileAdmin.is_accessible_path
+
+        if hasattr(self.storage, 'get_files_page') and not custom_access:
+            return self.storage.get_files_page(path, directory, offset, limit, sort, desc)
+
+        items = [item for item in self.storage.get_files(path, directory)
+                 if self.is_accessible_path(item[1])]
+        items = sort_files(items, sort, desc)
+        return len(items), items[offset:offset + limit]
+
     def get_base_url(self):
         """
             Return base URL. Override to customize behavior (per-user
@@ -802,35 +1110,45 @@ class BaseFileAdmin(BaseView, ActionsMixin):
             flash(gettext('Permission denied.'), 'error')
             return redirect(self._get_dir_url('.index_view'))
 
+        sort_column = request.args.get('sort', None, type=str)
+        sort_desc = request.args.get('desc', 0, type=int)
+        page = request.args.get('page', 0, type=int)
+
+        if sort_column is None:
+            column_index = None
+        else:
+            column_index = self.possible_columns.index(sort_column)
+
         # Get directory listing
         items = []
 
         # Parent directory
-        if directory != base_path:
+        if directory != base_path and (not self.page_size or page == 0):
             parent_path = op.normpath(self._separator.join([path, '..']))
             if parent_path == '.':
                 parent_path = None
 
             items.append(('..', parent_path, True, 0, 0))
 
-        for item in self.storage.get_files(path, directory):
-            file_name, rel_path, is_dir, size, last_modified = item
-            if self.is_accessible_path(rel_path):
-                items.append(item)
+        num_pages = None
+        have_next = False
 
-        sort_column = request.args.get('sort', None, type=str)
-        sort_desc = request.args.get('desc', 0, type=int)
+        if self.page_size:
+            count, files = self.get_files_page(path, directory, page * self.page_size,
+                                               self.page_size + 1, column_index, sort_desc)
 
-        if sort_column is None:
-            # Sort by name
-            items.sort(key=itemgetter(0))
-            # Sort by type
-            items.sort(key=itemgetter(2), reverse=True)
-            # Sort by modified date
-            items.sort(key=lambda x: (x[0], x[1], x[2], x[3], datetime.fromtimestamp(x[4])), reverse=True)
+            have_next = len(files) > self.page_size
+            if count is not None:
+                num_pages = int(ceil(count / float(self.page_size)))
+
+            items.extend(files[:self.page_size])
         else:
-            column_index = self.possible_columns.index(sort_column)
-            items.sort(key=itemgetter(column_index), reverse=sort_desc)
+            for item in self.storage.get_files(path, directory):
+                file_name, rel_path, is_dir, size, last_modified = item
+                if self.is_accessible_path(rel_path):
+                    items.append(item)
+
+            items = sort_files(items, column_index, sort_desc)
 
         # Generate breadcrumbs
         breadcrumbs = self._get_breadcrumbs(path)
@@ -850,6 +1168,13 @@ class BaseFileAdmin(BaseView, ActionsMixin):
 
             return self.get_url('.index_view', sort=column, desc=desc)
 
+        def pager_url(p):
+            if p == 0:
+                p = None
+
+            return self._get_dir_url('.index_view', path, sort=sort_column,
+                                     desc=sort_desc or None, page=p)
+
         return self.render(self.list_template,
                            dir_path=path,
                            breadcrumbs=breadcrumbs,
@@ -863,6 +1188,10 @@ class BaseFileAdmin(BaseView, ActionsMixin):
                            sort_column=sort_column,
                            sort_desc=sort_desc,
                            sort_url=sort_url,
+                           page=page,
+                           num_pages=num_pages,
+                           have_next=have_next,
+                           pager_url=pager_url,
                            timestamp_format=self.timestamp_format)
 
     @expose('/upload/', methods=('GET', 'POST'))
@@ -900,9 +1229,177 @@ class BaseFileAdmin(BaseView, ActionsMixin):
         else:
             template = self.upload_template
 
+        if self._can_upload_chunks():
+            chunked_upload_url = self._get_dir_url('.chunked_upload_start', path)
+        else:
+            chunked_upload_url = None
+
         return self.render(template, form=form,
                            header_text=gettext('Upload File'),
-                           modal=request.args.get('modal'))
+                           modal=request.args.get('modal'),
+                           chunked_upload_url=chunked_upload_url)
+
+    def _can_upload_chunks(self):
+        return (self.can_upload and self.upload_chunk_size and
+                hasattr(self.storage, 'start_upload'))
+
+    def _upload_response(self, data, status=200):
+        return Response(json.dumps(data), status=status, mimetype='application/json')
+
+    def _get_upload_info(self, upload):
+        return dict(id=upload.id,
+                    offset=upload.offset,
+                    size=upload.size,
+                    chunk_size=self.upload_chunk_size,
+                    url=self.get_url('.chunked_upload', upload_id=upload.id),
+                    complete_url=self.get_url('.chunked_upload_complete', upload_id=upload.id))
+
+    def _validate_chunked_upload(self, filename):
+        """
+            Validate chunked upload request with the upload form, so CSRF
+            protection and file checks of the regular upload apply to every
+            request that changes the upload. Returns error message or `None`.
+        """
+        if request.method == 'PUT':
+            # Request body is the chunk data
+            formdata = MultiDict()
+        else:
+            formdata = request.form.copy()
+
+        csrf_token = request.headers.get('X-CSRFToken')
+        if csrf_token and 'csrf_token' not in formdata:
+            formdata['csrf_token'] = csrf_token
+
+        formdata['upload'] = FileStorage(filename=filename)
+
+        upload_form = self.get_upload_form()(formdata, admin=self)
+        if upload_form.validate():
+            return None
+
+        for errors in upload_form.errors.values():
+            return errors[0]
+
+    def _get_chunked_upload(self, upload_id):
+        if not self._can_upload_chunks():
+            abort(404)
+
+        upload = self.storage.uploads.get(upload_id)
+        if upload is None or upload.data.get('endpoint') != self.endpoint:
+            abort(404)
+
+        if not self.is_accessible_path(upload.data['dir_path']):
+            abort(403)
+
+        return upload
+
+    @expose('/upload/chunked/', methods=('POST',))
+    @expose('/upload/chunked/<path:path>', methods=('POST',))
+    def chunked_upload_start(self, path=None):
+        """
+            Start chunked upload of the file to the directory. Expects
+            `filename` and optional `size` form fields and returns upload
+            state as JSON.
+
+            Client sends chunks with `PUT` requests to the returned `url`
+            with `offset` argument and completes upload with `POST` request
+            to the `complete_url`. If chunk was not received, `GET` request
+            to the `url` returns the offset to resume from.
+
+            :param path:
+                Optional directory path. If not provided, will use the base directory
+        """
+        if not self._can_upload_chunks():
+            abort(404)
+
+        base_path, directory, path = self._normalize_path(path)
+
+        if not self.is_accessible_path(path):
+            abort(403)
+
+        filename = secure_filename(request.form.get('filename', ''))
+
+        error = self._validate_chunked_upload(filename)
+        if error:
+            return self._upload_response({'error': error}, 400)
+
+        full_path = self._separator.join([directory, filename])
+        if self.storage.path_exists(full_path):
+            error = gettext('File "%(name)s" already exists.',
+                            name=self._separator.join([path, filename]))
+            return self._upload_response({'error': error}, 409)
+
+        upload = self.storage.start_upload(full_path, request.form.get('size', None, type=int))
+
+        # Keep arguments for the on_file_upload
+        upload.data['directory'] = directory
+        upload.data['dir_path'] = path
+        upload.data['endpoint'] = self.endpoint
+        upload.save()
+
+        return self._upload_response(self._get_upload_info(upload))
+
+    @expose('/upload/chunked/<upload_id>/', methods=('GET', 'PUT', 'DELETE'))
+    def chunked_upload(self, upload_id):
+        """
+            Receive the chunk of the file, return upload state or cancel
+            the upload.
+
+            :param upload_id:
+                Upload id
+        """
+        upload = self._get_chunked_upload(upload_id)
+
+        if request.method != 'GET':
+            error = self._validate_chunked_upload(op.basename(upload.path))
+            if error:
+                return self._upload_response({'error': error}, 400)
+
+        if request.method == 'DELETE':
+            self.storage.abort_upload(upload)
+            return self._upload_response({'id': upload.id})
+
+        if request.method == 'PUT':
+            # Chunk was already received or the previous one is missing,
+            # client should resume from the current offset
+            if request.args.get('offset', type=int) != upload.offset:
+                return self._upload_response(self._get_upload_info(upload), 409)
+
+            self.storage.write_upload(upload, request.stream)
+
+        return self._upload_response(self._get_upload_info(upload))
+
+    @expose('/upload/chunked/<upload_id>/complete/', methods=('POST',))
+    def chunked_upload_complete(self, upload_id):
+        """
+            Move uploaded file into place.
+
+            :param upload_id:
+                Upload id
+        """
+        upload = self._get_chunked_upload(upload_id)
+
+        error = self._validate_chunked_upload(op.basename(upload.path))
+        if error:
+            return self._upload_response({'error': error}, 400)
+
+        if upload.size is not None and upload.offset != upload.size:
+            return self._upload_response(self._get_upload_info(upload), 409)
+
+        directory = upload.data['directory']
+        path = upload.data['dir_path']
+        filename = op.basename(upload.path)
+
+        if self.storage.path_exists(upload.path):
+            error = gettext('File "%(name)s" already exists.',
+                            name=self._separator.join([path, filename]))
+            return self._upload_response({'error': error}, 409)
+
+        self.storage.complete_upload(upload)
+        self.on_file_upload(directory, path, upload.path)
+
+        flash(gettext('Successfully saved file: %(name)s', name=filename), 'success')
+
+        return self._upload_response({'url': self._get_dir_url('.index_view', path)})
 
     @expose('/download/<path:path>')
     def download(self, path=None):
@@ -1206,6 +1703,16 @@ class FileAdmin(BaseFileAdmin):
             admin.add_view(FileAdmin(path, '/static/', name='Static Files'))
     """
 
+    listing_cache_size = 0
+    """
+        Maximum number of directory listings to cache. Cached listing is
+        reused until modification time of the directory changes.
+
+        Disabled by default, because sizes and modification times of the
+        files in the cached listing are not updated when files are changed
+        in place.
+    """
+
     def __init__(self, base_path, *args, **kwargs):
-        storage = LocalFileStorage(base_path)
+        storage = LocalFileStorage(base_path, cache_size=self.listing_cache_size)
         super(FileAdmin, self).__init__(*args, storage=storage, **kwargs)
@@ -1,16 +1,22 @@
 import time
+import shutil
+import tempfile
+from collections import OrderedDict
 
 try:
     from boto import s3
     from boto.s3.prefix import Prefix
     from boto.s3.key import Key
+    from boto.s3.multipart import MultiPartUpload
 except ImportError:
     s3 = None
 
-from flask import redirect
+from flask import g, has_request_context, redirect
 from flask_admin.babel import gettext
+from flask_admin.model.cache import MemoryListCache
 
-from . import BaseFileAdmin
+from . import BaseFileAdmin, sort_files
+from .uploads import UploadStore
 
 
 class S3Storage(object):
@@ -31,7 +37,8 @@ class S3Storage(object):
     """
 
     def __init__(self, bucket_name, region, aws_access_key_id,
-                 aws_secret_access_key):
+                 aws_secret_access_key, cache_timeout=0, upload_dir=None,
+                 cache_size=1000):
         """
             Constructor
 
@@ -47,6 +54,21 @@ class S3Storage(object):
                 :param aws_secret_access_key:
                     AWS Secret Access Key
 
+                :param cache_timeout:
+                    Number of seconds to keep directory listings and key
+                    lookups between requests. Results are always reused
+                    within one request. Cache is cleared when files are
+                    changed through the storage, but changes made by other
+                    processes are not visible until the cache expires.
+
+                :param upload_dir:
+                    Directory for the state of unfinished chunked uploads.
+                    Defaults to the system temporary directory.
+
+                :param cache_size:
+                    Maximum number of cached listings and key lookups,
+                    least recently used entries are evicted first.
+
             Make sure the credentials have the correct permissions set up on
             Amazon or else S3 will return a 403 FORBIDDEN error.
         """
@@ -63,7 +85,59 @@ class S3Storage(object):
         self.bucket = connection.get_bucket(bucket_name)
         self.separator = '/'
 
-    def get_files(self, path, directory):
+        self.marker_cache_size = 1000
+        self._markers = OrderedDict()
+
+        self.cache_timeout = cache_timeout
+        self.cache_size = cache_size
+        self._cache = MemoryListCache(cache_size, cache_timeout)
+
+        self.uploads = UploadStore(upload_dir)
+
+    def _get_request_cache(self):
+        if not has_request_context():
+            return None
+
+        caches = g.__dict__.setdefault('_admin_s3_cache', {})
+        return caches.setdefault(id(self), {})
+
+    def _cached(self, key, func):
+        request_cache = self._get_request_cache()
+        if request_cache is not None and key in request_cache:
+            return request_cache[key]
+
+        value = None
+        if self.cache_timeout:
+            # Expired entries are removed on lookup
+            value = self._cache.get(key)
+
+        if value is None:
+            value = func()
+
+            if self.cache_timeout:
+                self._cache.set(key, value)
+
+        if request_cache is not None:
+            request_cache[key] = value
+
+        return value
+
+    def clear_cache(self):
+        """
+            Remove cached listings and key lookups
+        """
+        self._cache = MemoryListCache(self.cache_size, self.cache_timeout)
+
+        request_cache = self._get_request_cache()
+        if request_cache is not None:
+            request_cache.clear()
+
+    def _get_list_prefix(self, path):
+        if path and not path.endswith(self.separator):
+            path += self.separator
+        return path
+
+    def _get_file_item(self, key, path):
         def _strip_path(name, path):
             if name.startswith(path):
                 return name.replace(path, '', 1)
@@ -76,44 +150,113 @@ class S3Storage(object):
             dt = time.strptime(timestamp.split(".")[0], "%Y-%m-%dT%H:%M:%S")
             return int(time.mktime(dt))
 
+        if isinstance(key, Prefix):
+            name = _remove_trailing_slash(_strip_path(key.name, path))
+            key_name = _remove_trailing_slash(key.name)
+            return (name, key_name, True, 0, 0)
+
+        last_modified = _iso_to_epoch(key.last_modified)
+        name = _strip_path(key.name, path)
+        return (name, key.name, False, key.size, last_modified)
+
+    def _list_prefix(self, prefix):
+        return self._cached(('list', prefix),
+                            lambda: list(self.bucket.list(prefix, self.separator)))
+
+    def get_files(self, path, directory):
         files = []
         directories = []
-        if path and not path.endswith(self.separator):
-            path += self.separator
-        for key in self.bucket.list(path, self.separator):
+        path = self._get_list_prefix(path)
+        for key in self._list_prefix(path):
             if key.name == path:
                 continue
-            if isinstance(key, Prefix):
-                name = _remove_trailing_slash(_strip_path(key.name, path))
-                key_name = _remove_trailing_slash(key.name)
-                directories.append((name, key_name, True, 0, 0))
+            item = self._get_file_item(key, path)
+            if item[2]:
+                directories.append(item)
             else:
-                last_modified = _iso_to_epoch(key.last_modified)
-                name = _strip_path(key.name, path)
-                files.append((name, key.name, False, key.size, last_modified))
+                files.append(item)
         return directories + files
 
-    def _get_bucket_list_prefix(self, path):
-        parts = path.split(self.separator)
-        if len(parts) == 1:
-            search = ''
-        else:
-            search = self.separator.join(parts[:-1]) + self.separator
-        return search
+    def get_files_page(self, path, directory, offset, limit, sort=None, desc=False):
+        """
+            Gets a window of the directory listing in the key order.
+
+            S3 can not count keys or skip to an offset, so the listing
+            resumes from the marker remembered for the page boundary and
+            the number of files is not reported. Sorting by anything but
+            the ascending name lists the whole directory.
 
-    def _get_path_keys(self, path):
-        search = self._get_bucket_list_prefix(path)
-        return {key.name for key in self.bucket.list(search, self.separator)}
+            Unlike other storages, unsorted listing is ordered by name in
+            ascending order, because S3 only lists keys in this order.
+        """
+        if sort not in (None, 0) or desc:
+            items = sort_files(self.get_files(path, directory), sort, desc)
+            return len(items), items[offset:offset + limit]
+
+        prefix = self._get_list_prefix(path)
+
+        position = offset
+        marker = self._markers.get((prefix, offset))
+        if marker is None:
+            position, marker = 0, ''
+
+        items = []
+
+        while len(items) < limit:
+            keys = self.bucket.get_all_keys(prefix=prefix, delimiter=self.separator,
+                                            marker=marker, max_keys=1000)
+
+            for key in keys:
+                marker = key.name
+
+                if key.name == prefix:
+                    continue
+
+                if position >= offset:
+                    items.append(self._get_file_item(key, prefix))
+
+                position += 1
+
+                # Remember page boundaries, so next pages do not list
+                # the directory from the beginning
+                if position in (offset + limit - 1, offset + limit):
+                    self._set_marker(prefix, position, marker)
+
+                if len(items) == limit:
+                    break
+
+            if not keys.is_truncated:
+                break
+
+        return None, items
+
+    def _set_marker(self, prefix, position, marker):
+        self._markers.pop((prefix, position), None)
+        self._markers[(prefix, position)] = marker
+
+        while len(self._markers) > self.marker_cache_size:
+            self._markers.popitem(last=False)
+
+    def _key_exists(self, name):
+        return self._cached(('key', name),
+                            lambda: self.bucket.get_key(name) is not None)
+
+    def _prefix_exists(self, prefix):
+        def _exists():
+            return len(self.bucket.get_all_keys(prefix=prefix, max_keys=1)) > 0
+
+        return self._cached(('prefix', prefix), _exists)
 
     def is_dir(self, path):
-        keys = self._get_path_keys(path)
-        return path + self.separator in keys
+        # Directories are usually created with an empty marker key, but
+        # keys can be uploaded under a prefix without it
+        prefix = path + self.separator
+        return self._key_exists(prefix) or self._prefix_exists(prefix)
 
     def path_exists(self, path):
         if path == '':
             return True
-        keys = self._get_path_keys(path)
-        return path in keys or (path + self.separator) in keys
+        return self._key_exists(path) or self.is_dir(path)
 
     def get_base_path(self):
         return ''
@@ -135,18 +278,63 @@ class S3Storage(object):
     def save_file(self, path, file_data):
         key = Key(self.bucket, path)
         key.set_contents_from_file(file_data.stream)
+        self.clear_cache()
+
+    def _get_multipart_upload(self, upload):
+        mp = MultiPartUpload(self.bucket)
+        mp.key_name = upload.path
+        mp.id = upload.data['upload_id']
+        return mp
+
+    def start_upload(self, path, size=None):
+        """
+            Start S3 multipart upload. Every chunk is uploaded as a separate
+            part, so all chunks but the last should be at least 5 MB.
+
+            Abandoned multipart uploads are not cancelled automatically,
+            configure bucket lifecycle rule to remove them.
+        """
+        mp = self.bucket.initiate_multipart_upload(path)
+        return self.uploads.create(path, size, upload_id=mp.id, parts=0)
+
+    def write_upload(self, upload, stream):
+        # Part size should be known before the upload, so the chunk is
+        # spooled to a temporary file if it does not fit in memory
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as f:
+            shutil.copyfileobj(stream, f, 64 * 1024)
+            size = f.tell()
+            f.seek(0)
+
+            part_num = upload.data['parts'] + 1
+            self._get_multipart_upload(upload).upload_part_from_file(f, part_num, size=size)
+
+        upload.data['parts'] = part_num
+        upload.offset += size
+        upload.save()
+
+    def complete_upload(self, upload):
+        self._get_multipart_upload(upload).complete_upload()
+        self.uploads.remove(upload)
+        self.clear_cache()
+
+    def abort_upload(self, upload):
+        self._get_multipart_upload(upload).cancel_upload()
+        self.uploads.remove(upload)
 
     def delete_tree(self, directory):
         self._check_empty_directory(directory)
         self.bucket.delete_key(directory + self.separator)
+        self.clear_cache()
 
     def delete_file(self, file_path):
         self.bucket.delete_key(file_path)
+        self.clear_cache()
 
     def make_dir(self, path, directory):
         dir_path = self.separator.join([path, (directory + self.separator)])
         key = Key(self.bucket, dir_path)
         key.set_contents_from_string('')
+        self.clear_cache()
 
     def _check_empty_directory(self, path):
         if not self._is_directory_empty(path):
@@ -163,8 +351,10 @@ class S3Storage(object):
         self.delete_file(src)
 
     def _is_directory_empty(self, path):
-        keys = self._get_path_keys(path + self.separator)
-        return len(keys) == 1
+        # Not cached, directory is about to be changed
+        prefix = path + self.separator
+        keys = self.bucket.get_all_keys(prefix=prefix, delimiter=self.separator, max_keys=2)
+        return all(key.name == prefix for key in keys)
 
 
 class S3FileAdmin(BaseFileAdmin):
@@ -193,8 +383,16 @@ class S3FileAdmin(BaseFileAdmin):
             admin.add_view(S3FileAdmin('files_bucket', 'us-east-1', 'key_id', 'secret_key')
     """
 
+    listing_cache_timeout = 0
+    """
+        Number of seconds to keep bucket listings and key lookups between
+        requests. Disabled by default, so changes made outside of the admin
+        are visible immediately.
+    """
+
     def __init__(self, bucket_name, region, aws_access_key_id,
                  aws_secret_access_key, *args, **kwargs):
         storage = S3Storage(bucket_name, region, aws_access_key_id,
-                            aws_secret_access_key)
+                            aws_secret_access_key,
+                            cache_timeout=self.listing_cache_timeout)
         super(S3FileAdmin, self).__init__(*args, storage=storage, **kwargs)
@@ -0,0 +1,171 @@
+import os
+import re
+import json
+import time
+import uuid
+import tempfile
+
+from flask_admin.tools import make_private_dir, open_private_file
+
+
+upload_id_re = re.compile('^[0-9a-f]{32}$')
+
+
+class Upload(object):
+    """
+        State of the chunked upload.
+
+        `offset` is the number of bytes received so far, `data` keeps
+        storage specific state, like S3 multipart upload id.
+    """
+    def __init__(self, store, id, path, size=None, offset=0, data=None,
+                 created=None):
+        self.store = store
+        self.id = id
+        self.path = path
+        self.size = size
+        self.offset = offset
+        self.data = data or {}
+        self.created = created or time.time()
+
+    @property
+    def part_path(self):
+        """
+            Path of the temporary file with received data.
+        """
+        return self.store.get_path(self.id, 'part')
+
+    def save(self):
+        """
+            Save upload state to the store.
+        """
+        self.store.save(self)
+
+    def to_dict(self):
+        return dict(id=self.id,
+                    path=self.path,
+                    size=self.size,
+                    offset=self.offset,
+                    data=self.data,
+                    created=self.created)
+
+
+class UploadStore(object):
+    """
+        Keeps track of the chunked uploads.
+
+        Upload state is stored as a JSON file in the `directory`, so
+        chunks of the same upload can be handled by different worker
+        processes on the same host. The directory is only accessible by
+        the user that runs the application and upload files are only
+        readable by this user.
+    """
+    def __init__(self, directory=None, timeout=86400):
+        """
+            Constructor.
+
+            :param directory:
+                Directory for upload state and temporary files. Defaults to
+                `flask-admin-uploads-<uid>` in the system temporary directory.
+            :param timeout:
+                Number of seconds to keep unfinished uploads after their
+                last chunk
+        """
+        if directory is None:
+            suffix = '-%s' % os.getuid() if hasattr(os, 'getuid') else ''
+            directory = os.path.join(tempfile.gettempdir(), 'flask-admin-uploads' + suffix)
+
+        self.directory = directory
+        self.timeout = timeout
+
+    def get_path(self, id, ext):
+        """
+            Return path of the upload file.
+
+            :param id:
+                Upload id
+            :param ext:
+                File extension
+        """
+        return os.path.join(self.directory, '%s.%s' % (id, ext))
+
+    def create(self, path, size=None, **data):
+        """
+            Create new upload.
+
+            :param path:
+                Path of the file in the storage
+            :param size:
+                Expected file size, if known
+        """
+        make_private_dir(self.directory)
+
+        self.cleanup()
+
+        upload = Upload(self, uuid.uuid4().hex, path, size=size, data=data)
+        upload.save()
+
+        return upload
+
+    def get(self, id):
+        """
+            Return upload by id or `None` if upload does not exist.
+
+            :param id:
+                Upload id
+        """
+        if not id or not upload_id_re.match(id):
+            return None
+
+        try:
+            with open(self.get_path(id, 'json')) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        return Upload(self, **data)
+
+    def save(self, upload):
+        """
+            Store upload state.
+
+            :param upload:
+                Upload to store
+        """
+        path = self.get_path(upload.id, 'json')
+        tmp_path = '%s.%s' % (path, uuid.uuid4().hex)
+
+        with open_private_file(tmp_path, 'w') as f:
+            json.dump(upload.to_dict(), f)
+
+        # Replace state file atomically, so readers never see partial state
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+
+    def remove(self, upload):
+        """
+            Remove upload state and temporary file.
+
+            :param upload:
+                Upload to remove
+        """
+        for ext in ('json', 'part'):
+            try:
+                os.remove(self.get_path(upload.id, ext))
+            except OSError:
+                pass
+
+    def cleanup(self):
+        """
+            Remove state and temporary files of uploads that did not
+            receive data for `timeout` seconds.
+        """
+        now = time.time()
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+
+            try:
+                if now - os.path.getmtime(path) > self.timeout:
+                    os.remove(path)
+            except OSError:
+                pass
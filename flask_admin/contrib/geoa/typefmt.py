@@ -1,23 +1,26 @@
+import json
+
 from flask_admin.contrib.sqla.typefmt import DEFAULT_FORMATTERS as BASE_FORMATTERS
 from jinja2 import Markup
 from wtforms.widgets import html_params
 from geoalchemy2.shape import to_shape
 from geoalchemy2.elements import WKBElement
-from sqlalchemy import func
+from shapely.geometry import mapping
 
 
 def geom_formatter(view, value):
+    # Convert WKB to GeoJSON locally, so rendering a geometry
+    # does not need a database round trip
+    shape = to_shape(value)
     params = html_params(**{
         "data-role": "leaflet",
         "disabled": "disabled",
         "data-width": 100,
         "data-height": 70,
-        "data-geometry-type": to_shape(value).geom_type,
+        "data-geometry-type": shape.geom_type,
         "data-zoom": 15,
     })
-    if value.srid is -1:
-        value.srid = 4326
-    geojson = view.session.query(view.model).with_entities(func.ST_AsGeoJSON(value)).scalar()
+    geojson = json.dumps(mapping(shape), separators=(',', ':'))
     return Markup('<textarea %s>%s</textarea>' % (params, geojson))
 
 
@@ -48,6 +48,14 @@ class QueryAjaxModelLoader(AjaxModelLoader):
     def get_one(self, pk):
         return self.model.objects.filter(id=pk).first()
 
+    def get_many(self, pks):
+        if not pks:
+            return []
+
+        models = dict((as_unicode(m.id), m) for m in self.model.objects.filter(id__in=pks))
+
+        return [models.get(as_unicode(pk)) for pk in pks]
+
     def get_list(self, term, offset=0, limit=DEFAULT_PAGE_SIZE):
         query = self.model.objects
 
@@ -1,19 +1,25 @@
 import logging
+from functools import partial
 
 from flask import request, flash, abort, Response, current_app
 from six import string_types
+from werkzeug.wsgi import wrap_file
 
 from flask_admin import expose
 from flask_admin.babel import gettext, ngettext, lazy_gettext
 from flask_admin.model import BaseModelView
 from flask_admin.model.form import create_editable_list_form
 from flask_admin._compat import iteritems, string_types, as_unicode
+from flask_admin.tools import iterchunks
 
 import mongoengine
 import gridfs
 from mongoengine.connection import get_db
+from mongoengine.base import BaseList
 from mongoengine.fields import ObjectIdField, ReferenceField, ListField, EmbeddedDocumentField
 from bson.objectid import ObjectId
+from bson.dbref import DBRef
+from pymongo.errors import PyMongoError
 from wtforms.validators import ValidationError as wtfValidationError
 from flask_admin.actions import action
 from .filters import (
@@ -97,6 +103,16 @@ class ModelView(BaseModelView):
                 ]
     """
 
+    column_auto_select_related = True
+    """
+        Load documents referenced by the displayed `ReferenceField` and
+        `ListField(ReferenceField)` columns in batches, with a single
+        ``$in`` query per referenced collection for every page (or chunk of
+        exported documents), instead of one query per document.
+
+        Only the first level of references is loaded this way.
+    """
+
     model_form_converter = CustomModelConverter
     """
         Model form conversion class. Use this to implement custom
@@ -549,8 +565,143 @@ class ModelView(BaseModelView):
 
         return query.filter(criteria)
 
+    def _get_projection(self, columns=None):
+        """
+            Return list of document fields that should be loaded for the
+            columns or `None` if all fields should be loaded.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        names = self._get_projection_names(columns)
+
+        if names is None:
+            return None
+
+        fields = []
+
+        for name in names:
+            key = name.split('.')[0]
+
+            # Virtual columns can use any field
+            if key not in self.model._fields:
+                return None
+
+            if key not in fields:
+                fields.append(key)
+
+        return fields
+
+    def _get_select_related(self, columns=None):
+        """
+            Return names of the reference fields used by the columns.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        if not self.column_auto_select_related:
+            return []
+
+        if columns is None:
+            columns = self._list_columns
+
+        fields = []
+
+        for name, _ in columns:
+            if not isinstance(name, string_types):
+                continue
+
+            key = name.split('.')[0]
+            field = self.model._fields.get(key)
+
+            if isinstance(field, ListField):
+                field = field.field
+
+            if isinstance(field, ReferenceField) and key not in fields:
+                fields.append(key)
+
+        return fields
+
+    def _select_related(self, models, fields):
+        """
+            Replace references in `fields` of the documents with referenced
+            documents, using one query per referenced collection.
+
+            :param models:
+                List of documents
+            :param fields:
+                Names of the reference fields
+        """
+        if not models or not fields:
+            return models
+
+        # Collect referenced ids for every document class
+        ids = {}
+
+        for name in fields:
+            field = self.model._fields[name]
+            document_type = getattr(field, 'field', field).document_type
+
+            for model in models:
+                value = model._data.get(name)
+                values = value if isinstance(value, list) else [value]
+
+                for v in values:
+                    if isinstance(v, DBRef):
+                        ids.setdefault(document_type, set()).add(v.id)
+
+        documents = {}
+
+        for document_type, type_ids in iteritems(ids):
+            documents[document_type] = document_type.objects.in_bulk(list(type_ids))
+
+        for name in fields:
+            field = self.model._fields[name]
+            loaded = documents.get(getattr(field, 'field', field).document_type, {})
+
+            for model in models:
+                value = model._data.get(name)
+
+                if isinstance(value, DBRef):
+                    model._data[name] = loaded.get(value.id, value)
+                elif isinstance(value, list):
+                    value = BaseList([loaded.get(v.id, v) if isinstance(v, DBRef) else v for v in value],
+                                     model, name)
+                    value._dereferenced = True
+                    model._data[name] = value
+
+        return models
+
+    def _iter_export_query(self, query, fields):
+        chunk = []
+
+        for model in query:
+            chunk.append(model)
+
+            if len(chunk) >= self.export_chunk_size:
+                for m in self._select_related(chunk, fields):
+                    yield m
+
+                chunk = []
+
+        for m in self._select_related(chunk, fields):
+            yield m
+
+    def _estimate_count(self, query):
+        """
+            Return estimated number of documents in the collection from its
+            metadata. Not available if query has any criteria.
+
+            :param query:
+                Query with applied search and filters
+        """
+        if query._query:
+            return None
+
+        return self.model._get_collection().estimated_document_count()
+
     def get_list(self, page, sort_column, sort_desc, search, filters,
-                 execute=True, page_size=None):
+                 execute=True, page_size=None, columns=None, count_strategy=None):
         """
             Get list of objects from MongoEngine
 
@@ -570,6 +721,11 @@ class ModelView(BaseModelView):
                 Number of results. Defaults to ModelView's page_size. Can be
                 overriden to change the page_size limit. Removing the page_size
                 limit requires setting page_size to 0 or False.
+            :param columns:
+                List of (name, label) tuples of the columns to load if
+                `column_auto_projection` is enabled. Defaults to list view columns.
+            :param count_strategy:
+                Overrides `count_strategy` of the view
         """
         query = self.get_query()
 
@@ -584,7 +740,17 @@ class ModelView(BaseModelView):
             query = self._search(query, search)
 
         # Get count
-        count = query.count() if not self.simple_list_pager else None
+        if not self.simple_list_pager:
+            count = self._get_list_count(search, filters, query.count,
+                                         partial(self._estimate_count, query),
+                                         count_strategy)
+        else:
+            count = None
+
+        # Load only displayed fields
+        projection = self._get_projection(columns)
+        if projection:
+            query = query.only(*projection)
 
         # Sorting
         if sort_column:
@@ -606,10 +772,24 @@ class ModelView(BaseModelView):
             query = query.skip(page * page_size)
 
         if execute:
-            query = query.all()
+            query = self._select_related(list(query), self._get_select_related(columns))
 
         return count, query
 
+    def get_export_list(self, sort_column, sort_desc, search, filters):
+        """
+            Return records to export. Documents are fetched in batches of
+            `export_chunk_size` and are not cached by the queryset.
+            Referenced documents are loaded once per batch.
+        """
+        count, query = self.get_list(0, sort_column, sort_desc, search, filters,
+                                     execute=False, page_size=self.export_max_rows,
+                                     columns=self._export_columns)
+
+        query = query.no_cache().batch_size(self.export_chunk_size)
+
+        return count, self._iter_export_query(query, self._get_select_related(self._export_columns))
+
     def get_one(self, id):
         """
             Return a single model instance by its ID
@@ -625,6 +805,29 @@ class ModelView(BaseModelView):
                   'error')
             return None
 
+    def get_list_by_ids(self, ids):
+        """
+            Return documents with passed ids in the same order, using a
+            single query.
+
+            :param ids:
+                List of document ids
+        """
+        if not ids:
+            return []
+
+        all_ids = [self.object_id_converter(pk) for pk in ids]
+        models = self.get_query().in_bulk(all_ids)
+
+        result = []
+        for pk in all_ids:
+            model = models.get(pk)
+
+            if model is not None:
+                result.append(model)
+
+        return self._select_related(result, self._get_select_related())
+
     def handle_view_exception(self, exc):
         """
         Override of parent handle_view_exception to accommodate mongo exceptions
@@ -726,6 +929,48 @@ class ModelView(BaseModelView):
 
         return True
 
+    def delete_many(self, ids):
+        """
+            Delete documents with passed ids.
+
+            Documents are loaded in chunks of `action_chunk_size` and every
+            chunk is removed with a single query, which applies document
+            delete rules.
+
+            If `delete_model` is overridden, documents are deleted one by one
+            with `delete_model`. Exceptions raised by `on_models_delete` are
+            re-raised and veto the delete of the chunk. If the database
+            rejects the chunk, its documents are deleted one by one with
+            `delete_model` and `on_model_delete` runs again for them.
+
+            :param ids:
+                List of document ids
+        """
+        # Custom `delete_model` has to run for every document
+        if type(self).delete_model != ModelView.delete_model:
+            return super(ModelView, self).delete_many(ids)
+
+        count = 0
+
+        for chunk in iterchunks(ids, self.action_chunk_size):
+            all_ids = [self.object_id_converter(pk) for pk in chunk]
+            models = list(self.get_query().in_bulk(all_ids).values())
+
+            if not models:
+                continue
+
+            self.on_models_delete(models)
+
+            try:
+                count += self.get_query().filter(pk__in=[m.pk for m in models]).delete()
+            except (mongoengine.OperationError, PyMongoError):
+                log.exception('Failed to delete records, deleting one by one.')
+                count += super(ModelView, self).delete_many(chunk)
+            else:
+                self.after_models_delete(models)
+
+        return count
+
     # FileField access API
     @expose('/api/file/')
     def api_file_view(self):
@@ -738,13 +983,25 @@ class ModelView(BaseModelView):
 
         fs = gridfs.GridFS(get_db(db), coll)
 
-        data = fs.get(self.object_id_converter(pk))
-        if not data:
+        try:
+            data = fs.get(self.object_id_converter(pk))
+        except gridfs.NoFile:
             abort(404)
 
-        return Response(data.read(),
-                        content_type=data.content_type,
-                        headers={'Content-Length': data.length})
+        # Stream the file chunk by chunk, GridOut is seekable, so range
+        # requests skip to the requested chunk instead of reading it all
+        rv = Response(wrap_file(request.environ, data, buffer_size=data.chunk_size),
+                      content_type=data.content_type,
+                      direct_passthrough=True)
+        rv.content_length = data.length
+        rv.last_modified = data.upload_date
+
+        # GridFS files are immutable, so file id is good enough if
+        # the driver did not store md5 checksum
+        rv.set_etag(getattr(data, 'md5', None) or str(data._id))
+
+        return rv.make_conditional(request, accept_ranges=True,
+                                   complete_length=data.length)
 
     # Default model actions
     def is_action_allowed(self, name):
@@ -759,11 +1016,7 @@ class ModelView(BaseModelView):
             lazy_gettext('Are you sure you want to delete selected records?'))
     def action_delete(self, ids):
         try:
-            count = 0
-
-            all_ids = [self.object_id_converter(pk) for pk in ids]
-            for obj in self.get_query().in_bulk(all_ids).values():
-                count += self.delete_model(obj)
+            count = self.delete_many(ids)
 
             flash(ngettext('Record was successfully deleted.',
                            '%(count)s records were successfully deleted.',
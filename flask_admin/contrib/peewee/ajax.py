@@ -49,6 +49,15 @@ class QueryAjaxModelLoader(AjaxModelLoader):
     def get_one(self, pk):
         return self.model.get(**{self.pk: pk})
 
+    def get_many(self, pks):
+        if not pks:
+            return []
+
+        query = self.model.select().where(getattr(self.model, self.pk) << pks)
+        models = dict((as_unicode(getattr(m, self.pk)), m) for m in query)
+
+        return [models.get(as_unicode(pk)) for pk in pks]
+
     def get_list(self, term, offset=0, limit=DEFAULT_PAGE_SIZE):
         query = self.model.select()
 
@@ -1,13 +1,16 @@
 import logging
+from functools import partial
 
 from flask import flash
 
-from flask_admin._compat import string_types
+from flask_admin._compat import string_types, text_type
+from flask_admin.tools import iterchunks
 from flask_admin.babel import gettext, ngettext, lazy_gettext
 from flask_admin.model import BaseModelView
 from flask_admin.model.form import create_editable_list_form
 
-from peewee import JOIN, PrimaryKeyField, ForeignKeyField, Field, CharField, TextField
+from peewee import (JOIN, PrimaryKeyField, ForeignKeyField, Field, CharField, TextField,
+                    PostgresqlDatabase, PeeweeException)
 
 from flask_admin.actions import action
 from flask_admin.contrib.peewee import filters
@@ -65,6 +68,16 @@ class ModelView(BaseModelView):
                 ]
     """
 
+    column_auto_select_related = True
+    """
+        Join models of the displayed foreign key columns and select their
+        fields in the list and export queries, so related models are not
+        loaded with a separate query for every row.
+
+        Dotted columns, like `user.company.name`, join every model on the
+        path. Self-referencing foreign keys are not joined.
+    """
+
     model_form_converter = CustomModelConverter
     """
         Model form conversion class. Use this to implement custom field conversion logic.
@@ -331,8 +344,149 @@ class ModelView(BaseModelView):
     def get_query(self):
         return self.model.select()
 
+    def _get_select_related(self, columns=None):
+        """
+            Return list of foreign key paths used by the columns. Every
+            path is a list of foreign key fields.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        if not self.column_auto_select_related:
+            return []
+
+        if columns is None:
+            columns = self._list_columns
+
+        paths = []
+
+        for name, _ in columns:
+            if not isinstance(name, string_types):
+                continue
+
+            model = self.model
+            path = []
+
+            for key in name.split('.'):
+                field = model._meta.fields.get(key)
+
+                if not isinstance(field, ForeignKeyField) or field.rel_model == model:
+                    break
+
+                path.append(field)
+                model = field.rel_model
+
+            if path and path not in paths:
+                paths.append(path)
+
+        return paths
+
+    def _apply_select_related(self, query, joins, paths, selection):
+        """
+            Join models on the foreign key paths and add them to the
+            selection. Models that were already joined for search, filters
+            or sorting are skipped, as well as models that appear on more
+            than one path.
+
+            :param query:
+                Query
+            :param joins:
+                Names of the joined models
+            :param paths:
+                List of foreign key paths
+            :param selection:
+                List of selected fields or models
+        """
+        joined = {}
+
+        for path in paths:
+            query = query.switch(self.model)
+
+            for idx, field in enumerate(path):
+                key = tuple(path[:idx + 1])
+
+                if key in joined:
+                    query = query.switch(field.rel_model)
+                    continue
+
+                model_name = field.rel_model.__name__
+
+                if model_name in joins:
+                    break
+
+                query = query.join(field.rel_model, JOIN.LEFT_OUTER, on=field)
+
+                joins.add(model_name)
+                joined[key] = field.rel_model
+
+        if not joined:
+            return query
+
+        query = query.select(*(list(selection) + list(joined.values())))
+        return query.switch(self.model)
+
+    def _get_projection(self, columns=None):
+        """
+            Return list of fields that should be selected for the columns
+            or `None` if all fields should be selected.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        names = self._get_projection_names(columns)
+
+        if names is None:
+            return None
+
+        model_fields = self.model._meta.fields
+        fields = [self.model._meta.primary_key]
+
+        for name in names:
+            field = model_fields.get(name)
+
+            # Virtual columns can use any field
+            if field is None:
+                return None
+
+            if field not in fields:
+                fields.append(field)
+
+        return fields
+
+    def _estimate_count(self, search, filters):
+        """
+            Return estimated number of records from the table statistics or
+            `None` if estimate is not available. Only PostgreSQL is supported
+            and only if there are no search, filters or overridden
+            `get_query`, because statistics do not account for them.
+
+            :param search:
+                Search query
+            :param filters:
+                List of filter tuples
+        """
+        meta = self.model._meta
+
+        if search or filters or not isinstance(meta.database, PostgresqlDatabase):
+            return None
+
+        if type(self).get_query != ModelView.get_query:
+            return None
+
+        table_name = getattr(meta, 'table_name', None) or meta.db_table
+
+        cursor = meta.database.execute_sql('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                                           (table_name,))
+        row = cursor.fetchone()
+
+        # Never analyzed tables report negative number of rows
+        if row is None or row[0] < 0:
+            return None
+
+        return int(row[0])
+
     def get_list(self, page, sort_column, sort_desc, search, filters,
-                 execute=True, page_size=None):
+                 execute=True, page_size=None, columns=None, count_strategy=None):
         """
             Return records from the database.
 
@@ -352,6 +506,11 @@ class ModelView(BaseModelView):
                 Number of results. Defaults to ModelView's page_size. Can be
                 overriden to change the page_size limit. Removing the page_size
                 limit requires setting page_size to 0 or False.
+            :param columns:
+                List of (name, label) tuples of the columns to load if
+                `column_auto_projection` is enabled. Defaults to list view columns.
+            :param count_strategy:
+                Overrides `count_strategy` of the view
         """
 
         query = self.get_query()
@@ -390,7 +549,17 @@ class ModelView(BaseModelView):
                 query = f.apply(query, f.clean(value))
 
         # Get count
-        count = query.count() if not self.simple_list_pager else None
+        if not self.simple_list_pager:
+            count = self._get_list_count(search, filters, query.count,
+                                         partial(self._estimate_count, search, filters),
+                                         count_strategy)
+        else:
+            count = None
+
+        # Select only displayed columns
+        projection = self._get_projection(columns)
+        if projection:
+            query = query.select(*projection)
 
         # Apply sorting
         if sort_column is not None:
@@ -403,6 +572,11 @@ class ModelView(BaseModelView):
             if order:
                 query, joins = self._order_by(query, joins, order[0], order[1])
 
+        # Load related models of the displayed foreign keys
+        query = self._apply_select_related(query, joins,
+                                           self._get_select_related(columns),
+                                           projection or [self.model])
+
         # Pagination
         if page_size is None:
             page_size = self.page_size
@@ -418,9 +592,38 @@ class ModelView(BaseModelView):
 
         return count, query
 
+    def get_export_list(self, sort_column, sort_desc, search, filters):
+        """
+            Return records to export. Uses `iterator()` so exported rows are
+            not cached by the query and memory usage stays constant.
+        """
+        count, query = self.get_list(0, sort_column, sort_desc, search, filters,
+                                     execute=False, page_size=self.export_max_rows,
+                                     columns=self._export_columns)
+
+        return count, query.iterator()
+
     def get_one(self, id):
         return self.model.get(**{self._primary_key: id})
 
+    def get_list_by_ids(self, ids):
+        """
+            Return models with passed ids in the same order, using a single
+            query.
+
+            :param ids:
+                List of model ids
+        """
+        if not ids:
+            return []
+
+        model_pk = getattr(self.model, self._primary_key)
+        query = self.get_query().where(model_pk << ids)
+        query = self._apply_select_related(query, set(), self._get_select_related(), [self.model])
+
+        models = dict((text_type(self.get_pk_value(m)), m) for m in query)
+        return [models[id] for id in ids if id in models]
+
     def create_model(self, form):
         try:
             model = self.model()
@@ -475,6 +678,69 @@ class ModelView(BaseModelView):
 
         return True
 
+    def delete_many(self, ids):
+        """
+            Delete models with passed ids in a single transaction.
+
+            Models are loaded in chunks of `action_chunk_size`. If
+            `fast_mass_delete` is enabled, every chunk is removed with a
+            single ``DELETE`` statement, otherwise models are deleted with
+            `delete_instance` to remove dependent records as well.
+
+            If `delete_model` is overridden, models are deleted one by one
+            with `delete_model`. If `on_models_delete` raises an exception,
+            the transaction is rolled back and the exception is re-raised, so
+            nothing is deleted. If the database rejects the batch, models are
+            deleted one by one with `delete_model` and `on_model_delete` runs
+            again for them.
+
+            :param ids:
+                List of model ids
+        """
+        # Custom `delete_model` has to run for every record
+        if type(self).delete_model != ModelView.delete_model:
+            return super(ModelView, self).delete_many(ids)
+
+        model_pk = getattr(self.model, self._primary_key)
+
+        count = 0
+        deleted = []
+        in_hook = False
+
+        try:
+            with self.model._meta.database.atomic():
+                for chunk in iterchunks(ids, self.action_chunk_size):
+                    models = list(self.model.select().where(model_pk << chunk))
+
+                    if not models:
+                        continue
+
+                    # Exceptions from the hook veto the delete, do not fall back
+                    in_hook = True
+                    self.on_models_delete(models)
+                    in_hook = False
+
+                    if self.fast_mass_delete:
+                        count += self.model.delete().where(model_pk << chunk).execute()
+                    else:
+                        for model in models:
+                            model.delete_instance(recursive=True)
+
+                        count += len(models)
+
+                    deleted.extend(models)
+        except PeeweeException:
+            if in_hook:
+                raise
+
+            log.exception('Failed to delete records, deleting one by one.')
+
+            return super(ModelView, self).delete_many(ids)
+
+        self.after_models_delete(deleted)
+
+        return count
+
     # Default model actions
     def is_action_allowed(self, name):
         # Check delete action permission
@@ -488,19 +754,7 @@ class ModelView(BaseModelView):
             lazy_gettext('Are you sure you want to delete selected records?'))
     def action_delete(self, ids):
         try:
-            model_pk = getattr(self.model, self._primary_key)
-
-            if self.fast_mass_delete:
-                count = self.model.delete().where(model_pk << ids).execute()
-            else:
-                count = 0
-
-                query = self.model.select().filter(model_pk << ids)
-
-                for m in query:
-                    self.on_model_delete(m)
-                    m.delete_instance(recursive=True)
-                    count += 1
+            count = self.delete_many(ids)
 
             flash(ngettext('Record was successfully deleted.',
                            '%(count)s records were successfully deleted.',
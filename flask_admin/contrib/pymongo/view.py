@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 
 import pymongo
 from bson import ObjectId
@@ -11,6 +12,7 @@ from flask_admin.babel import gettext, ngettext, lazy_gettext
 from flask_admin.model import BaseModelView
 from flask_admin.actions import action
 from flask_admin.helpers import get_form_data
+from flask_admin.tools import iterchunks
 
 from .filters import BasePyMongoFilter
 from .tools import parse_like_term
@@ -208,8 +210,36 @@ class ModelView(BaseModelView):
 
         return query
 
+    def _get_projection(self, columns=None):
+        """
+            Return projection document for the columns or `None` if
+            all fields should be loaded.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        names = self._get_projection_names(columns)
+
+        if names is None:
+            return None
+
+        return dict((name.split('.')[0], 1) for name in names)
+
+    def _estimate_count(self, query):
+        """
+            Return estimated number of documents in the collection from its
+            metadata. Not available if query has any criteria.
+
+            :param query:
+                Query with applied search and filters
+        """
+        if query:
+            return None
+
+        return self.coll.estimated_document_count()
+
     def get_list(self, page, sort_column, sort_desc, search, filters,
-                 execute=True, page_size=None):
+                 execute=True, page_size=None, columns=None, count_strategy=None):
         """
             Get list of objects from MongoEngine
 
@@ -229,6 +259,11 @@ class ModelView(BaseModelView):
                 Number of results. Defaults to ModelView's page_size. Can be
                 overriden to change the page_size limit. Removing the page_size
                 limit requires setting page_size to 0 or False.
+            :param columns:
+                List of (name, label) tuples of the columns to load if
+                `column_auto_projection` is enabled. Defaults to list view columns.
+            :param count_strategy:
+                Overrides `count_strategy` of the view
         """
         query = {}
 
@@ -251,7 +286,12 @@ class ModelView(BaseModelView):
             query = self._search(query, search)
 
         # Get count
-        count = self.coll.find(query).count() if not self.simple_list_pager else None
+        if not self.simple_list_pager:
+            count = self._get_list_count(search, filters, self.coll.find(query).count,
+                                         partial(self._estimate_count, query),
+                                         count_strategy)
+        else:
+            count = None
 
         # Sorting
         sort_by = None
@@ -273,13 +313,27 @@ class ModelView(BaseModelView):
         if page and page_size:
             skip = page * page_size
 
-        results = self.coll.find(query, sort=sort_by, skip=skip, limit=page_size)
+        # Load only displayed fields
+        projection = self._get_projection(columns)
+
+        results = self.coll.find(query, projection, sort=sort_by, skip=skip, limit=page_size)
 
         if execute:
             results = list(results)
 
         return count, results
 
+    def get_export_list(self, sort_column, sort_desc, search, filters):
+        """
+            Return records to export. Documents are fetched from the cursor
+            in batches of `export_chunk_size`.
+        """
+        count, cursor = self.get_list(0, sort_column, sort_desc, search, filters,
+                                      execute=False, page_size=self.export_max_rows,
+                                      columns=self._export_columns)
+
+        return count, cursor.batch_size(self.export_chunk_size)
+
     def _get_valid_id(self, id):
         try:
             return ObjectId(id)
@@ -372,6 +426,48 @@ class ModelView(BaseModelView):
 
         return True
 
+    def delete_many(self, ids):
+        """
+            Delete documents with passed ids.
+
+            Documents are loaded in chunks of `action_chunk_size` and every
+            chunk is removed with a single `delete_many` call.
+
+            If `delete_model` is overridden, documents are deleted one by one
+            with `delete_model`. Exceptions raised by `on_models_delete` are
+            re-raised and veto the delete of the chunk. If the database
+            rejects the chunk, its documents are deleted one by one with
+            `delete_model` and `on_model_delete` runs again for them.
+
+            :param ids:
+                List of document ids
+        """
+        # Custom `delete_model` has to run for every document
+        if type(self).delete_model != ModelView.delete_model:
+            return super(ModelView, self).delete_many(ids)
+
+        count = 0
+
+        for chunk in iterchunks(ids, self.action_chunk_size):
+            pks = [self._get_valid_id(pk) for pk in chunk]
+            models = list(self.coll.find({'_id': {'$in': pks}}))
+
+            if not models:
+                continue
+
+            self.on_models_delete(models)
+
+            try:
+                result = self.coll.delete_many({'_id': {'$in': [m['_id'] for m in models]}})
+                count += result.deleted_count
+            except pymongo.errors.PyMongoError:
+                log.exception('Failed to delete records, deleting one by one.')
+                count += super(ModelView, self).delete_many(chunk)
+            else:
+                self.after_models_delete(models)
+
+        return count
+
     # Default model actions
     def is_action_allowed(self, name):
         # Check delete action permission
@@ -385,12 +481,7 @@ class ModelView(BaseModelView):
             lazy_gettext('Are you sure you want to delete selected records?'))
     def action_delete(self, ids):
         try:
-            count = 0
-
-            # TODO: Optimize me
-            for pk in ids:
-                if self.delete_model(self.get_one(pk)):
-                    count += 1
+            count = self.delete_many(ids)
 
             flash(ngettext('Record was successfully deleted.',
                            '%(count)s records were successfully deleted.',
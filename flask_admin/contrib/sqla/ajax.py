@@ -15,6 +15,10 @@ class QueryAjaxModelLoader(AjaxModelLoader):
                 Fields to run query against
             :param filters:
                 Additional filters to apply to the loader
+            :param search_backend:
+                Search backend from `flask_admin.contrib.sqla.search`
+                to match the query against the fields. By default, fields
+                are matched with case-insensitive ``LIKE '%query%'``.
         """
         super(QueryAjaxModelLoader, self).__init__(name, options)
 
@@ -23,6 +27,7 @@ class QueryAjaxModelLoader(AjaxModelLoader):
         self.fields = options.get('fields')
         self.order_by = options.get('order_by')
         self.filters = options.get('filters')
+        self.search_backend = options.get('search_backend')
 
         if not self.fields:
             raise ValueError('AJAX loading requires `fields` to be specified for %s.%s' % (model, self.name))
@@ -62,11 +67,28 @@ class QueryAjaxModelLoader(AjaxModelLoader):
         with self.session.no_autoflush:
             return self.session.query(self.model).get(pk)
 
+    def get_many(self, pks):
+        if not pks:
+            return []
+
+        # prevent autoflush from occuring during populate_obj
+        with self.session.no_autoflush:
+            query = self.session.query(self.model).filter(getattr(self.model, self.pk).in_(pks))
+            models = dict((as_unicode(getattr(m, self.pk)), m) for m in query)
+
+        return [models.get(as_unicode(pk)) for pk in pks]
+
     def get_list(self, term, offset=0, limit=DEFAULT_PAGE_SIZE):
         query = self.session.query(self.model)
 
-        filters = (field.ilike(u'%%%s%%' % term) for field in self._cached_fields)
-        query = query.filter(or_(*filters))
+        if self.search_backend is not None:
+            stmt = self.search_backend.get_criterion(self.model, self._cached_fields, term)
+
+            if stmt is not None:
+                query = query.filter(stmt)
+        else:
+            filters = (field.ilike(u'%%%s%%' % term) for field in self._cached_fields)
+            query = query.filter(or_(*filters))
 
         if self.filters:
             filters = ["%s.%s" % (self.model.__name__.lower(), value) for value in self.filters]
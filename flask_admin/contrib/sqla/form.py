@@ -1,7 +1,11 @@
+import time
+import logging
 import warnings
 
 from wtforms import fields, validators
-from sqlalchemy import Boolean, Column
+from wtforms.fields.core import UnboundField
+from sqlalchemy import Boolean, Column, String, Unicode, func, cast
+from sqlalchemy.exc import SQLAlchemyError
 
 from flask_admin import form
 from flask_admin.model.form import (converts, ModelConverterBase,
@@ -16,8 +20,60 @@ from .fields import (QuerySelectField, QuerySelectMultipleField,
                      InlineModelFormList, InlineHstoreList, HstoreForm)
 from flask_admin.model.fields import InlineFormField
 from .tools import (has_multiple_pks, filter_foreign_columns,
-                    get_field_with_path, is_association_proxy, is_relationship)
-from .ajax import create_ajax_loader
+                    get_field_with_path, is_association_proxy, is_relationship,
+                    get_primary_key)
+from .ajax import create_ajax_loader, QueryAjaxModelLoader
+
+
+log = logging.getLogger("flask-admin.sqla")
+
+
+class ThresholdSelectField(UnboundField):
+    """
+        Relation field that is bound as AJAX select field if the related
+        table has more rows than `form_ajax_refs_threshold` of the view and
+        as regular select field otherwise.
+    """
+    def __init__(self, view, session, remote_model, loader, multiple, **kwargs):
+        field_class = QuerySelectMultipleField if multiple else QuerySelectField
+        super(ThresholdSelectField, self).__init__(field_class, **kwargs)
+
+        self.view = view
+        self.session = session
+        self.remote_model = remote_model
+        self.loader = loader
+        self.multiple = multiple
+
+        self._decision = None
+
+    def _use_ajax(self):
+        now = time.time()
+        decision = self._decision
+
+        if decision is not None and decision[0] > now:
+            return decision[1]
+
+        try:
+            count = self.session.query(func.count('*')).select_from(self.remote_model).scalar()
+        except SQLAlchemyError:
+            log.exception('Failed to count %s records.' % self.remote_model.__name__)
+            return False
+
+        use_ajax = count > self.view.form_ajax_refs_threshold
+        self._decision = (now + self.view.form_ajax_refs_threshold_timeout, use_ajax)
+
+        return use_ajax
+
+    def bind(self, form, name, **kwargs):
+        if self._use_ajax():
+            field_class = AjaxSelectMultipleField if self.multiple else AjaxSelectField
+            kw = dict(self.kwargs)
+            kw.pop('query_factory', None)
+            unbound = UnboundField(field_class, self.loader, **kw)
+        else:
+            unbound = UnboundField(self.field_class, **self.kwargs)
+
+        return unbound.bind(form, name, **kwargs)
 
 
 class AdminModelConverter(ModelConverterBase):
@@ -69,6 +125,31 @@ class AdminModelConverter(ModelConverterBase):
 
         return None
 
+    def _create_threshold_ajax_loader(self, prop, remote_model):
+        """
+            Create AJAX loader for the relation if `form_ajax_refs_threshold`
+            is set for the view.
+        """
+        threshold = getattr(self.view, 'form_ajax_refs_threshold', None)
+
+        if not threshold or has_multiple_pks(remote_model):
+            return None
+
+        mapper = remote_model._sa_class_manager.mapper
+        fields = [getattr(remote_model, p.key) for p in mapper.column_attrs
+                  if len(p.columns) == 1 and isinstance(p.columns[0].type, String)]
+
+        if not fields:
+            fields = [cast(getattr(remote_model, get_primary_key(remote_model)), Unicode)]
+
+        loader = QueryAjaxModelLoader(prop.key, self.session, remote_model, fields=fields)
+
+        # Kept apart from `_form_ajax_refs`, so forms scaffolded later still
+        # decide between AJAX and regular select by the row count
+        self.view._form_ajax_threshold_refs[prop.key] = loader
+
+        return loader
+
     def _model_select_field(self, prop, multiple, remote_model, **kwargs):
         loader = getattr(self.view, '_form_ajax_refs', {}).get(prop.key)
 
@@ -78,9 +159,15 @@ class AdminModelConverter(ModelConverterBase):
             else:
                 return AjaxSelectField(loader, **kwargs)
 
+        loader = self._create_threshold_ajax_loader(prop, remote_model)
+
         if 'query_factory' not in kwargs:
             kwargs['query_factory'] = lambda: self.session.query(remote_model)
 
+        if loader:
+            return ThresholdSelectField(self.view, self.session, remote_model,
+                                        loader, multiple, **kwargs)
+
         if multiple:
             return QuerySelectMultipleField(**kwargs)
         else:
@@ -0,0 +1,211 @@
+from sqlalchemy import String, Text, Unicode, and_, or_, cast, func, literal_column, select
+from sqlalchemy.sql.expression import table, column
+
+from flask_admin._compat import reduce
+
+from . import tools
+
+
+class BaseSearch(object):
+    """
+        Base class for the list view search backends.
+
+        Search backend converts the search query into a filter criterion
+        for the columns listed in `column_searchable_list`.
+    """
+    def get_criterion(self, model, columns, search):
+        """
+            Return filter criterion for the search query or `None` if the
+            query should not be filtered.
+
+            :param model:
+                Model class of the view
+            :param columns:
+                List of searchable columns. Columns of related models are
+                already adapted to the joined aliases.
+            :param search:
+                Search query
+        """
+        raise NotImplementedError()
+
+
+class LikeSearch(BaseSearch):
+    """
+        Default search backend. Every word of the search query should be
+        found in one of the searchable columns using case-insensitive
+        ``LIKE`` with wildcards on both sides.
+
+        Prefix a word with ``^`` to search for values that start with the
+        word or with ``=`` to search for exact matches.
+    """
+    def _get_column(self, column):
+        return cast(column, Unicode)
+
+    def get_criterion(self, model, columns, search):
+        criteria = []
+
+        for term in search.split(' '):
+            if not term:
+                continue
+
+            stmt = tools.parse_like_term(term)
+            criteria.append(or_(*[self._get_column(c).ilike(stmt) for c in columns]))
+
+        if not criteria:
+            return None
+
+        return and_(*criteria)
+
+
+class PrefixSearch(BaseSearch):
+    """
+        Search backend for autocomplete lookups. Matches records where one
+        of the searchable columns starts with the search query.
+
+        Pattern has no leading wildcard, so database can use a B-tree index.
+        Comparison is case-insensitive by default and uses ``lower(column)``,
+        so the index should be created on the same expression. PostgreSQL
+        also needs ``text_pattern_ops`` unless the database uses C locale::
+
+            CREATE INDEX ix_user_email_lower ON "user" (lower(email) text_pattern_ops);
+    """
+    def __init__(self, case_sensitive=False):
+        """
+            Constructor.
+
+            :param case_sensitive:
+                Compare column values as is, so an index on the column
+                itself can be used
+        """
+        self.case_sensitive = case_sensitive
+
+    def get_criterion(self, model, columns, search):
+        search = search.strip()
+
+        if not search:
+            return None
+
+        # Wildcards in the query are matched literally
+        pattern = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+        if self.case_sensitive:
+            return or_(*[c.like(pattern, escape='\\') for c in columns])
+
+        pattern = pattern.lower()
+        return or_(*[func.lower(c).like(pattern, escape='\\') for c in columns])
+
+
+class PostgresTrigramSearch(LikeSearch):
+    """
+        Same as `LikeSearch`, but does not cast string columns, so
+        PostgreSQL can use trigram indexes created with the `pg_trgm` extension::
+
+            CREATE EXTENSION pg_trgm;
+            CREATE INDEX ix_post_title_trgm ON post USING gin (title gin_trgm_ops);
+    """
+    def _get_column(self, column):
+        if isinstance(column.type, String):
+            return column
+
+        return super(PostgresTrigramSearch, self)._get_column(column)
+
+
+class PostgresFullTextSearch(BaseSearch):
+    """
+        PostgreSQL full-text search backend. Search query is parsed with
+        ``websearch_to_tsquery``, so it supports quoted phrases, ``or`` and
+        ``-`` to exclude words. Requires PostgreSQL 11 or later.
+
+        By default, searchable columns are concatenated into a single
+        document. To make searches use an index, create a GIN index on the
+        same expression or pass a precomputed ``tsvector`` column::
+
+            class PostView(ModelView):
+                column_searchable_list = ('title', 'text')
+                search_backend = PostgresFullTextSearch(vector=Post.search_vector)
+    """
+    def __init__(self, config='english', vector=None):
+        """
+            Constructor.
+
+            :param config:
+                Text search configuration name
+            :param vector:
+                Optional ``tsvector`` column or expression to search in
+                instead of the searchable columns
+        """
+        self.config = config
+        self.vector = vector
+
+    def get_document(self, columns):
+        """
+            Return ``tsvector`` expression to search in.
+
+            :param columns:
+                List of searchable columns
+        """
+        if self.vector is not None:
+            return self.vector
+
+        values = [func.coalesce(cast(c, Text), '') for c in columns]
+        return func.to_tsvector(self.config, reduce(lambda a, b: a + ' ' + b, values))
+
+    def get_criterion(self, model, columns, search):
+        if not search.strip():
+            return None
+
+        query = func.websearch_to_tsquery(self.config, search)
+        return self.get_document(columns).op('@@')(query)
+
+
+class SQLiteFTS5Search(BaseSearch):
+    """
+        SQLite full-text search backend that uses FTS5 virtual table.
+
+        Virtual table should index the searchable columns and use the model
+        primary key as rowid, for example with an external content table::
+
+            CREATE VIRTUAL TABLE post_fts USING fts5(title, text, content='post', content_rowid='id');
+
+        Application is responsible for keeping the virtual table in sync,
+        usually with triggers. Every word of the search query should be
+        found in the indexed columns.
+    """
+    def __init__(self, table_name, rowid=None):
+        """
+            Constructor.
+
+            :param table_name:
+                Name of the FTS5 virtual table
+            :param rowid:
+                Model column that matches virtual table rowid. Defaults to
+                the model primary key.
+        """
+        self.table_name = table_name
+        self.rowid = rowid
+
+    def get_match_query(self, search):
+        """
+            Convert search query to FTS5 query. Every word is quoted, so
+            FTS5 query syntax characters are matched literally.
+
+            :param search:
+                Search query
+        """
+        terms = [t for t in search.split(' ') if t]
+        return u' '.join(u'"%s"' % t.replace(u'"', u'""') for t in terms)
+
+    def get_criterion(self, model, columns, search):
+        match = self.get_match_query(search)
+
+        if not match:
+            return None
+
+        rowid = self.rowid
+        if rowid is None:
+            rowid = getattr(model, tools.get_primary_key(model))
+
+        fts = table(self.table_name, column('rowid'))
+        subquery = select([fts.c.rowid]).where(literal_column(self.table_name).op('MATCH')(match))
+
+        return rowid.in_(subquery)
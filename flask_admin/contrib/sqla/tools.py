@@ -1,4 +1,5 @@
 import types
+import base64
 
 from sqlalchemy import tuple_, or_, and_, inspect
 from sqlalchemy.ext.declarative.clsregistry import _class_resolver
@@ -11,6 +12,10 @@ from sqlalchemy.orm.attributes import InstrumentedAttribute
 from flask_admin._compat import filter_list, string_types
 from flask_admin.tools import iterencode, iterdecode, escape  # noqa: F401
 
+# Keyset pagination cursor directions
+CURSOR_NEXT = u'n'
+CURSOR_PREV = u'p'
+
 
 def parse_like_term(term):
     if term.startswith('^'):
@@ -115,6 +120,42 @@ def get_query_for_ids(modelquery, model, ids):
     return query
 
 
+def encode_cursor(direction, pk):
+    """
+        Encode keyset pagination cursor as an opaque URL-safe string.
+
+        :param direction:
+            `CURSOR_NEXT` to load records after the anchor record or
+            `CURSOR_PREV` to load records before it
+        :param pk:
+            Encoded primary key of the anchor record
+    """
+    value = iterencode((direction, pk)).encode('utf-8')
+    return base64.urlsafe_b64encode(value).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+        Decode keyset pagination cursor. Returns tuple with direction and
+        encoded primary key of the anchor record or `None` if cursor is malformed.
+
+        :param cursor:
+            Cursor created by `encode_cursor`
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except (TypeError, ValueError):
+        return None
+
+    result = iterdecode(value)
+
+    if len(result) != 2 or result[0] not in (CURSOR_NEXT, CURSOR_PREV):
+        return None
+
+    return result
+
+
 def get_columns_for_field(field):
     if (not field or
             not hasattr(field, 'property') or
@@ -1,18 +1,18 @@
 import logging
 import warnings
-import inspect
+from functools import partial
 
 from sqlalchemy.orm.attributes import InstrumentedAttribute
-from sqlalchemy.orm import joinedload, aliased
+from sqlalchemy import orm
+from sqlalchemy.orm import aliased, load_only
 from sqlalchemy.sql.expression import desc
-from sqlalchemy import Boolean, Table, func, or_
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.sql.expression import cast
-from sqlalchemy import Unicode
+from sqlalchemy import Boolean, Table, func, or_, and_, text
+from sqlalchemy.exc import IntegrityError, InvalidRequestError, SQLAlchemyError
 
 from flask import current_app, flash
 
-from flask_admin._compat import string_types, text_type
+from flask_admin._compat import string_types, text_type, iteritems, OrderedDict, getargspec
+from flask_admin.tools import iterchunks
 from flask_admin.babel import gettext, ngettext, lazy_gettext
 from flask_admin.contrib.sqla.tools import is_relationship
 from flask_admin.model import BaseModelView
@@ -20,7 +20,7 @@ from flask_admin.model.form import create_editable_list_form
 from flask_admin.actions import action
 from flask_admin._backwards import ObsoleteAttr
 
-from flask_admin.contrib.sqla import form, filters as sqla_filters, tools
+from flask_admin.contrib.sqla import form, filters as sqla_filters, search as sqla_search, tools
 from .typefmt import DEFAULT_FORMATTERS
 from .ajax import create_ajax_loader
 
@@ -71,6 +71,31 @@ class ModelView(BaseModelView):
         Please refer to the `subqueryload` on list of possible values.
     """
 
+    eager_load = None
+    """
+        Relations to eager load in the list, details, edit and export views.
+
+        Dictionary with `list`, `details`, `edit` and `export` keys, where
+        every value is a list of relation names, dotted relation paths,
+        relation properties or SQLAlchemy loader options. For example::
+
+            class PostAdmin(ModelView):
+                eager_load = {
+                    'list': ('user.company', 'tags'),
+                    'details': ('user', 'comments.author'),
+                    'edit': ('tags',),
+                }
+
+        Many-to-one relations are loaded with `joinedload` and collections
+        with `selectinload`, dotted paths are resolved to chained options.
+
+        Views without configuration load relations of the displayed columns
+        (and relations edited in the form for the edit view) if
+        `column_auto_select_related` is enabled. For the list view,
+        `column_select_related_list` is used if it is set, but an explicit
+        `eager_load['list']` overrides it.
+    """
+
     column_display_all_relations = ObsoleteAttr('column_display_all_relations',
                                                 'list_display_all_relations',
                                                 False)
@@ -189,16 +214,32 @@ class ModelView(BaseModelView):
         Override this attribute to use non-default converter.
     """
 
+    search_backend = sqla_search.LikeSearch()
+    """
+        Search backend that converts the search query into a filter for the
+        `column_searchable_list` columns.
+
+        Default backend uses case-insensitive ``LIKE``, which can not use
+        regular indexes. Use one of the indexed backends from
+        :mod:`flask_admin.contrib.sqla.search` for large tables::
+
+            from flask_admin.contrib.sqla.search import PostgresFullTextSearch
+
+            class MyModelView(ModelView):
+                column_searchable_list = ('title', 'text')
+                search_backend = PostgresFullTextSearch('english')
+    """
+
     fast_mass_delete = False
     """
         If set to `False` and user deletes more than one model using built in action,
-        all models will be read from the database and then deleted one by one
+        all models will be read from the database and then deleted through the session
         giving SQLAlchemy a chance to manually cleanup any dependencies (many-to-many
         relationships, etc).
 
-        If set to `True`, will run a ``DELETE`` statement which is somewhat faster,
-        but may leave corrupted data if you forget to configure ``DELETE
-        CASCADE`` for your model.
+        If set to `True`, will run a ``DELETE`` statement for every `action_chunk_size`
+        records which is somewhat faster, but may leave corrupted data if you forget
+        to configure ``DELETE CASCADE`` for your model.
     """
 
     inline_models = None
@@ -272,6 +313,33 @@ class ModelView(BaseModelView):
                 form_optional_types = (Boolean, Unicode)
     """
 
+    form_ajax_refs_threshold = None
+    """
+        Maximum number of rows in the related table to render relation
+        fields as regular select fields.
+
+        Relation fields that point to larger tables and are not listed in
+        `form_ajax_refs` are rendered as AJAX-backed select fields instead, so
+        create and edit forms do not load the whole related table. Related
+        records are looked up by their string columns, or by primary key if
+        the related model has no string columns.
+
+        Related table is counted when the form is created during a request
+        and the result is remembered for `form_ajax_refs_threshold_timeout`
+        seconds.
+
+        Example::
+
+            class MyModelView(ModelView):
+                form_ajax_refs_threshold = 1000
+    """
+
+    form_ajax_refs_threshold_timeout = 300
+    """
+        Number of seconds to remember whether the related table is larger
+        than `form_ajax_refs_threshold`.
+    """
+
     ignore_hidden = True
     """
        Ignore field that starts with "_"
@@ -320,6 +388,8 @@ class ModelView(BaseModelView):
 
         self._sortable_joins = dict()
 
+        self._form_ajax_threshold_refs = dict()
+
         if self.form_choices is None:
             self.form_choices = {}
 
@@ -340,6 +410,8 @@ class ModelView(BaseModelView):
         else:
             self._auto_joins = self.column_select_related_list
 
+        self._eager_load = self._get_eager_load_options()
+
     # Internal API
     def _get_model_iterator(self, model=None):
         """
@@ -350,7 +422,7 @@ class ModelView(BaseModelView):
 
         return model._sa_class_manager.mapper.iterate_properties
 
-    def _apply_path_joins(self, query, joins, path, inner_join=True):
+    def _apply_path_joins(self, query, joins, path, inner_join=True, entity=None):
         """
             Apply join path to the query.
 
@@ -360,8 +432,10 @@ class ModelView(BaseModelView):
                 List of current joins. Used to avoid joining on same relationship more than once
             :param path:
                 Path to be joined
-            :param fn:
-                Join function
+            :param inner_join:
+                Use inner join instead of left outer join
+            :param entity:
+                Aliased model to start the path from. Defaults to the view model.
         """
         last = None
 
@@ -377,7 +451,12 @@ class ModelView(BaseModelView):
                     fn = query.join if inner_join else query.outerjoin
 
                     if last is None:
-                        query = fn(item) if alias is None else fn(alias, item)
+                        if entity is not None and not isinstance(item, Table):
+                            prop = getattr(entity, item.key)
+                        else:
+                            prop = item
+
+                        query = fn(prop) if alias is None else fn(alias, prop)
                     else:
                         prop = getattr(last, item.key)
                         query = fn(prop) if alias is None else fn(alias, prop)
@@ -749,35 +828,137 @@ class ModelView(BaseModelView):
 
     def scaffold_auto_joins(self):
         """
-            Return a list of joined tables by going through the
-            displayed columns.
+            Return a list of relation paths to eager load by going through
+            the displayed columns.
+        """
+        return self.scaffold_eager_load(self._list_columns)
+
+    def scaffold_eager_load(self, columns):
+        """
+            Return a list of relation paths used by the columns. For
+            example, `user.company.name` column needs `user.company` path.
+
+            :param columns:
+                List of (name, label) column tuples
         """
         if not self.column_auto_select_related:
             return []
 
-        relations = set()
+        paths = []
+
+        for name, _ in columns:
+            if not isinstance(name, string_types):
+                continue
+
+            model = self.model
+            path = []
+
+            for key in name.split('.'):
+                attr = getattr(model, key, None)
+
+                if attr is None or not is_relationship(attr):
+                    break
+
+                target = attr.property.mapper.class_
 
-        for p in self._get_model_iterator():
-            if hasattr(p, 'direction'):
                 # Check if it is pointing to same model
-                if p.mapper.class_ == self.model:
-                    continue
+                if target == model:
+                    break
+
+                path.append(key)
+                model = target
+
+            if path:
+                path = '.'.join(path)
+
+                if path not in paths:
+                    paths.append(path)
+
+        return paths
+
+    def _get_load_option(self, path):
+        """
+            Return loader option for the relation path or `None` if path
+            does not point to a relation.
+
+            Many-to-one relations are loaded with `joinedload`, collections
+            with `selectinload`, so list queries do not return extra rows.
+
+            :param path:
+                Dotted relation path, relation property or loader option
+        """
+        if isinstance(path, string_types):
+            items = path.split('.')
+        elif is_relationship(path):
+            items = [path]
+        else:
+            return path
+
+        model = self.model
+        option = None
 
-                if p.direction.name in ['MANYTOONE', 'MANYTOMANY']:
-                    relations.add(p.key)
+        for item in items:
+            if isinstance(item, string_types):
+                item = getattr(model, item, None)
 
-        joined = []
+            if item is None or not is_relationship(item):
+                break
 
-        for prop, name in self._list_columns:
-            if prop in relations:
-                joined.append(getattr(self.model, prop))
+            loader = 'selectinload' if item.property.uselist else 'joinedload'
 
-        return joined
+            if option is None:
+                option = getattr(orm, loader)(item)
+            else:
+                option = getattr(option, loader)(item)
+
+            model = item.property.mapper.class_
+
+        return option
+
+    def _get_eager_load_options(self):
+        """
+            Return dictionary of loader options for every view.
+        """
+        config = self.eager_load or {}
+
+        paths = {
+            'list': self._auto_joins,
+            'details': self.scaffold_eager_load(getattr(self, '_details_columns', [])),
+            'export': self.scaffold_eager_load(self._export_columns),
+        }
+
+        # Relations edited in the form, including inline models
+        edit_paths = []
+
+        if self.column_auto_select_related:
+            for p in self._get_model_iterator():
+                if hasattr(p, 'direction') and hasattr(self._edit_form_class, p.key):
+                    edit_paths.append(p.key)
+
+        paths['edit'] = edit_paths
+
+        result = {}
+
+        for view, view_paths in iteritems(paths):
+            view_paths = config.get(view, view_paths)
+
+            options = [self._get_load_option(p) for p in view_paths or ()]
+            result[view] = [o for o in options if o is not None]
+
+        return result
 
     # AJAX foreignkey support
     def _create_ajax_loader(self, name, options):
         return create_ajax_loader(self.model, self.session, name, name, options)
 
+    def _get_ajax_loader(self, name):
+        loader = super(ModelView, self)._get_ajax_loader(name)
+
+        if loader is None:
+            loader = self._form_ajax_threshold_refs.get(name)
+
+        return loader
+
     # Database-related API
     def get_query(self):
         """
@@ -869,47 +1050,111 @@ class ModelView(BaseModelView):
 
         return query, joins
 
+    def _is_multiplying_path(self, path):
+        """
+            Check if joining the path can return more than one row for a
+            record, which happens when path contains one-to-many or
+            many-to-many relationship.
+
+            :param path:
+                Join path
+        """
+        for item in path or ():
+            if not isinstance(item, Table) and item.property.uselist:
+                return True
+
+        return False
+
+    def _get_semijoin_query(self):
+        """
+            Return subquery for the ``EXISTS`` semi-join, correlated with the
+            list query by the primary key, and the aliased model to join
+            related models to.
+
+            Records that match criteria on to-many relationships are
+            selected with ``EXISTS`` instead of joins, so both the list and
+            the count query return every record once.
+        """
+        inner = aliased(self.model)
+        query = self.session.query(inner)
+
+        pk_names = self._primary_key if isinstance(self._primary_key, tuple) else (self._primary_key,)
+
+        for name in pk_names:
+            query = query.filter(getattr(inner, name) == getattr(self.model, name))
+
+        return query, inner
+
     def _apply_search(self, query, count_query, joins, count_joins, search):
         """
             Apply search to a query.
         """
-        terms = search.split(' ')
+        if not search.strip():
+            return query, count_query, joins, count_joins
 
-        for term in terms:
-            if not term:
-                continue
+        if any(self._is_multiplying_path(path) for _, path in self._search_fields):
+            return self._apply_semijoin_search(query, count_query, joins, count_joins, search)
 
-            stmt = tools.parse_like_term(term)
+        columns = []
+        count_columns = []
 
-            filter_stmt = []
-            count_filter_stmt = []
+        for field, path in self._search_fields:
+            query, joins, alias = self._apply_path_joins(query, joins, path, inner_join=False)
+            columns.append(field if alias is None else getattr(alias, field.key))
 
-            for field, path in self._search_fields:
-                query, joins, alias = self._apply_path_joins(query, joins, path, inner_join=False)
+            if count_query is not None:
+                count_query, count_joins, count_alias = self._apply_path_joins(count_query,
+                                                                               count_joins,
+                                                                               path,
+                                                                               inner_join=False)
+                count_columns.append(field if count_alias is None else getattr(count_alias, field.key))
 
-                count_alias = None
+        stmt = self.search_backend.get_criterion(self.model, columns, search)
 
-                if count_query is not None:
-                    count_query, count_joins, count_alias = self._apply_path_joins(count_query,
-                                                                                   count_joins,
-                                                                                   path,
-                                                                                   inner_join=False)
+        if stmt is not None:
+            query = query.filter(stmt)
 
-                column = field if alias is None else getattr(alias, field.key)
-                filter_stmt.append(cast(column, Unicode).ilike(stmt))
+            if count_query is not None:
+                count_query = count_query.filter(
+                    self.search_backend.get_criterion(self.model, count_columns, search))
 
-                if count_filter_stmt is not None:
-                    column = field if count_alias is None else getattr(count_alias, field.key)
-                    count_filter_stmt.append(cast(column, Unicode).ilike(stmt))
+        return query, count_query, joins, count_joins
 
-            query = query.filter(or_(*filter_stmt))
+    def _apply_semijoin_search(self, query, count_query, joins, count_joins, search):
+        """
+            Apply search on to-many relationships to a query.
+
+            All searchable paths are joined once in a single ``EXISTS``
+            subquery, which is shared by the list and the count query.
+        """
+        subquery, inner = self._get_semijoin_query()
+        sub_joins = {}
+
+        columns = []
+
+        for field, path in self._search_fields:
+            subquery, sub_joins, alias = self._apply_path_joins(subquery, sub_joins, path,
+                                                                inner_join=False, entity=inner)
+
+            # Columns of the view model refer to the correlated list query row
+            columns.append(field if alias is None else getattr(alias, field.key))
+
+        stmt = self.search_backend.get_criterion(self.model, columns, search)
+
+        if stmt is not None:
+            clause = subquery.filter(stmt).exists()
+
+            query = query.filter(clause)
 
             if count_query is not None:
-                count_query = count_query.filter(or_(*count_filter_stmt))
+                count_query = count_query.filter(clause)
 
         return query, count_query, joins, count_joins
 
     def _apply_filters(self, query, count_query, joins, count_joins, filters):
+        # Filters on to-many relationships, grouped by join path
+        semijoin_filters = OrderedDict()
+
         for idx, flt_name, value in filters:
             flt = self._filters[idx]
 
@@ -922,6 +1167,10 @@ class ModelView(BaseModelView):
                 filter_key = flt.key_name or flt.column
                 path = self._filter_joins.get(filter_key, [])
 
+                if self._is_multiplying_path(path):
+                    semijoin_filters.setdefault(tuple(path), []).append((flt, value))
+                    continue
+
                 query, joins, alias = self._apply_path_joins(query, joins, path, inner_join=False)
 
                 if count_query is not None:
@@ -937,7 +1186,7 @@ class ModelView(BaseModelView):
             try:
                 query = flt.apply(query, clean_value, alias)
             except TypeError:
-                spec = inspect.getargspec(flt.apply)
+                spec = getargspec(flt.apply)
 
                 if len(spec.args) == 3:
                     warnings.warn('Please update your custom filter %s to '
@@ -953,8 +1202,251 @@ class ModelView(BaseModelView):
                 except TypeError:
                     count_query = flt.apply(count_query, clean_value)
 
+        # Filters on the same path should match the same related record
+        for path, path_filters in iteritems(semijoin_filters):
+            subquery, inner = self._get_semijoin_query()
+            subquery, _, alias = self._apply_path_joins(subquery, {}, path,
+                                                        inner_join=False, entity=inner)
+
+            applied = False
+
+            for flt, value in path_filters:
+                clean_value = flt.clean(value)
+
+                try:
+                    subquery = flt.apply(subquery, clean_value, alias)
+                    applied = True
+                except TypeError:
+                    spec = getargspec(flt.apply)
+
+                    if len(spec.args) == 3:
+                        warnings.warn('Please update your custom filter %s to '
+                                      'include additional `alias` parameter.' % repr(flt))
+                    else:
+                        raise
+
+                    # Filter can not use the aliased models of the semi-join,
+                    # join the path to the list query instead
+                    query, joins, _ = self._apply_path_joins(query, joins, path, inner_join=False)
+                    query = flt.apply(query, clean_value)
+
+                    if count_query is not None:
+                        count_query, count_joins, _ = self._apply_path_joins(
+                            count_query,
+                            count_joins,
+                            path,
+                            inner_join=False)
+                        count_query = flt.apply(count_query, clean_value)
+
+            if not applied:
+                continue
+
+            clause = subquery.exists()
+
+            query = query.filter(clause)
+
+            if count_query is not None:
+                count_query = count_query.filter(clause)
+
         return query, count_query, joins, count_joins
 
+    def _get_keyset_columns(self, query, joins, sort_column, sort_desc):
+        """
+            Return list of (column, descending, nullable) tuples that uniquely
+            order the query: active sort column(s) followed by the primary key.
+
+            :param query:
+                Query
+            :param joins:
+                Current joins
+            :param sort_column:
+                Sort column name or None to use default sort order
+            :param sort_desc:
+                Ascending or descending
+        """
+        sort_field = sort_joins = None
+
+        if sort_column is not None:
+            if sort_column in self._sortable_columns:
+                sort_field = self._sortable_columns[sort_column]
+                sort_joins = self._sortable_joins.get(sort_column)
+        else:
+            order = self._get_default_order()
+
+            if order:
+                sort_field, sort_joins, sort_desc = order
+
+        sort_desc = bool(sort_desc) if sort_field is not None else False
+
+        columns = []
+
+        if sort_field is not None:
+            query, joins, alias = self._apply_path_joins(query, joins, sort_joins, inner_join=False)
+
+            column = sort_field if alias is None else getattr(alias, sort_field.key)
+
+            for c in (column if isinstance(column, tuple) else (column,)):
+                columns.append((c, sort_desc, self._is_nullable_column(c)))
+
+        # Primary key makes order unique when sort column has duplicate values
+        pk_names = self._primary_key if isinstance(self._primary_key, tuple) else (self._primary_key,)
+
+        for name in pk_names:
+            columns.append((getattr(self.model, name), sort_desc, False))
+
+        return query, joins, columns
+
+    def _is_nullable_column(self, column):
+        """
+            Check if sort column can contain NULL values. Expressions that
+            are not mapped to a table column are assumed to be nullable.
+        """
+        prop = getattr(column, 'property', None)
+
+        if prop is not None:
+            columns = getattr(prop, 'columns', None)
+
+            if not columns or len(columns) != 1:
+                return True
+
+            column = columns[0]
+
+        return getattr(column, 'nullable', True) is not False
+
+    def _nulls_sort_last(self):
+        """
+            Return `True` if database orders NULL values after other values
+            in ascending order.
+        """
+        mapper = self.model._sa_class_manager.mapper
+        bind = self.session.get_bind(mapper=mapper)
+
+        return bind is not None and bind.dialect.name in ('postgresql', 'oracle')
+
+    def _get_keyset_anchor(self, sort_column, sort_desc, pk):
+        """
+            Load key values of the record the cursor points to.
+            Returns `None` if record does not exist anymore.
+        """
+        pk_names = self._primary_key if isinstance(self._primary_key, tuple) else (self._primary_key,)
+        pk_values = tools.iterdecode(pk)
+
+        if len(pk_names) != len(pk_values):
+            return None
+
+        query, _, columns = self._get_keyset_columns(self.session.query(self.model), {},
+                                                     sort_column, sort_desc)
+
+        query = query.with_entities(*[c for c, _, _ in columns])
+
+        for name, value in zip(pk_names, pk_values):
+            query = query.filter(getattr(self.model, name) == value)
+
+        return query.first()
+
+    def _apply_keyset(self, query, joins, sort_column, sort_desc, cursor):
+        """
+            Apply keyset pagination ordering and cursor criteria to the query.
+
+            Records are ordered by the sort column and the primary key. If cursor
+            is provided, only records after (or before, for the previous page
+            cursor) the anchor record are selected, so database can seek
+            directly to the page using an index instead of skipping
+            `OFFSET` rows.
+
+            NULL values keep the database order, same as the regular list
+            view sorting: PostgreSQL and Oracle put them after other values
+            in ascending order, other databases before them.
+
+            Returns query, joins and flag indicating that the query is in
+            reverse order and results should be reversed after execution.
+        """
+        query, joins, columns = self._get_keyset_columns(query, joins, sort_column, sort_desc)
+
+        decoded = tools.decode_cursor(cursor) if cursor else None
+        reverse = False
+
+        if decoded is not None:
+            direction, pk = decoded
+
+            anchor = self._get_keyset_anchor(sort_column, sort_desc, pk)
+
+            if anchor is not None:
+                reverse = direction == tools.CURSOR_PREV
+                nulls_last = self._nulls_sort_last()
+
+                # (a, b) > (x, y) expanded as a > x OR (a = x AND b > y) for portability
+                clauses = []
+
+                for idx, (column, is_desc, nullable) in enumerate(columns):
+                    descending = is_desc != reverse
+                    nulls_after = nulls_last != descending
+
+                    if anchor[idx] is None:
+                        # Non-NULL values follow NULL anchor only if NULLs go first
+                        if nulls_after:
+                            continue
+
+                        stmt = column.isnot(None)
+                    else:
+                        if descending:
+                            stmt = column < anchor[idx]
+                        else:
+                            stmt = column > anchor[idx]
+
+                        if nullable and nulls_after:
+                            stmt = or_(stmt, column.is_(None))
+
+                    prefix = [c.is_(None) if v is None else c == v
+                              for (c, _, _), v in zip(columns[:idx], anchor[:idx])]
+                    clauses.append(and_(*(prefix + [stmt])))
+
+                query = query.filter(or_(*clauses))
+
+        for column, is_desc, _ in columns:
+            query = query.order_by(desc(column) if is_desc != reverse else column)
+
+        return query, joins, reverse
+
+    def _get_projection(self, columns=None):
+        """
+            Return names of the model attributes that should be loaded for
+            the columns or `None` if all attributes should be loaded.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view columns.
+        """
+        names = self._get_projection_names(columns)
+
+        if names is None:
+            return None
+
+        mapper = self.model._sa_class_manager.mapper
+        attrs = set()
+
+        for name in names:
+            if not isinstance(name, string_types):
+                return None
+
+            key = name.split('.')[0]
+
+            # Virtual columns and hybrid properties can use any attribute
+            if not mapper.has_property(key):
+                return None
+
+            prop = mapper.get_property(key)
+
+            if hasattr(prop, 'direction'):
+                # Relations need local foreign key columns to load
+                for column in prop.local_columns:
+                    attrs.add(mapper.get_property_by_column(column).key)
+            elif hasattr(prop, 'columns'):
+                attrs.add(prop.key)
+            else:
+                return None
+
+        return attrs
+
     def _apply_pagination(self, query, page, page_size):
         if page_size is None:
             page_size = self.page_size
@@ -967,8 +1459,47 @@ class ModelView(BaseModelView):
 
         return query
 
+    def _estimate_count(self, search, filters):
+        """
+            Return number of records from the table statistics or `None` if
+            estimate is not available. Only PostgreSQL is supported.
+
+            Statistics do not account for search, filters and restrictions
+            of `get_query` or `get_count_query`, so estimate is not available
+            if any of them is active and exact count is used instead.
+
+            :param search:
+                Search query
+            :param filters:
+                List of filter tuples
+        """
+        if search or filters:
+            return None
+
+        if (type(self).get_query != ModelView.get_query or
+                type(self).get_count_query != ModelView.get_count_query):
+            return None
+
+        mapper = self.model._sa_class_manager.mapper
+        bind = self.session.get_bind(mapper=mapper)
+
+        if bind is None or bind.dialect.name != 'postgresql' or mapper.single:
+            return None
+
+        # Table statistics are maintained by VACUUM and ANALYZE
+        stmt = text('SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)')
+        rows = self.session.execute(stmt, {'name': mapper.local_table.fullname},
+                                    mapper=mapper).scalar()
+
+        # Never analyzed tables report negative number of rows
+        if rows is None or rows < 0:
+            return None
+
+        return int(rows)
+
     def get_list(self, page, sort_column, sort_desc, search, filters,
-                 execute=True, page_size=None):
+                 execute=True, page_size=None, cursor=None, columns=None,
+                 count_strategy=None, load_options=None):
         """
             Return records from the database.
 
@@ -988,6 +1519,17 @@ class ModelView(BaseModelView):
                 Number of results. Defaults to ModelView's page_size. Can be
                 overriden to change the page_size limit. Removing the page_size
                 limit requires setting page_size to 0 or False.
+            :param cursor:
+                Keyset pagination cursor. Only used if `keyset_pagination` is enabled,
+                `page` is ignored in this mode.
+            :param columns:
+                List of (name, label) tuples of the columns to load if
+                `column_auto_projection` is enabled. Defaults to list view columns.
+            :param count_strategy:
+                Overrides `count_strategy` of the view
+            :param load_options:
+                List of SQLAlchemy loader options. Defaults to the list view
+                options, see `eager_load`.
         """
 
         # Will contain join paths with optional aliased object
@@ -998,7 +1540,6 @@ class ModelView(BaseModelView):
         count_query = self.get_count_query() if not self.simple_list_pager else None
 
         # Ignore eager-loaded relations (prevent unnecessary joins)
-        # TODO: Separate join detection for query and count query?
         if hasattr(query, '_join_entities'):
             for entity in query._join_entities:
                 for table in entity.tables:
@@ -1021,32 +1562,173 @@ class ModelView(BaseModelView):
                                                                          filters)
 
         # Calculate number of rows if necessary
-        count = count_query.scalar() if count_query else None
+        if count_query is not None:
+            count = self._get_list_count(search, filters, count_query.scalar,
+                                         partial(self._estimate_count, search, filters),
+                                         count_strategy)
+        else:
+            count = None
 
-        # Auto join
-        for j in self._auto_joins:
-            query = query.options(joinedload(j))
+        # Eager load relations
+        if load_options is None:
+            load_options = self._eager_load['list']
 
-        # Sorting
-        query, joins = self._apply_sorting(query, joins, sort_column, sort_desc)
+        if load_options:
+            query = query.options(*load_options)
 
-        # Pagination
-        query = self._apply_pagination(query, page, page_size)
+        # Load only displayed columns
+        projection = self._get_projection(columns)
+        if projection:
+            query = query.options(load_only(*projection))
+
+        if self.keyset_pagination:
+            # Sorting and seek to the cursor
+            query, joins, reverse = self._apply_keyset(query, joins, sort_column, sort_desc, cursor)
+
+            # Pagination
+            query = self._apply_pagination(query, None, page_size)
+        else:
+            reverse = False
+
+            # Sorting
+            query, joins = self._apply_sorting(query, joins, sort_column, sort_desc)
+
+            # Pagination
+            query = self._apply_pagination(query, page, page_size)
 
         # Execute if needed
         if execute:
             query = query.all()
 
+            # Previous page was loaded in reverse order
+            if reverse:
+                query.reverse()
+
         return count, query
 
-    def get_one(self, id):
+    def get_list_cursors(self, data, cursor, page_size):
+        """
+            Return page data and cursors for the previous and next pages
+            when `keyset_pagination` is enabled.
+
+            :param data:
+                Records returned by `get_list`, including one extra record
+                if there are more records in the direction of travel
+            :param cursor:
+                Cursor that was used to load the records
+            :param page_size:
+                Number of records per page
+        """
+        decoded = tools.decode_cursor(cursor) if cursor else None
+        direction = decoded[0] if decoded is not None else None
+
+        has_more = bool(page_size) and len(data) > page_size
+
+        if direction == tools.CURSOR_PREV:
+            # Extra record is the first one, next page always exists
+            if has_more:
+                data = data[1:]
+
+            has_prev, has_next = has_more, True
+        else:
+            if has_more:
+                data = data[:page_size]
+
+            has_prev, has_next = direction == tools.CURSOR_NEXT, has_more
+
+        prev_cursor = next_cursor = None
+
+        if data:
+            if has_prev:
+                prev_cursor = tools.encode_cursor(tools.CURSOR_PREV, self.get_pk_value(data[0]))
+
+            if has_next:
+                next_cursor = tools.encode_cursor(tools.CURSOR_NEXT, self.get_pk_value(data[-1]))
+
+        return data, prev_cursor, next_cursor
+
+    def get_export_list(self, sort_column, sort_desc, search, filters):
+        """
+            Return records to export. Records are streamed from the database
+            in chunks of `export_chunk_size` using a server-side cursor, if
+            database driver supports it.
+        """
+        count, query = self.get_list(0, sort_column, sort_desc, search, filters,
+                                     execute=False, page_size=self.export_max_rows,
+                                     columns=self._export_columns,
+                                     load_options=self._eager_load['export'])
+
+        return count, self._iter_export_query(query)
+
+    def _iter_export_query(self, query):
+        chunk_size = self.export_chunk_size
+
+        try:
+            rows = iter(query.execution_options(stream_results=True).yield_per(chunk_size))
+        except InvalidRequestError:
+            # yield_per is not compatible with joined eager loading of collections
+            rows = iter(query)
+
+        chunk = []
+
+        for row in rows:
+            chunk.append(row)
+
+            yield row
+
+            # Release exported models, so memory usage stays constant
+            if len(chunk) >= chunk_size:
+                for m in chunk:
+                    if m in self.session:
+                        self.session.expunge(m)
+
+                chunk = []
+
+    def get_one(self, id, load_options=None):
         """
             Return a single model by its id.
 
             :param id:
                 Model id
+            :param load_options:
+                Optional list of SQLAlchemy loader options
+        """
+        query = self.session.query(self.model)
+
+        if load_options:
+            query = query.options(*load_options)
+
+        return query.get(tools.iterdecode(id))
+
+    def _get_one_for_view(self, id, view):
+        # Overridden `get_one` may not accept loader options
+        if type(self).get_one != ModelView.get_one:
+            return self.get_one(id)
+
+        return self.get_one(id, load_options=self._eager_load[view])
+
+    def get_list_by_ids(self, ids):
         """
-        return self.session.query(self.model).get(tools.iterdecode(id))
+            Return models with passed ids in the same order, using a single
+            query.
+
+            :param ids:
+                List of model ids
+        """
+        if not ids:
+            return []
+
+        query = tools.get_query_for_ids(self.get_query(), self.model, ids)
+
+        if self._eager_load['list']:
+            query = query.options(*self._eager_load['list'])
+
+        projection = self._get_projection()
+        if projection:
+            query = query.options(load_only(*projection))
+
+        models = dict((text_type(self.get_pk_value(m)), m) for m in query)
+        return [models[id] for id in ids if id in models]
 
     # Error handler
     def handle_view_exception(self, exc):
@@ -1137,6 +1819,78 @@ class ModelView(BaseModelView):
 
         return True
 
+    def delete_many(self, ids):
+        """
+            Delete models with passed ids in a single transaction.
+
+            Models are loaded in chunks of `action_chunk_size`. If
+            `fast_mass_delete` is enabled, every chunk is removed with a
+            single ``DELETE`` statement. Otherwise models are deleted through
+            the session, so SQLAlchemy can cleanup their dependencies, and
+            flushed once per chunk.
+
+            If `delete_model` is overridden, models are deleted one by one
+            with `delete_model`. If `on_models_delete` raises an exception,
+            the transaction is rolled back and the exception is re-raised, so
+            nothing is deleted. If the database rejects the batch, models are
+            deleted one by one with `delete_model` and `on_model_delete` runs
+            again for them.
+
+            :param ids:
+                List of model ids
+        """
+        # Custom `delete_model` has to run for every record
+        if type(self).delete_model != ModelView.delete_model:
+            return super(ModelView, self).delete_many(ids)
+
+        count = 0
+        deleted = []
+        in_hook = False
+
+        try:
+            for chunk in iterchunks(ids, self.action_chunk_size):
+                query = tools.get_query_for_ids(self.get_query(), self.model, chunk)
+                models = query.all()
+
+                if not models:
+                    continue
+
+                # Exceptions from the hook veto the delete, do not fall back
+                in_hook = True
+                self.on_models_delete(models)
+                in_hook = False
+
+                if self.fast_mass_delete:
+                    self.session.flush()
+                    count += query.delete(synchronize_session=False)
+
+                    # Keep loaded attributes for `after_models_delete`
+                    for model in models:
+                        self.session.expunge(model)
+                else:
+                    for model in models:
+                        self.session.delete(model)
+
+                    self.session.flush()
+                    count += len(models)
+
+                deleted.extend(models)
+
+            self.session.commit()
+        except Exception as ex:
+            self.session.rollback()
+
+            if in_hook or not isinstance(ex, SQLAlchemyError):
+                raise
+
+            log.exception('Failed to delete records, deleting one by one.')
+
+            return super(ModelView, self).delete_many(ids)
+
+        self.after_models_delete(deleted)
+
+        return count
+
     # Default model actions
     def is_action_allowed(self, name):
         # Check delete action permission
@@ -1150,18 +1904,7 @@ class ModelView(BaseModelView):
             lazy_gettext('Are you sure you want to delete selected records?'))
     def action_delete(self, ids):
         try:
-            query = tools.get_query_for_ids(self.get_query(), self.model, ids)
-
-            if self.fast_mass_delete:
-                count = query.delete(synchronize_session=False)
-            else:
-                count = 0
-
-                for m in query.all():
-                    if self.delete_model(m):
-                        count += 1
-
-            self.session.commit()
+            count = self.delete_many(ids)
 
             flash(ngettext('Record was successfully deleted.',
                            '%(count)s records were successfully deleted.',
@@ -1,5 +1,7 @@
 import os
 import os.path as op
+import uuid
+import logging
 
 from werkzeug import secure_filename
 from werkzeug.datastructures import FileStorage
@@ -26,7 +28,12 @@ except ImportError:
 
 __all__ = ['FileUploadInput', 'FileUploadField',
            'ImageUploadInput', 'ImageUploadField',
-           'namegen_filename', 'thumbgen_filename']
+           'namegen_filename', 'thumbgen_filename',
+           'generate_thumbnail']
+
+
+# Set up logger
+log = logging.getLogger("flask-admin.upload")
 
 
 # Widgets
@@ -113,6 +120,12 @@ class ImageUploadInput(object):
     def get_url(self, field):
         if field.thumbnail_size:
             filename = field.thumbnail_fn(field.data)
+
+            if field.lazy_thumbnails:
+                try:
+                    field.get_thumbnail(field.data)
+                except (IOError, OSError):
+                    pass
         else:
             filename = field.data
 
@@ -308,6 +321,8 @@ class ImageUploadField(FileUploadField):
                  thumbgen=None, thumbnail_size=None,
                  permission=0o666,
                  url_relative_path=None, endpoint='static',
+                 thumbnail_sizes=None, thumbnail_executor=None,
+                 lazy_thumbnails=False,
                  **kwargs):
         """
             Constructor.
@@ -373,6 +388,31 @@ class ImageUploadField(FileUploadField):
                 `base_path` is pointing to subdirectory.
             :param endpoint:
                 Static endpoint for images. Used by widget to display previews. Defaults to 'static'.
+            :param thumbnail_sizes:
+                Dictionary of additional thumbnail sizes, where key is the size name and value is
+                (width, height, force) tuple. Thumbnail file names are generated by
+                `get_thumbnail_filename`.
+
+                For example::
+
+                    class MyForm(BaseForm):
+                        upload = ImageUploadField('File',
+                                                  thumbnail_size=(100, 100, True),
+                                                  thumbnail_sizes={'large': (800, 600, False)})
+
+            :param thumbnail_executor:
+                Object with `concurrent.futures.Executor` compatible `submit` method. If provided,
+                thumbnails are generated from the saved image in the background instead of the
+                form submit request. Both thread and process pools are supported.
+            :param lazy_thumbnails:
+                Do not generate thumbnails on upload. Thumbnail is generated by `get_thumbnail`
+                when it is first requested and kept on disk. The widget requests the preview
+                thumbnail when it is rendered.
+
+                Thumbnails are served by the `endpoint`, which knows nothing about the field, so
+                the widget and explicit `get_thumbnail` calls are the only triggers. List
+                formatters and other code that link to thumbnails with `url_for` have to call
+                `get_thumbnail` of a bound field or `generate_thumbnail` first.
         """
         # Check if PIL is installed
         if Image is None:
@@ -381,6 +421,9 @@ class ImageUploadField(FileUploadField):
         self.max_size = max_size
         self.thumbnail_fn = thumbgen or thumbgen_filename
         self.thumbnail_size = thumbnail_size
+        self.thumbnail_sizes = thumbnail_sizes or {}
+        self.thumbnail_executor = thumbnail_executor
+        self.lazy_thumbnails = lazy_thumbnails
         self.endpoint = endpoint
         self.image = None
         self.url_relative_path = url_relative_path
@@ -412,10 +455,59 @@ class ImageUploadField(FileUploadField):
         self._delete_thumbnail(filename)
 
     def _delete_thumbnail(self, filename):
-        path = self._get_path(self.thumbnail_fn(filename))
+        for size_name in self._get_thumbnail_sizes():
+            path = self._get_path(self.get_thumbnail_filename(filename, size_name))
 
-        if op.exists(path):
-            os.remove(path)
+            if op.exists(path):
+                os.remove(path)
+
+    # Thumbnails
+    def _get_thumbnail_sizes(self):
+        sizes = dict(self.thumbnail_sizes)
+
+        if self.thumbnail_size:
+            sizes[None] = self.thumbnail_size
+
+        return sizes
+
+    def get_thumbnail_filename(self, filename, size_name=None):
+        """
+            Return thumbnail file name.
+
+            :param filename:
+                Image file name
+            :param size_name:
+                Name of the size from `thumbnail_sizes`. If not provided,
+                returns name of the `thumbnail_size` thumbnail.
+        """
+        thumbnail = self.thumbnail_fn(filename)
+
+        if size_name is None:
+            return thumbnail
+
+        name, ext = op.splitext(thumbnail)
+        return '%s_%s%s' % (name, size_name, ext)
+
+    def get_thumbnail(self, filename, size_name=None):
+        """
+            Return path of the thumbnail, generate it if it does not exist yet.
+
+            With `lazy_thumbnails` enabled, call it before linking to the
+            thumbnail outside of the widget.
+
+            :param filename:
+                Image file name
+            :param size_name:
+                Name of the size from `thumbnail_sizes`. If not provided,
+                returns `thumbnail_size` thumbnail.
+        """
+        path = self._get_path(self.get_thumbnail_filename(filename, size_name))
+
+        if not op.exists(path):
+            size = self._get_thumbnail_sizes()[size_name]
+            generate_thumbnail(self._get_path(filename), path, size)
+
+        return path
 
     # Saving
     def _save_file(self, data, filename):
@@ -443,32 +535,31 @@ class ImageUploadField(FileUploadField):
         return filename
 
     def _save_thumbnail(self, data, filename, format):
-        if self.image and self.thumbnail_size:
-            path = self._get_path(self.thumbnail_fn(filename))
-
-            self._save_image(self._resize(self.image, self.thumbnail_size),
-                             path,
-                             format)
+        if not self.image or self.lazy_thumbnails:
+            return
 
-    def _resize(self, image, size):
-        (width, height, force) = size
+        for size_name, size in self._get_thumbnail_sizes().items():
+            path = self._get_path(self.get_thumbnail_filename(filename, size_name))
 
-        if image.size[0] > width or image.size[1] > height:
-            if force:
-                return ImageOps.fit(self.image, (width, height), Image.ANTIALIAS)
+            if self.thumbnail_executor is not None:
+                future = self.thumbnail_executor.submit(generate_thumbnail,
+                                                        self._get_path(filename),
+                                                        path, size, format)
+                future.add_done_callback(self._log_thumbnail_error)
             else:
-                thumb = self.image.copy()
-                thumb.thumbnail((width, height), Image.ANTIALIAS)
-                return thumb
+                self._save_image(self._resize(self.image, size), path, format)
 
-        return image
+    def _log_thumbnail_error(self, future):
+        # Nobody waits for the background thumbnails, so errors would be lost
+        ex = future.exception()
+        if ex is not None:
+            log.error('Failed to generate thumbnail: %s' % ex, exc_info=ex)
 
-    def _save_image(self, image, path, format='JPEG'):
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGBA')
+    def _resize(self, image, size):
+        return resize_image(image, size)
 
-        with open(path, 'wb') as fp:
-            image.save(fp, format)
+    def _save_image(self, image, path, format='JPEG'):
+        save_image(image, path, format)
 
     def _get_save_format(self, filename, image):
         if image.format not in self.keep_image_formats:
@@ -480,6 +571,70 @@ class ImageUploadField(FileUploadField):
 
 
 # Helpers
+def resize_image(image, size):
+    """
+        Resize image to fit (width, height, force) size. Images that are
+        already smaller are returned as is.
+    """
+    (width, height, force) = size
+
+    if image.size[0] > width or image.size[1] > height:
+        if force:
+            return ImageOps.fit(image, (width, height), Image.ANTIALIAS)
+        else:
+            thumb = image.copy()
+            thumb.thumbnail((width, height), Image.ANTIALIAS)
+            return thumb
+
+    return image
+
+
+def save_image(image, path, format='JPEG'):
+    """
+        Save image to the `path` in the given format.
+    """
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+
+    # JPEG does not support transparency
+    if format == 'JPEG' and image.mode == 'RGBA':
+        image = image.convert('RGB')
+
+    with open(path, 'wb') as fp:
+        image.save(fp, format)
+
+
+def generate_thumbnail(source, path, size, format=None):
+    """
+        Generate thumbnail of the `source` image and save it to the `path`.
+
+        JPEG images are decoded in draft mode at the smallest scale that
+        still covers the thumbnail size, which is much faster than decoding
+        full image. Thumbnail is written to a temporary file first, so
+        readers never see partially written thumbnail.
+
+        :param source:
+            Path to the image
+        :param path:
+            Path to save thumbnail to
+        :param size:
+            Tuple of (width, height, force)
+        :param format:
+            Thumbnail format. Defaults to the format of the source image.
+    """
+    image = Image.open(source)
+    format = format or image.format
+
+    if image.format == 'JPEG':
+        image.draft('RGB', (size[0], size[1]))
+
+    tmp_path = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+    save_image(resize_image(image, size), tmp_path, format)
+    getattr(os, 'replace', os.rename)(tmp_path, path)
+
+    return path
+
+
 def namegen_filename(obj, file_data):
     """
         Generate secure filename for uploaded file.
@@ -1,4 +1,10 @@
+from flask import json
+
+from .cache import MemoryListCache
+
+
 DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
 
 
 class AjaxModelLoader(object):
@@ -9,18 +15,60 @@ class AjaxModelLoader(object):
         """
             Constructor.
 
+            Supported options:
+
+             - `min_length` - minimum length of the lookup term, shorter terms
+               return no results without running a query
+             - `max_limit` - maximum number of results returned by a single
+               lookup. Defaults to 100.
+             - `cache_timeout` - number of seconds to keep lookup results in
+               the in-process cache. Disabled by default.
+             - `cache_size` - maximum number of cached lookups. Defaults to 1000.
+             - `cache_scope` - callable that returns JSON serializable value
+               that identifies records visible to the current user. See
+               `get_cache_scope`.
+
             :param name:
                 Field name
         """
         self.name = name
         self.options = options
 
+        self.min_length = options.get('min_length', 0)
+        self.max_limit = options.get('max_limit', MAX_PAGE_SIZE)
+
+        cache_timeout = options.get('cache_timeout')
+
+        if cache_timeout:
+            self._cache = MemoryListCache(max_size=options.get('cache_size', 1000),
+                                          timeout=cache_timeout)
+        else:
+            self._cache = None
+
     def format(self, model):
         """
             Return (id, name) tuple from the model.
         """
         raise NotImplementedError()
 
+    def get_cache_scope(self):
+        """
+            Return a value that identifies the set of models visible to the
+            current user, for example the user's tenant id.
+
+            The value is a part of the lookup cache key, so users with
+            different scopes never share cached results. Override it, or
+            pass `cache_scope` option, if `get_list` results depend on the
+            current user. Must be JSON serializable. By default returns
+            result of the `cache_scope` option or `None`.
+        """
+        cache_scope = self.options.get('cache_scope')
+
+        if cache_scope is not None:
+            return cache_scope()
+
+        return None
+
     def get_one(self, pk):
         """
             Find model by its primary key.
@@ -30,6 +78,20 @@ class AjaxModelLoader(object):
         """
         raise NotImplementedError()
 
+    def get_many(self, pks):
+        """
+            Find models by their primary keys.
+
+            Returns a list of the same length as `pks` with `None` in place
+            of models that were not found. By default calls `get_one` for
+            every key, model backends override it to load all models with
+            a single query.
+
+            :param pks:
+                List of primary key values
+        """
+        return [self.get_one(pk) for pk in pks]
+
     def get_list(self, query, offset=0, limit=DEFAULT_PAGE_SIZE):
         """
             Return models that match `query`.
@@ -44,3 +106,39 @@ class AjaxModelLoader(object):
                 Limit
         """
         raise NotImplementedError()
+
+    def lookup(self, term, offset=0, limit=DEFAULT_PAGE_SIZE):
+        """
+            Return list of (id, name) tuples of the models that match `term`.
+
+            Used by the `ajax_lookup` view. Applies `min_length` and
+            `max_limit` options and caches results if `cache_timeout` is set,
+            so repeated keystrokes do not hit the data source. Cached results
+            can be up to `cache_timeout` seconds old.
+
+            :param term:
+                Query string
+            :param offset:
+                Offset
+            :param limit:
+                Limit
+        """
+        term = term or ''
+
+        if len(term) < self.min_length:
+            return []
+
+        limit = min(limit or DEFAULT_PAGE_SIZE, self.max_limit)
+
+        if self._cache is None:
+            return [self.format(m) for m in self.get_list(term, offset, limit)]
+
+        key = (term, offset, limit, json.dumps(self.get_cache_scope()))
+
+        data = self._cache.get(key)
+
+        if data is None:
+            data = [self.format(m) for m in self.get_list(term, offset, limit)]
+            self._cache.set(key, data)
+
+        return data
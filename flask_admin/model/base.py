@@ -3,13 +3,15 @@ import re
 import csv
 import mimetypes
 import time
+import hashlib
 from math import ceil
 
 from werkzeug import secure_filename
 
 from flask import (current_app, request, redirect, flash, abort, json,
-                   Response, get_flashed_messages, stream_with_context)
-from jinja2 import contextfunction
+                   Response, get_flashed_messages, stream_with_context,
+                   copy_current_request_context, send_file)
+from jinja2 import contextfunction, escape, Markup
 try:
     import tablib
 except ImportError:
@@ -32,6 +34,7 @@ from flask_admin._compat import (iteritems, itervalues, OrderedDict,
                                  as_unicode, csv_encode, text_type)
 from .helpers import prettify_name, get_mdict_item_or_list
 from .ajax import AjaxModelLoader
+from .jobs import JobRegistry, JOB_DONE
 
 # Used to generate filter query string name
 filter_char_re = re.compile('[^a-z0-9 ]')
@@ -43,8 +46,9 @@ class ViewArgs(object):
         List view arguments.
     """
     def __init__(self, page=None, page_size=None, sort=None, sort_desc=None,
-                 search=None, filters=None, extra_args=None):
+                 search=None, filters=None, extra_args=None, cursor=None):
         self.page = page
+        self.cursor = cursor
         self.page_size = page_size
         self.sort = sort
         self.sort_desc = bool(sort_desc)
@@ -63,6 +67,7 @@ class ViewArgs(object):
             flt = None
 
         kwargs.setdefault('page', self.page)
+        kwargs.setdefault('cursor', self.cursor)
         kwargs.setdefault('page_size', self.page_size)
         kwargs.setdefault('sort', self.sort)
         kwargs.setdefault('sort_desc', self.sort_desc)
@@ -73,6 +78,51 @@ class ViewArgs(object):
         return ViewArgs(**kwargs)
 
 
+class ListRow(object):
+    """
+        Precomputed list view row.
+
+        Rendered by `admin/model/list_fast.html` template without calling
+        back into the view for every cell.
+    """
+    __slots__ = ('model', 'pk', 'cells', 'actions')
+
+    def __init__(self, model, pk, cells, actions):
+        self.model = model
+        self.pk = pk
+        self.cells = cells
+        self.actions = actions
+
+
+class SharedListForms(object):
+    """
+        Inline editing forms of the list view that share single form
+        instance. Looking up the form by primary key loads values of the
+        editable columns from the corresponding model.
+    """
+    def __init__(self, form, models, get_pk_value, columns):
+        self.form = form
+        self.models = dict((get_pk_value(m), m) for m in models)
+        self.columns = [c for c in columns if c in form]
+
+    def __getitem__(self, pk):
+        model = self.models[pk]
+
+        for name in self.columns:
+            self.form[name].data = getattr(model, name, None)
+
+        return self.form
+
+    def get(self, pk, default=None):
+        if pk not in self.models:
+            return default
+
+        return self[pk]
+
+    def __contains__(self, pk):
+        return pk in self.models
+
+
 class FilterGroup(object):
     def __init__(self, label):
         self.label = label
@@ -136,7 +186,13 @@ class BaseModelView(BaseView, ActionsMixin):
 
     # Templates
     list_template = 'admin/model/list.html'
-    """Default list view template"""
+    """
+        Default list view template.
+
+        Set to `admin/model/list_fast.html` to render rows prepared by
+        `get_list_rows`. It is faster for large pages, but does not have
+        per-row and per-cell template blocks to override.
+    """
 
     edit_template = 'admin/model/edit.html'
     """Default edit template"""
@@ -407,6 +463,16 @@ class BaseModelView(BaseView, ActionsMixin):
                 column_editable_list = ('name', 'last_name')
     """
 
+    column_editable_list_lazy = False
+    """
+        Render inline editing widgets of all rows from a single form
+        instance instead of creating a form for every row on the page.
+
+        Form field data is replaced with the model attribute value before
+        the row is rendered, so custom widgets that depend on other form
+        state or on the form object should keep this disabled.
+    """
+
     column_choices = None
     """
         Map choices to columns in list view
@@ -487,6 +553,90 @@ class BaseModelView(BaseView, ActionsMixin):
         If enabled, model interface would not run count query and will only show prev/next pager buttons.
     """
 
+    count_strategy = 'exact'
+    """
+        Strategy used to count records in the list view.
+
+        Supported strategies:
+
+         - `exact` - run count query on every request
+         - `cached` - remember count for every search and filter combination
+           for `count_cache_timeout` seconds
+         - `estimate` - use data source statistics to estimate number of
+           records, for example `pg_class.reltuples` for PostgreSQL and
+           `estimated_document_count` for MongoDB. Statistics describe the
+           whole table, so exact count is used if search or filters are
+           active, if the query is restricted by an overridden `get_query`
+           or `get_count_query`, or if estimate is not available.
+         - `lazy` - render the list without a count and load the count from
+           `ajax_count` endpoint once the page is displayed. Only prev/next
+           pager buttons are displayed in this mode.
+
+        Ignored if `simple_list_pager` is enabled.
+    """
+
+    count_cache_timeout = 60
+    """
+        Number of seconds to keep record counts when `count_strategy` is
+        set to `cached`.
+
+        Counts are remembered per `get_list_cache_scope` value and are
+        dropped by `invalidate_list_cache`.
+    """
+
+    column_auto_projection = False
+    """
+        Load only the columns that are displayed from the data source.
+
+        If enabled, list view queries will only load the columns from
+        `column_list` and `column_editable_list`, and export queries will only
+        load the columns from `column_export_list`, which avoids loading
+        large text or binary columns that are never displayed.
+
+        If any of the columns is not a model field (for example, a virtual
+        column rendered by a formatter), all columns are loaded. Please note
+        that column formatters that access other model fields will trigger
+        additional queries.
+    """
+
+    keyset_pagination = False
+    """
+        Enable keyset (seek) pagination for the list view.
+
+        Instead of page numbers, pager links carry an opaque cursor that points
+        to the first or the last record of the current page. The data source
+        then seeks directly to the requested records using the sort column
+        and the primary key, so opening a deep page costs the same as
+        opening the first one.
+
+        Only prev/next pager buttons are displayed in this mode. Requires
+        model backend support, see `get_list_cursors`.
+    """
+
+    list_cache = None
+    """
+        Cache for the list view results.
+
+        If set, list view remembers the number of records and primary keys
+        of the records for every page, sort, search and filter combination,
+        so repeated requests only load the displayed records by their primary
+        keys. For example::
+
+            from flask_admin.model.cache import MemoryListCache
+
+            class MyModelView(BaseModelView):
+                list_cache = MemoryListCache(max_size=1000, timeout=60)
+
+        Use `flask_admin.model.cache.RedisListCache` to share the cache
+        between worker processes.
+
+        Cached pages are invalidated when records are created, edited or
+        deleted through the view and after every mass action. Call
+        `invalidate_list_cache` if data is changed outside of the view. If
+        visible records depend on the current user, override
+        `get_list_cache_scope`. Ignored if `keyset_pagination` is enabled.
+    """
+
     form = None
     """
         Form class. Override if you want to use custom form for your model.
@@ -654,6 +804,22 @@ class BaseModelView(BaseView, ActionsMixin):
                     'user': QueryAjaxModelLoader('user', db.session, User, fields=['email'], page_size=10)
                 }
 
+        Lookup results can be cached for a few seconds and the number of results per lookup is
+        limited, see `AjaxModelLoader` for available options. SQLAlchemy backend also accepts
+        a `search_backend` option, for example `PrefixSearch` which can use indexes::
+
+            from flask_admin.contrib.sqla.search import PrefixSearch
+
+            class MyModelView(BaseModelView):
+                form_ajax_refs = {
+                    'user': {
+                        'fields': ('email',),
+                        'search_backend': PrefixSearch(),
+                        'min_length': 2,
+                        'cache_timeout': 10
+                    }
+                }
+
         If you need custom loading functionality, you can implement your custom loading behavior
         in your `AjaxModelLoader` class.
     """
@@ -708,6 +874,13 @@ class BaseModelView(BaseView, ActionsMixin):
                 action_disallowed_list = ['delete']
     """
 
+    action_chunk_size = 500
+    """
+        Number of records processed at a time by the built-in mass delete
+        action. Every chunk is loaded with a single query and passed to
+        `on_models_delete`.
+    """
+
     # Export settings
     export_max_rows = 0
     """
@@ -725,6 +898,43 @@ class BaseModelView(BaseView, ActionsMixin):
         for supported types.
     """
 
+    export_chunk_size = 1000
+    """
+        Number of records loaded from the data source at a time during export.
+
+        Model backends that support it stream exported records in chunks of
+        this size instead of loading the complete result into memory.
+    """
+
+    export_async = False
+    """
+        Run exports as background jobs.
+
+        If enabled, export links start a background job that writes the
+        export into a temporary file, and the list view polls the job status
+        and downloads the file once it is ready. Requires
+        `concurrent.futures`, which is available in Python 3 or as the
+        `futures` package for Python 2.
+    """
+
+    job_registry = None
+    """
+        :class:`~flask_admin.model.jobs.JobRegistry` used to run background
+        jobs. If not set, the view creates a registry with the default thread
+        pool when the first job is submitted.
+
+        Example::
+
+            from concurrent.futures import ThreadPoolExecutor
+            from flask_admin.model.jobs import JobRegistry
+
+            jobs = JobRegistry(executor=ThreadPoolExecutor(max_workers=4))
+
+            class MyModelView(BaseModelView):
+                export_async = True
+                job_registry = jobs
+    """
+
     # Various settings
     page_size = 20
     """
@@ -778,6 +988,9 @@ class BaseModelView(BaseView, ActionsMixin):
         # Actions
         self.init_actions()
 
+        # Record counts for `cached` count strategy
+        self._count_cache = {}
+
         # Scaffolding
         self._refresh_cache()
 
@@ -896,6 +1109,14 @@ class BaseModelView(BaseView, ActionsMixin):
         if self.column_type_formatters_export is None:
             self.column_type_formatters_export = dict(typefmt.EXPORT_FORMATTERS)
 
+        # Compiled column value getters
+        self._list_value_getters = {}
+        self._export_value_getters = {}
+
+        # Type formatters resolved by concrete value type
+        self._list_type_formatters = {}
+        self._export_type_formatters = {}
+
         if self.column_descriptions is None:
             self.column_descriptions = dict()
 
@@ -1479,6 +1700,228 @@ class BaseModelView(BaseView, ActionsMixin):
         """
         raise NotImplementedError('Please implement get_one method')
 
+    def _get_one_for_view(self, id, view):
+        """
+            Return one model for the `edit` or `details` view.
+
+            Model backends override it to load related models displayed
+            by the view. By default calls `get_one`.
+
+            :param id:
+                Model id
+            :param view:
+                View name, `edit` or `details`
+        """
+        return self.get_one(id)
+
+    def get_list_by_ids(self, ids):
+        """
+            Return models with passed ids in the same order. Missing models
+            are skipped.
+
+            Used to load list view pages from `list_cache`. By default,
+            models are loaded one by one with `get_one`. Model backends
+            override this method to load all models with a single query.
+
+            :param ids:
+                List of model ids
+        """
+        result = []
+
+        for id in ids:
+            model = self.get_one(id)
+
+            if model is not None:
+                result.append(model)
+
+        return result
+
+    def get_list_cache_scope(self):
+        """
+            Return a value that identifies the set of records visible to the
+            current user, for example the user's tenant id.
+
+            The value is a part of the `list_cache` key, so users with
+            different scopes never share cached pages. Must be JSON
+            serializable. By default returns `None`, which means every user
+            sees the same records.
+        """
+        return None
+
+    def invalidate_list_cache(self):
+        """
+            Invalidate all pages of the view stored in `list_cache` and
+            record counts remembered by the `cached` count strategy.
+        """
+        self._count_cache.clear()
+
+        if self.list_cache is not None:
+            self.list_cache.bump_generation(self.endpoint)
+
+    def _get_cached_list(self, page, sort_column, sort_desc, search, filters,
+                         page_size=None):
+        """
+            Call `get_list`, using `list_cache` if it is enabled.
+        """
+        cache = self.list_cache
+
+        if cache is None:
+            return self.get_list(page, sort_column, sort_desc, search, filters,
+                                 page_size=page_size)
+
+        # Read generation first, so a page loaded while the data is being
+        # changed is stored with the outdated generation
+        key = json.dumps([self.endpoint,
+                          cache.get_generation(self.endpoint),
+                          page, sort_column, sort_desc, search,
+                          [list(f) for f in filters or ()],
+                          page_size,
+                          self.get_list_cache_scope()])
+        key = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+        cached = cache.get(key)
+        if cached is not None:
+            count, ids = cached
+            return count, self.get_list_by_ids(ids)
+
+        count, data = self.get_list(page, sort_column, sort_desc, search, filters,
+                                    page_size=page_size)
+        data = list(data)
+
+        cache.set(key, [count, [as_unicode(self.get_pk_value(m)) for m in data]])
+
+        return count, data
+
+    def get_list_cursors(self, data, cursor, page_size):
+        """
+            Return page data and cursors for the previous and next pages.
+
+            Used when `keyset_pagination` is enabled. In this mode, `get_list`
+            is called with an additional `cursor` keyword argument and asked
+            for one record more than `page_size`, so backend can tell if
+            there are more records in the direction of travel.
+
+            Must be implemented in the child class to support keyset pagination.
+
+            Returns a tuple of the page data without the extra record,
+            previous page cursor and next page cursor. Cursors are `None` if
+            there is no such page.
+
+            :param data:
+                Records returned by `get_list`
+            :param cursor:
+                Cursor that was used to load the records or `None` for the
+                first page
+            :param page_size:
+                Number of records per page
+        """
+        raise NotImplementedError('Please implement get_list_cursors method')
+
+    def get_export_list(self, sort_column, sort_desc, search, filters):
+        """
+            Return records to export as a tuple of count and iterable.
+
+            By default calls `get_list` with `export_max_rows` page size.
+            Model backends override this method to stream records in chunks
+            of `export_chunk_size`.
+
+            :param sort_column:
+                Sort column name or None.
+            :param sort_desc:
+                If set to True, sorting is in descending order.
+            :param search:
+                Search query
+            :param filters:
+                List of filter tuples
+        """
+        return self.get_list(0, sort_column, sort_desc, search, filters,
+                             page_size=self.export_max_rows)
+
+    def get_count(self, search, filters):
+        """
+            Return exact number of records that match search query and filters.
+
+            Used by the `ajax_count` endpoint when `count_strategy` is `lazy`.
+
+            :param search:
+                Search query
+            :param filters:
+                List of filter tuples
+        """
+        count, _ = self.get_list(0, None, None, search, filters,
+                                 execute=False, count_strategy='exact')
+        return count
+
+    def _get_list_count(self, search, filters, count, estimate=None, count_strategy=None):
+        """
+            Count records using configured `count_strategy`.
+
+            Called by model backends from `get_list`.
+
+            :param search:
+                Search query
+            :param filters:
+                List of filter tuples
+            :param count:
+                Callable that returns exact number of records
+            :param estimate:
+                Optional callable that returns estimated number of records or
+                `None` if estimate is not available
+            :param count_strategy:
+                Overrides `count_strategy` for this call
+        """
+        strategy = count_strategy or self.count_strategy
+
+        if strategy == 'lazy':
+            return None
+
+        if strategy == 'estimate' and estimate is not None:
+            result = estimate()
+
+            if result is not None:
+                return result
+
+        if strategy == 'cached':
+            key = (search, tuple(tuple(f) for f in filters or ()),
+                   json.dumps(self.get_list_cache_scope()))
+            now = time.time()
+
+            entry = self._count_cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            result = count()
+
+            # Drop expired entries so the cache does not grow unbounded
+            for k, v in list(iteritems(self._count_cache)):
+                if v[0] <= now:
+                    self._count_cache.pop(k, None)
+
+            self._count_cache[key] = (now + self.count_cache_timeout, result)
+            return result
+
+        return count()
+
+    def _get_projection_names(self, columns=None):
+        """
+            Return names of the columns that should be loaded from the data
+            source or `None` if all columns should be loaded.
+
+            :param columns:
+                List of (name, label) column tuples. Defaults to list view
+                columns.
+        """
+        if not self.column_auto_projection:
+            return None
+
+        if columns is None:
+            names = [c for c, _ in self._list_columns]
+            names.extend(c for c in self.column_editable_list if c not in names)
+        else:
+            names = [c for c, _ in columns]
+
+        return names
+
     # Exception handler
     def handle_view_exception(self, exc):
         if isinstance(exc, ValidationError):
@@ -1569,6 +2012,38 @@ class BaseModelView(BaseView, ActionsMixin):
         """
         pass
 
+    def on_models_delete(self, models):
+        """
+            Perform some actions before a list of models is deleted by the
+            mass delete action.
+
+            Called from delete_many in the same transaction
+            (if it has any meaning for a store backend).
+
+            By default calls `on_model_delete` for every model.
+
+            :param models:
+                List of models that will be deleted
+        """
+        for model in models:
+            self.on_model_delete(model)
+
+    def after_models_delete(self, models):
+        """
+            Perform some actions after a list of models was deleted by the
+            mass delete action and committed to the database.
+
+            Called from delete_many after successful database commit
+            (if it has any meaning for a store backend).
+
+            By default calls `after_model_delete` for every model.
+
+            :param models:
+                List of models that were deleted
+        """
+        for model in models:
+            self.after_model_delete(model)
+
     def on_form_prefill(self, form, id):
         """
             Perform additional actions to pre-fill the edit form.
@@ -1633,6 +2108,36 @@ class BaseModelView(BaseView, ActionsMixin):
         """
         raise NotImplementedError()
 
+    def delete_many(self, ids):
+        """
+            Delete models with passed ids. Used by the mass delete action.
+
+            Returns number of deleted models.
+
+            Model backends override this method to load and delete models in
+            chunks of `action_chunk_size` and run `on_models_delete` and
+            `after_models_delete` hooks once per chunk. By default, models
+            are deleted one by one with `delete_model`.
+
+            Backends fall back to this implementation if `delete_model` is
+            overridden or if the database rejects the batch, so custom
+            deletion logic runs for every record and errors are reported per
+            record. Exceptions raised by `on_models_delete` are not caught,
+            they veto the delete.
+
+            :param ids:
+                List of model ids
+        """
+        count = 0
+
+        for id in ids:
+            model = self.get_one(id)
+
+            if model is not None and self.delete_model(model):
+                count += 1
+
+        return count
+
     # Various helpers
     def _prettify_name(self, name):
         """
@@ -1682,6 +2187,7 @@ class BaseModelView(BaseView, ActionsMixin):
             Return arguments from query string.
         """
         return ViewArgs(page=request.args.get('page', 0, type=int),
+                        cursor=request.args.get('cursor', None),
                         page_size=request.args.get('page_size', 0, type=int),
                         sort=request.args.get('sort', None, type=int),
                         sort_desc=request.args.get('desc', None, type=int),
@@ -1720,7 +2226,8 @@ class BaseModelView(BaseView, ActionsMixin):
         page = view_args.page or None
         desc = 1 if view_args.sort_desc else None
 
-        kwargs = dict(page=page, sort=view_args.sort, desc=desc, search=view_args.search)
+        kwargs = dict(page=page, cursor=view_args.cursor, sort=view_args.sort, desc=desc,
+                      search=view_args.search)
         kwargs.update(view_args.extra_args)
 
         if view_args.page_size:
@@ -1747,6 +2254,61 @@ class BaseModelView(BaseView, ActionsMixin):
         """
         return rec_getattr(model, name)
 
+    def _compile_value_getter(self, model_class, name, column_formatters,
+                              column_type_formatters, type_formatters_cache):
+        """
+            Resolve column formatter, choices and type formatters for the
+            column once and return a function that takes the context and the
+            model instance and returns the value to be displayed.
+
+            :param model_class:
+                Model class
+            :param name:
+                Field name
+            :param column_formatters:
+                column_formatters to be used.
+            :param column_type_formatters:
+                column_type_formatters to be used.
+            :param type_formatters_cache:
+                Dictionary that maps concrete value types to type formatters.
+                Shared by all columns that use the same type formatters.
+        """
+        column_fmt = column_formatters.get(
+            '%s.%s' % (model_class.__name__, name),
+            column_formatters.get(name))
+
+        choices_map = self._column_choices_map.get(name)
+        get_field_value = self._get_field_value
+
+        def get_value(context, model):
+            if column_fmt is not None:
+                value = column_fmt(self, context, model, name)
+            else:
+                value = get_field_value(model, name)
+
+            if choices_map:
+                return choices_map.get(value) or value
+
+            value_type = type(value)
+
+            try:
+                type_fmt = type_formatters_cache[value_type]
+            except KeyError:
+                type_fmt = None
+                for typeobj, formatter in column_type_formatters.items():
+                    if isinstance(value, typeobj):
+                        type_fmt = formatter
+                        break
+
+                type_formatters_cache[value_type] = type_fmt
+
+            if type_fmt is not None:
+                value = type_fmt(self, value)
+
+            return value
+
+        return get_value
+
     def _get_list_value(self, context, model, name, column_formatters,
                         column_type_formatters):
         """
@@ -1763,28 +2325,11 @@ class BaseModelView(BaseView, ActionsMixin):
             :param column_type_formatters:
                 column_type_formatters to be used.
         """
-        column_fmt = column_formatters.get(
-            '%s.%s' % (model.__class__.__name__, name),
-            column_formatters.get(name))
-
-        if column_fmt is not None:
-            value = column_fmt(self, context, model, name)
-        else:
-            value = self._get_field_value(model, name)
-
-        choices_map = self._column_choices_map.get(name, {})
-        if choices_map:
-            return choices_map.get(value) or value
-
-        type_fmt = None
-        for typeobj, formatter in column_type_formatters.items():
-            if isinstance(value, typeobj):
-                type_fmt = formatter
-                break
-        if type_fmt is not None:
-            value = type_fmt(self, value)
-
-        return value
+        get_value = self._compile_value_getter(model.__class__, name,
+                                               column_formatters,
+                                               column_type_formatters,
+                                               {})
+        return get_value(context, model)
 
     @contextfunction
     def get_list_value(self, context, model, name):
@@ -1798,13 +2343,69 @@ class BaseModelView(BaseView, ActionsMixin):
             :param name:
                 Field name
         """
-        return self._get_list_value(
-            context,
-            model,
-            name,
-            self.column_formatters,
-            self.column_type_formatters,
-        )
+        key = (model.__class__, name)
+
+        get_value = self._list_value_getters.get(key)
+        if get_value is None:
+            get_value = self._list_value_getters[key] = self._compile_value_getter(
+                model.__class__,
+                name,
+                self.column_formatters,
+                self.column_type_formatters,
+                self._list_type_formatters,
+            )
+
+        return get_value(context, model)
+
+    @contextfunction
+    def get_list_rows(self, context, data, list_forms, list_row_actions):
+        """
+            Prepare list view rows for rendering. Returns list of `ListRow`
+            objects. Cells are tuples of column name, column label and
+            escaped value or rendered inline editing widget, row actions
+            are rendered to HTML.
+
+            :param context:
+                :py:class:`jinja2.runtime.Context`
+            :param data:
+                List of models
+            :param list_forms:
+                Inline editing forms, keyed by primary key
+            :param list_row_actions:
+                List of row actions
+        """
+        columns = [(c, name, self.is_editable(c)) for c, name in self._list_columns]
+        display_actions = self.column_display_actions
+
+        rows = []
+
+        for model in data:
+            pk = self.get_pk_value(model)
+            form = list_forms.get(pk)
+
+            cells = []
+            for c, name, editable in columns:
+                value = self.get_list_value(context, model, c)
+
+                if editable:
+                    kwargs = dict(pk=pk, display_value=value)
+                    if getattr(form, 'csrf_token', None):
+                        kwargs['csrf'] = form.csrf_token._value()
+                    value = form[c](**kwargs)
+                else:
+                    value = escape(value)
+
+                cells.append((c, name, value))
+
+            if display_actions:
+                actions = Markup('').join(action.render(context, pk, model)
+                                          for action in list_row_actions)
+            else:
+                actions = None
+
+            rows.append(ListRow(model, pk, cells, actions))
+
+        return rows
 
     def get_export_value(self, model, name):
         """
@@ -1816,13 +2417,19 @@ class BaseModelView(BaseView, ActionsMixin):
             :param name:
                 Field name
         """
-        return self._get_list_value(
-            None,
-            model,
-            name,
-            self.column_formatters_export,
-            self.column_type_formatters_export,
-        )
+        key = (model.__class__, name)
+
+        get_value = self._export_value_getters.get(key)
+        if get_value is None:
+            get_value = self._export_value_getters[key] = self._compile_value_getter(
+                model.__class__,
+                name,
+                self.column_formatters_export,
+                self.column_type_formatters_export,
+                self._export_type_formatters,
+            )
+
+        return get_value(None, model)
 
     def get_export_name(self, export_type='csv'):
         """
@@ -1858,6 +2465,15 @@ class BaseModelView(BaseView, ActionsMixin):
         """
         raise NotImplementedError()
 
+    def _get_ajax_loader(self, name):
+        """
+            Return AJAX model loader used by the `ajax_lookup` view or `None`.
+
+            :param name:
+                Loader name
+        """
+        return self._form_ajax_refs.get(name)
+
     # Views
     @expose('/')
     def index_view(self):
@@ -1881,13 +2497,29 @@ class BaseModelView(BaseView, ActionsMixin):
         page_size = view_args.page_size or self.page_size
 
         # Get count and data
-        count, data = self.get_list(view_args.page, sort_column, view_args.sort_desc,
-                                    view_args.search, view_args.filters, page_size=page_size)
+        if self.keyset_pagination:
+            # Ask for one extra record to see if there are more pages
+            count, data = self.get_list(None, sort_column, view_args.sort_desc,
+                                        view_args.search, view_args.filters,
+                                        page_size=page_size + 1 if page_size else page_size,
+                                        cursor=view_args.cursor)
+
+            data, prev_cursor, next_cursor = self.get_list_cursors(data, view_args.cursor, page_size)
+        else:
+            count, data = self._get_cached_list(view_args.page, sort_column, view_args.sort_desc,
+                                                view_args.search, view_args.filters, page_size=page_size)
+
+            prev_cursor = next_cursor = None
 
         list_forms = {}
         if self.column_editable_list:
-            for row in data:
-                list_forms[self.get_pk_value(row)] = self.list_form(obj=row)
+            if self.column_editable_list_lazy:
+                list_forms = SharedListForms(self.list_form(), data,
+                                             self.get_pk_value,
+                                             self.column_editable_list)
+            else:
+                for row in data:
+                    list_forms[self.get_pk_value(row)] = self.list_form(obj=row)
 
         # Calculate number of pages
         if count is not None and page_size:
@@ -1905,17 +2537,23 @@ class BaseModelView(BaseView, ActionsMixin):
 
             return self._get_list_url(view_args.clone(page=p))
 
+        def cursor_url(cursor):
+            if cursor is None:
+                return None
+
+            return self._get_list_url(view_args.clone(cursor=cursor))
+
         def sort_url(column, invert=False, desc=None):
             if not desc and invert and not view_args.sort_desc:
                 desc = 1
 
-            return self._get_list_url(view_args.clone(sort=column, sort_desc=desc))
+            return self._get_list_url(view_args.clone(sort=column, sort_desc=desc, cursor=None))
 
         def page_size_url(s):
             if not s:
                 s = self.page_size
 
-            return self._get_list_url(view_args.clone(page_size=s))
+            return self._get_list_url(view_args.clone(page_size=s, cursor=None))
 
         # Actions
         actions, actions_confirmation = self.get_actions_list()
@@ -1924,7 +2562,15 @@ class BaseModelView(BaseView, ActionsMixin):
         else:
             action_form = None
 
+        # Count is loaded with a separate request in `lazy` mode
+        if self.count_strategy == 'lazy' and not self.simple_list_pager:
+            count_url = self.get_url('.ajax_count', search=view_args.search,
+                                     **self._get_filters(view_args.filters))
+        else:
+            count_url = None
+
         clear_search_url = self._get_list_url(view_args.clone(page=0,
+                                                              cursor=None,
                                                               sort=view_args.sort,
                                                               sort_desc=view_args.sort_desc,
                                                               search=None,
@@ -1945,6 +2591,7 @@ class BaseModelView(BaseView, ActionsMixin):
 
             # Pagination
             count=count,
+            count_url=count_url,
             pager_url=pager_url,
             num_pages=num_pages,
             can_set_page_size=self.can_set_page_size,
@@ -1952,6 +2599,8 @@ class BaseModelView(BaseView, ActionsMixin):
             page=view_args.page,
             page_size=page_size,
             default_page_size=self.page_size,
+            prev_page_url=cursor_url(prev_cursor),
+            next_page_url=cursor_url(next_cursor),
 
             # Sorting
             sort_column=view_args.sort,
@@ -1977,6 +2626,7 @@ class BaseModelView(BaseView, ActionsMixin):
             enumerate=enumerate,
             get_pk_value=self.get_pk_value,
             get_value=self.get_list_value,
+            get_list_rows=self.get_list_rows,
             return_url=self._get_list_url(view_args),
         )
 
@@ -1999,6 +2649,7 @@ class BaseModelView(BaseView, ActionsMixin):
             # in later versions, this is the model itself
             model = self.create_model(form)
             if model:
+                self.invalidate_list_cache()
                 flash(gettext('Record was successfully created.'), 'success')
                 if '_add_another' in request.form:
                     return redirect(request.url)
@@ -2040,7 +2691,7 @@ class BaseModelView(BaseView, ActionsMixin):
         if id is None:
             return redirect(return_url)
 
-        model = self.get_one(id)
+        model = self._get_one_for_view(id, 'edit')
 
         if model is None:
             flash(gettext('Record does not exist.'), 'error')
@@ -2052,6 +2703,7 @@ class BaseModelView(BaseView, ActionsMixin):
 
         if self.validate_form(form):
             if self.update_model(form, model):
+                self.invalidate_list_cache()
                 flash(gettext('Record was successfully saved.'), 'success')
                 if '_add_another' in request.form:
                     return redirect(self.get_url('.create_view', url=return_url))
@@ -2092,7 +2744,7 @@ class BaseModelView(BaseView, ActionsMixin):
         if id is None:
             return redirect(return_url)
 
-        model = self.get_one(id)
+        model = self._get_one_for_view(id, 'details')
 
         if model is None:
             flash(gettext('Record does not exist.'), 'error')
@@ -2133,6 +2785,7 @@ class BaseModelView(BaseView, ActionsMixin):
 
             # message is flashed from within delete_model if it fails
             if self.delete_model(model):
+                self.invalidate_list_cache()
                 flash(gettext('Record was successfully deleted.'), 'success')
                 return redirect(return_url)
         else:
@@ -2145,7 +2798,11 @@ class BaseModelView(BaseView, ActionsMixin):
         """
             Mass-model action view.
         """
-        return self.handle_action()
+        try:
+            return self.handle_action()
+        finally:
+            # Actions can change any number of records
+            self.invalidate_list_cache()
 
     def _export_data(self):
         # Macros in column_formatters are not supported.
@@ -2172,11 +2829,8 @@ class BaseModelView(BaseView, ActionsMixin):
             sort_column = sort_column[0]
 
         # Get count and data
-        count, data = self.get_list(0, sort_column, view_args.sort_desc,
-                                    view_args.search, view_args.filters,
-                                    page_size=self.export_max_rows)
-
-        return count, data
+        return self.get_export_list(sort_column, view_args.sort_desc,
+                                    view_args.search, view_args.filters)
 
     @expose('/export/<export_type>/')
     def export(self, export_type):
@@ -2191,12 +2845,10 @@ class BaseModelView(BaseView, ActionsMixin):
         else:
             return self._export_tablib(export_type, return_url)
 
-    def _export_csv(self, return_url):
+    def _iter_export_csv(self, data):
         """
-            Export a CSV of records as a stream.
+            Generate CSV rows for the exported records.
         """
-        count, data = self._export_data()
-
         # https://docs.djangoproject.com/en/1.8/howto/outputting-csv/
         class Echo(object):
             """
@@ -2212,22 +2864,57 @@ class BaseModelView(BaseView, ActionsMixin):
 
         writer = csv.writer(Echo())
 
-        def generate():
-            # Append the column titles at the beginning
-            titles = [csv_encode(c[1]) for c in self._export_columns]
-            yield writer.writerow(titles)
+        # Append the column titles at the beginning
+        titles = [csv_encode(c[1]) for c in self._export_columns]
+        yield writer.writerow(titles)
 
-            for row in data:
-                vals = [csv_encode(self.get_export_value(row, c[0]))
-                        for c in self._export_columns]
-                yield writer.writerow(vals)
+        for row in data:
+            vals = [csv_encode(self.get_export_value(row, c[0]))
+                    for c in self._export_columns]
+            yield writer.writerow(vals)
+
+    def _get_export_mimetype(self, filename):
+        mimetype, encoding = mimetypes.guess_type(filename)
+        if not mimetype:
+            mimetype = 'application/octet-stream'
+        if encoding:
+            mimetype = '%s; charset=%s' % (mimetype, encoding)
+
+        return mimetype
+
+    def _get_export_tablib_data(self, export_type, data):
+        """
+            Build tablib dataset from the exported records and return it
+            in the requested format.
+
+            Raises `tablib.UnsupportedFormat` if format is not supported.
+        """
+        ds = tablib.Dataset(headers=[c[1] for c in self._export_columns])
+
+        for row in data:
+            vals = [self.get_export_value(row, c[0]) for c in self._export_columns]
+            ds.append(vals)
+
+        try:
+            return ds.export(format=export_type)
+        except AttributeError:
+            try:
+                return getattr(ds, export_type)
+            except AttributeError:
+                raise tablib.UnsupportedFormat(export_type)
+
+    def _export_csv(self, return_url):
+        """
+            Export a CSV of records as a stream.
+        """
+        count, data = self._export_data()
 
         filename = self.get_export_name(export_type='csv')
 
         disposition = 'attachment;filename=%s' % (secure_filename(filename),)
 
         return Response(
-            stream_with_context(generate()),
+            stream_with_context(self._iter_export_csv(data)),
             headers={'Content-Disposition': disposition},
             mimetype='text/csv'
         )
@@ -2244,26 +2931,13 @@ class BaseModelView(BaseView, ActionsMixin):
 
         disposition = 'attachment;filename=%s' % (secure_filename(filename),)
 
-        mimetype, encoding = mimetypes.guess_type(filename)
-        if not mimetype:
-            mimetype = 'application/octet-stream'
-        if encoding:
-            mimetype = '%s; charset=%s' % (mimetype, encoding)
-
-        ds = tablib.Dataset(headers=[c[1] for c in self._export_columns])
+        mimetype = self._get_export_mimetype(filename)
 
         count, data = self._export_data()
 
-        for row in data:
-            vals = [self.get_export_value(row, c[0]) for c in self._export_columns]
-            ds.append(vals)
-
         try:
-            try:
-                response_data = ds.export(format=export_type)
-            except AttributeError:
-                response_data = getattr(ds, export_type)
-        except (AttributeError, tablib.UnsupportedFormat):
+            response_data = self._get_export_tablib_data(export_type, data)
+        except tablib.UnsupportedFormat:
             flash(gettext('Export type "%(type)s not supported.',
                           type=export_type), 'error')
             return redirect(return_url)
@@ -2274,6 +2948,150 @@ class BaseModelView(BaseView, ActionsMixin):
             mimetype=mimetype,
         )
 
+    # Background jobs
+    def get_job_registry(self):
+        """
+            Return job registry, create default one if `job_registry` is not set.
+        """
+        if self.job_registry is None:
+            self.job_registry = JobRegistry()
+
+        return self.job_registry
+
+    def get_job_user(self):
+        """
+            Return identifier of the current user, for example the user's
+            id.
+
+            The value is stored with background jobs, so only the user who
+            started a job can check its status and download its result. Must
+            be JSON serializable. By default returns `None`, which means jobs
+            are only bound to the view that started them.
+        """
+        return None
+
+    def get_job(self, job_id):
+        """
+            Return job by id or `None` if job does not exist or was started
+            by a different view or user.
+
+            :param job_id:
+                Job id
+        """
+        job = self.get_job_registry().get(job_id)
+
+        if job is None or job.endpoint != self.endpoint or job.user != self.get_job_user():
+            return None
+
+        return job
+
+    def submit_job(self, name, func, *args, **kwargs):
+        """
+            Run `func(job, *args, **kwargs)` as a background job with a copy
+            of the current request context and return the job.
+
+            Can be used by custom actions that take too long to run inside
+            the request. Job is bound to the view and `get_job_user`.
+
+            :param name:
+                Job name
+            :param func:
+                Job function
+        """
+        registry = self.get_job_registry()
+
+        job = registry.create(name, endpoint=self.endpoint, user=self.get_job_user())
+        registry.run(job, copy_current_request_context(func), *args, **kwargs)
+
+        return job
+
+    def _get_job_info(self, job):
+        info = job.to_dict()
+        info['status_url'] = self.get_url('.export_status', job_id=job.id)
+        info['download_url'] = self.get_url('.export_download', job_id=job.id)
+        return info
+
+    def _export_job(self, job, export_type):
+        """
+            Background job that writes the export into the job file.
+        """
+        filename = self.get_export_name(export_type)
+
+        count, data = self._export_data()
+
+        job.filename = filename
+        job.mimetype = 'text/csv' if export_type == 'csv' else self._get_export_mimetype(filename)
+        job.set_progress(0, count)
+
+        # Report progress once per chunk of exported records
+        progress = [0]
+
+        def track(data):
+            for row in data:
+                yield row
+
+                progress[0] += 1
+                if progress[0] % self.export_chunk_size == 0:
+                    job.set_progress(progress[0])
+
+        with job.open() as f:
+            if export_type == 'csv':
+                for line in self._iter_export_csv(track(data)):
+                    if isinstance(line, text_type):
+                        line = line.encode('utf-8')
+
+                    f.write(line)
+            else:
+                content = self._get_export_tablib_data(export_type, track(data))
+
+                if isinstance(content, text_type):
+                    content = content.encode('utf-8')
+
+                f.write(content)
+
+        job.set_progress(progress[0])
+
+    @expose('/export/<export_type>/async/')
+    def export_async_view(self, export_type):
+        """
+            Start background export job. Returns job status as JSON.
+        """
+        if (not self.can_export or not self.export_async or
+                export_type not in self.export_types or
+                (export_type != 'csv' and tablib is None)):
+            abort(404)
+
+        job = self.submit_job('export', self._export_job, export_type)
+
+        return Response(json.dumps(self._get_job_info(job)), mimetype='application/json')
+
+    @expose('/export/job/<job_id>/')
+    def export_status(self, job_id):
+        """
+            Returns background export job status as JSON.
+        """
+        job = self.get_job(job_id)
+
+        if not self.can_export or job is None:
+            abort(404)
+
+        return Response(json.dumps(self._get_job_info(job)), mimetype='application/json')
+
+    @expose('/export/job/<job_id>/download/')
+    def export_download(self, job_id):
+        """
+            Download result of the finished background export job.
+        """
+        job = self.get_job(job_id)
+
+        if not self.can_export or job is None or job.status != JOB_DONE:
+            abort(404)
+
+        return send_file(job.path,
+                         mimetype=job.mimetype,
+                         as_attachment=True,
+                         attachment_filename=secure_filename(job.filename))
+
     @expose('/ajax/lookup/')
     def ajax_lookup(self):
         name = request.args.get('name')
@@ -2281,14 +3099,28 @@ class BaseModelView(BaseView, ActionsMixin):
         offset = request.args.get('offset', type=int)
         limit = request.args.get('limit', 10, type=int)
 
-        loader = self._form_ajax_refs.get(name)
+        loader = self._get_ajax_loader(name)
 
         if not loader:
             abort(404)
 
-        data = [loader.format(m) for m in loader.get_list(query, offset, limit)]
+        data = loader.lookup(query, offset, limit)
         return Response(json.dumps(data), mimetype='application/json')
 
+    @expose('/ajax/count/')
+    def ajax_count(self):
+        """
+            Returns number of records in the list view. Used when
+            `count_strategy` is set to `lazy`.
+        """
+        if self.count_strategy != 'lazy' or self.simple_list_pager:
+            abort(404)
+
+        view_args = self._get_list_extra_args()
+        count = self.get_count(view_args.search, view_args.filters)
+
+        return Response(json.dumps({'count': count}), mimetype='application/json')
+
     @expose('/ajax/update/', methods=('POST',))
     def ajax_update(self):
         """
@@ -2315,6 +3147,8 @@ class BaseModelView(BaseView, ActionsMixin):
                 return gettext('Record does not exist.'), 500
 
             if self.update_model(form, record):
+                self.invalidate_list_cache()
+
                 # Success
                 return gettext('Record was successfully saved.')
             else:
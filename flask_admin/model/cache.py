@@ -0,0 +1,155 @@
+import time
+import threading
+
+from flask import json
+
+from flask_admin._compat import OrderedDict
+
+
+class BaseListCache(object):
+    """
+        Base class for the list view result caches.
+
+        Cache stores the number of records and primary keys of the records
+        displayed on the list view page. Every cache key contains a
+        generation number of the view, so all cached pages of the view are
+        invalidated at once by bumping the generation.
+    """
+    def get(self, key):
+        """
+            Return cached value or `None` if key is not in the cache.
+
+            :param key:
+                Cache key
+        """
+        raise NotImplementedError()
+
+    def set(self, key, value):
+        """
+            Store value in the cache.
+
+            :param key:
+                Cache key
+            :param value:
+                JSON serializable value
+        """
+        raise NotImplementedError()
+
+    def get_generation(self, namespace):
+        """
+            Return current generation number of the namespace.
+
+            :param namespace:
+                Namespace, usually view endpoint
+        """
+        raise NotImplementedError()
+
+    def bump_generation(self, namespace):
+        """
+            Increment generation number of the namespace, so cached values
+            stored with previous generation are no longer used.
+
+            :param namespace:
+                Namespace, usually view endpoint
+        """
+        raise NotImplementedError()
+
+
+class MemoryListCache(BaseListCache):
+    """
+        In-process LRU cache with expiration.
+
+        Every worker process keeps its own copy of the cache and invalidation
+        only affects the process that changed the data, so use
+        `RedisListCache` if application runs in multiple processes.
+    """
+    def __init__(self, max_size=1000, timeout=60):
+        """
+            Constructor.
+
+            :param max_size:
+                Maximum number of cached pages
+            :param timeout:
+                Number of seconds to keep cached pages
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._data = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+
+            if entry is None:
+                return None
+
+            if entry[0] <= time.time():
+                return None
+
+            # Move entry to the end, so it is evicted last
+            self._data[key] = entry
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.time() + self.timeout, value)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisListCache(BaseListCache):
+    """
+        Cache that stores values in Redis or any other server with
+        redis-py compatible client.
+
+        Generation numbers are stored in the server as well, so invalidation
+        is shared by all processes that use the same server.
+    """
+    def __init__(self, client, timeout=60, prefix='flask_admin:list:'):
+        """
+            Constructor.
+
+            :param client:
+                Client object with redis-py compatible `get`, `setex` and
+                `incr` methods
+            :param timeout:
+                Number of seconds to keep cached pages
+            :param prefix:
+                Prefix of the keys stored in the server
+        """
+        self.client = client
+        self.timeout = timeout
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+
+        if value is None:
+            return None
+
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+
+        return json.loads(value)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.timeout, json.dumps(value))
+
+    def get_generation(self, namespace):
+        value = self.client.get(self.prefix + 'gen:' + namespace)
+        return int(value) if value is not None else 0
+
+    def bump_generation(self, namespace):
+        self.client.incr(self.prefix + 'gen:' + namespace)
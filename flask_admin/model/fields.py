@@ -191,10 +191,11 @@ class AjaxSelectMultipleField(AjaxSelectField):
         if formdata:
             data = []
 
-            # TODO: Optimize?
-            for item in formdata:
-                model = self.loader.get_one(item) if item else None
+            pks = [item for item in formdata if item]
+            if len(pks) != len(formdata):
+                self._invalid_formdata = True
 
+            for model in self.loader.get_many(pks):
                 if model:
                     data.append(model)
                 else:
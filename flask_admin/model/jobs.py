@@ -0,0 +1,277 @@
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import tempfile
+
+from flask_admin.tools import make_private_dir, open_private_file
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+
+# Set up logger
+log = logging.getLogger("flask-admin.jobs")
+
+# Job states
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+job_id_re = re.compile('^[0-9a-f]{32}$')
+
+
+class Job(object):
+    """
+        State of the background job.
+
+        Job function receives the job as a first argument and can report
+        progress with `set_progress` and write its result with `open`.
+    """
+    def __init__(self, registry, id, name, status=JOB_PENDING, progress=0,
+                 total=None, filename=None, mimetype=None, error=None,
+                 created=None, updated=None, endpoint=None, user=None):
+        self.registry = registry
+        self.id = id
+        self.name = name
+        self.endpoint = endpoint
+        self.user = user
+        self.status = status
+        self.progress = progress
+        self.total = total
+        self.filename = filename
+        self.mimetype = mimetype
+        self.error = error
+        self.created = created or time.time()
+        self.updated = updated
+
+    @property
+    def path(self):
+        """
+            Path of the file with the job result.
+        """
+        return self.registry.get_path(self.id, 'data')
+
+    def open(self, mode='wb'):
+        """
+            Open the job result file for writing. File is only readable by
+            the current user.
+
+            :param mode:
+                File mode
+        """
+        return open_private_file(self.path, mode)
+
+    def set_progress(self, progress, total=None):
+        """
+            Update job progress.
+
+            :param progress:
+                Number of processed items
+            :param total:
+                Total number of items, if known
+        """
+        self.progress = progress
+
+        if total is not None:
+            self.total = total
+
+        self.save()
+
+    def save(self):
+        """
+            Save job state to the registry.
+        """
+        self.updated = time.time()
+        self.registry.save(self)
+
+    def to_dict(self):
+        return dict(id=self.id,
+                    name=self.name,
+                    endpoint=self.endpoint,
+                    user=self.user,
+                    status=self.status,
+                    progress=self.progress,
+                    total=self.total,
+                    filename=self.filename,
+                    mimetype=self.mimetype,
+                    error=self.error,
+                    created=self.created,
+                    updated=self.updated)
+
+
+class JobRegistry(object):
+    """
+        Runs background jobs and keeps track of their state.
+
+        Job state is stored as a JSON file in the `directory` next to the job
+        result, so every worker process on the same host can report job
+        status and serve the result, not only the one that runs the job.
+
+        The directory is only accessible by the user that runs the
+        application and job files are only readable by this user.
+    """
+    def __init__(self, directory=None, executor=None, max_workers=2, timeout=3600):
+        """
+            Constructor.
+
+            :param directory:
+                Directory for job state and result files. Defaults to
+                `flask-admin-jobs-<uid>` in the system temporary directory.
+            :param executor:
+                Object with `concurrent.futures.Executor` compatible
+                `submit` method. Defaults to a thread pool.
+            :param max_workers:
+                Number of threads for the default executor
+            :param timeout:
+                Number of seconds to keep jobs after their last update
+        """
+        if directory is None:
+            suffix = '-%s' % os.getuid() if hasattr(os, 'getuid') else ''
+            directory = os.path.join(tempfile.gettempdir(), 'flask-admin-jobs' + suffix)
+
+        self.directory = directory
+        self.executor = executor
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def get_executor(self):
+        """
+            Return executor, create default thread pool if necessary.
+        """
+        if self.executor is None:
+            if ThreadPoolExecutor is None:
+                raise Exception('Background jobs require concurrent.futures. '
+                                'Please install futures package.')
+
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self.executor
+
+    def get_path(self, id, ext):
+        """
+            Return path of the job file.
+
+            :param id:
+                Job id
+            :param ext:
+                File extension
+        """
+        return os.path.join(self.directory, '%s.%s' % (id, ext))
+
+    def create(self, name, endpoint=None, user=None):
+        """
+            Create and store a pending job.
+
+            :param name:
+                Job name
+            :param endpoint:
+                Endpoint of the view that created the job
+            :param user:
+                JSON serializable identifier of the user who created the job
+        """
+        make_private_dir(self.directory)
+
+        self.cleanup()
+
+        job = Job(self, uuid.uuid4().hex, name, endpoint=endpoint, user=user)
+        job.save()
+
+        return job
+
+    def run(self, job, func, *args, **kwargs):
+        """
+            Run `func(job, *args, **kwargs)` in the background.
+
+            :param job:
+                Job created with `create`
+            :param func:
+                Job function
+        """
+        self.get_executor().submit(self._run, job, func, args, kwargs)
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+            Run `func(job, *args, **kwargs)` in the background and return
+            created job.
+
+            :param name:
+                Job name
+            :param func:
+                Job function
+        """
+        job = self.create(name)
+        self.run(job, func, *args, **kwargs)
+
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        job.status = JOB_RUNNING
+        job.save()
+
+        try:
+            func(job, *args, **kwargs)
+        except Exception as ex:
+            log.exception('Background job %s failed.' % job.name)
+
+            job.status = JOB_FAILED
+            job.error = str(ex)
+        else:
+            job.status = JOB_DONE
+
+        job.save()
+
+    def get(self, id):
+        """
+            Return job by id or `None` if job does not exist.
+
+            :param id:
+                Job id
+        """
+        if not id or not job_id_re.match(id):
+            return None
+
+        try:
+            with open(self.get_path(id, 'json')) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        return Job(self, **data)
+
+    def save(self, job):
+        """
+            Store job state.
+
+            :param job:
+                Job to store
+        """
+        path = self.get_path(job.id, 'json')
+        tmp_path = '%s.%s' % (path, uuid.uuid4().hex)
+
+        with open_private_file(tmp_path, 'w') as f:
+            json.dump(job.to_dict(), f)
+
+        # Replace state file atomically, so readers never see partial state
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+
+    def cleanup(self):
+        """
+            Remove state and result files of jobs that were not updated
+            for `timeout` seconds.
+        """
+        now = time.time()
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+
+            try:
+                if now - os.path.getmtime(path) > self.timeout:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,82 @@
+var AdminChunkedUpload = function(url) {
+    // Send the file selected in the upload form in chunks. Failed chunks
+    // are retried from the offset reported by the server.
+    var form = $('input[type=file][name=upload]').closest('form');
+
+    form.submit(function(e) {
+        var file = $('input[type=file][name=upload]', form)[0].files[0];
+
+        // Fall back to the regular upload
+        if (!file || !file.slice || !window.FormData)
+            return true;
+
+        e.preventDefault();
+
+        var button = $('[type=submit]', form);
+        var label = button.val();
+
+        // Upload requests are validated like the regular upload form,
+        // chunks send CSRF token in a header, because body is file data
+        var fields = $('input[type=hidden]', form).serializeArray();
+        var headers = {'X-CSRFToken': $('input[name=csrf_token]', form).val() || ''};
+
+        button.prop('disabled', true);
+
+        function error(xhr) {
+            alert((xhr.responseJSON && xhr.responseJSON.error) || xhr.statusText);
+            button.prop('disabled', false).val(label);
+        }
+
+        function complete(upload) {
+            $.ajax({url: upload.complete_url, type: 'POST', data: fields, dataType: 'json'})
+                .done(function(data) {
+                    window.location = data.url;
+                })
+                .fail(error);
+        }
+
+        function send(upload, retries) {
+            if (upload.offset >= file.size)
+                return complete(upload);
+
+            button.val(Math.floor(upload.offset * 100 / file.size) + '%');
+
+            $.ajax({
+                url: upload.url + '?offset=' + upload.offset,
+                type: 'PUT',
+                data: file.slice(upload.offset, upload.offset + upload.chunk_size),
+                processData: false,
+                contentType: 'application/octet-stream',
+                headers: headers,
+                dataType: 'json'
+            }).done(function(data) {
+                send(data, 0);
+            }).fail(function(xhr) {
+                if (xhr.status === 409) {
+                    send(xhr.responseJSON, retries);
+                } else if (xhr.status !== 404 && retries < 5) {
+                    setTimeout(function() {
+                        $.getJSON(upload.url)
+                            .done(function(data) {
+                                send(data, retries + 1);
+                            })
+                            .fail(function() {
+                                send(upload, retries + 1);
+                            });
+                    }, 1000 * (retries + 1));
+                } else {
+                    error(xhr);
+                }
+            });
+        }
+
+        var data = fields.concat([{name: 'filename', value: file.name},
+                                  {name: 'size', value: file.size}]);
+
+        $.ajax({url: url, type: 'POST', data: data, dataType: 'json'})
+            .done(function(upload) {
+                send(upload, 0);
+            })
+            .fail(error);
+    });
+};
@@ -1,9 +1,16 @@
+import os
+import re
+import json
 import os.path as op
+import shutil
+import stat
+import tempfile
+import time
 
 from nose.tools import eq_, ok_
 
 from flask_admin.contrib import fileadmin
-from flask_admin import Admin
+from flask_admin import Admin, form
 from flask import Flask
 
 from . import setup
@@ -189,3 +196,321 @@ def test_modal_edit():
     eq_(rv.status_code, 200)
     data = rv.data.decode('utf-8')
     ok_('fa_modal_window' not in data)
+
+
+def test_listing_cache():
+    path = tempfile.mkdtemp()
+
+    try:
+        with open(op.join(path, 'a.txt'), 'w') as f:
+            f.write('abc')
+        os.mkdir(op.join(path, 'subdir'))
+
+        # Make directories old enough to be cached
+        os.utime(op.join(path, 'subdir'), (time.time() - 60, time.time() - 60))
+        os.utime(path, (time.time() - 60, time.time() - 60))
+
+        storage = fileadmin.LocalFileStorage(path, cache_size=1)
+
+        items = sorted(storage.get_files('', path))
+        eq_([(i[0], i[2], i[3]) for i in items if not i[2]], [('a.txt', False, 3)])
+        eq_([i[0] for i in items if i[2]], ['subdir'])
+
+        # Listing is served from the cache
+        eq_(sorted(storage.get_files('', path)), items)
+        with open(op.join(path, 'a.txt'), 'w') as f:
+            f.write('abcdef')
+        eq_(sorted(storage.get_files('', path)), items)
+
+        # Cached listing is invalidated when directory is modified
+        with open(op.join(path, 'b.txt'), 'w') as f:
+            f.write('')
+        os.utime(path, (time.time() - 30, time.time() - 30))
+
+        names = sorted(i[0] for i in storage.get_files('', path))
+        eq_(names, ['a.txt', 'b.txt', 'subdir'])
+
+        # Least recently used listing is evicted
+        storage.get_files('subdir', op.join(path, 'subdir'))
+        eq_(list(storage._cache), [('subdir', op.join(path, 'subdir'))])
+    finally:
+        shutil.rmtree(path)
+
+
+def test_pagination():
+    path = tempfile.mkdtemp()
+
+    try:
+        for i in range(5):
+            with open(op.join(path, 'file%d.txt' % i), 'w') as f:
+                f.write('x' * i)
+
+        app, admin = setup()
+
+        class PagedFileAdmin(fileadmin.FileAdmin):
+            page_size = 2
+
+        view = PagedFileAdmin(path, '/files/', name='Files')
+        admin.add_view(view)
+
+        storage = view.storage
+        eq_(storage.get_files_page('', path, 0, 2)[0], 5)
+        eq_([i[0] for i in storage.get_files_page('', path, 1, 2)[1]], ['file3.txt', 'file2.txt'])
+        eq_([i[0] for i in storage.get_files_page('', path, 3, 10, 3, True)[1]], ['file1.txt', 'file0.txt'])
+
+        client = app.test_client()
+
+        rv = client.get('/admin/pagedfileadmin/')
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        ok_('path=file4.txt' in data)
+        ok_('path=file3.txt' in data)
+        ok_('path=file2.txt' not in data)
+        ok_('page=2' in data)
+
+        rv = client.get('/admin/pagedfileadmin/?page=2')
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        ok_('path=file0.txt' in data)
+        ok_('path=file1.txt' not in data)
+
+        rv = client.get('/admin/pagedfileadmin/?sort=size&page=1')
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        ok_('path=file2.txt' in data)
+        ok_('path=file3.txt' in data)
+        ok_('path=file4.txt' not in data)
+
+        # inaccessible files do not leave gaps in pages
+        class FilteredFileAdmin(PagedFileAdmin):
+            def is_accessible_path(self, path):
+                return path not in ('file3.txt', 'file2.txt')
+
+        view = FilteredFileAdmin(path, '/files/', name='Filtered')
+        admin.add_view(view)
+
+        rv = client.get('/admin/filteredfileadmin/')
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        ok_('path=file4.txt' in data)
+        ok_('path=file1.txt' in data)
+        ok_('page=1' in data)
+        ok_('page=2' not in data)
+
+        rv = client.get('/admin/filteredfileadmin/?page=1')
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        ok_('path=file0.txt' in data)
+        ok_('path=file1.txt' not in data)
+        ok_('path=file3.txt' not in data)
+    finally:
+        shutil.rmtree(path)
+
+
+def test_download_range():
+    path = tempfile.mkdtemp()
+
+    try:
+        with open(op.join(path, 'data.bin'), 'wb') as f:
+            f.write(b'0123456789')
+
+        app, admin = setup()
+        admin.add_view(fileadmin.FileAdmin(path, name='Files'))
+
+        client = app.test_client()
+
+        rv = client.get('/admin/fileadmin/download/data.bin')
+        eq_(rv.status_code, 200)
+        eq_(rv.data, b'0123456789')
+        eq_(rv.headers['Accept-Ranges'], 'bytes')
+        etag = rv.headers['ETag']
+
+        rv = client.get('/admin/fileadmin/download/data.bin', headers={'Range': 'bytes=4-'})
+        eq_(rv.status_code, 206)
+        eq_(rv.data, b'456789')
+        eq_(rv.headers['Content-Range'], 'bytes 4-9/10')
+
+        rv = client.get('/admin/fileadmin/download/data.bin', headers={'If-None-Match': etag})
+        eq_(rv.status_code, 304)
+    finally:
+        shutil.rmtree(path)
+
+
+def test_chunked_upload():
+    path = tempfile.mkdtemp()
+    upload_dir = tempfile.mkdtemp()
+
+    try:
+        app, admin = setup()
+
+        class ChunkedFileAdmin(fileadmin.FileAdmin):
+            upload_chunk_size = 4
+
+        view = ChunkedFileAdmin(path, name='Files')
+        view.storage.uploads.directory = upload_dir
+        admin.add_view(view)
+
+        client = app.test_client()
+
+        rv = client.get('/admin/chunkedfileadmin/upload/')
+        eq_(rv.status_code, 200)
+        ok_('chunked_upload.js' in rv.data.decode('utf-8'))
+
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='data.bin', size='10'))
+        eq_(rv.status_code, 200)
+        upload = json.loads(rv.data.decode('utf-8'))
+        eq_(upload['offset'], 0)
+        eq_(upload['chunk_size'], 4)
+
+        rv = client.put(upload['url'] + '?offset=0', data=b'0123')
+        eq_(json.loads(rv.data.decode('utf-8'))['offset'], 4)
+
+        # Chunk with wrong offset is rejected
+        rv = client.put(upload['url'] + '?offset=0', data=b'0123')
+        eq_(rv.status_code, 409)
+        eq_(json.loads(rv.data.decode('utf-8'))['offset'], 4)
+
+        # Upload is not complete yet
+        rv = client.post(upload['complete_url'])
+        eq_(rv.status_code, 409)
+        ok_(not op.exists(op.join(path, 'data.bin')))
+
+        client.put(upload['url'] + '?offset=4', data=b'4567')
+        client.put(upload['url'] + '?offset=8', data=b'89')
+
+        rv = client.get(upload['url'])
+        eq_(json.loads(rv.data.decode('utf-8'))['offset'], 10)
+
+        rv = client.post(upload['complete_url'])
+        eq_(rv.status_code, 200)
+
+        with open(op.join(path, 'data.bin'), 'rb') as f:
+            eq_(f.read(), b'0123456789')
+        eq_(os.listdir(upload_dir), [])
+
+        # Existing file
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='data.bin'))
+        eq_(rv.status_code, 409)
+
+        # Cancelled upload
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='other.bin'))
+        upload = json.loads(rv.data.decode('utf-8'))
+        client.put(upload['url'] + '?offset=0', data=b'0123')
+
+        rv = client.delete(upload['url'])
+        eq_(rv.status_code, 200)
+        eq_(client.get(upload['url']).status_code, 404)
+        eq_(os.listdir(upload_dir), [])
+    finally:
+        shutil.rmtree(path)
+        shutil.rmtree(upload_dir)
+
+
+def test_chunked_upload_validation():
+    path = tempfile.mkdtemp()
+    upload_dir = tempfile.mkdtemp()
+
+    try:
+        app, admin = setup()
+
+        class ChunkedFileAdmin(fileadmin.FileAdmin):
+            upload_chunk_size = 4
+            allowed_extensions = ('txt',)
+            form_base_class = form.SecureForm
+
+        view = ChunkedFileAdmin(path, name='Files')
+        view.storage.uploads.directory = upload_dir
+        admin.add_view(view)
+
+        client = app.test_client()
+
+        rv = client.get('/admin/chunkedfileadmin/upload/')
+        eq_(rv.status_code, 200)
+        match = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', rv.data.decode('utf-8'))
+        ok_(match)
+        csrf_token = match.group(1)
+
+        # CSRF token is required
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='data.txt'))
+        eq_(rv.status_code, 400)
+
+        # Extension is checked
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='data.bin', csrf_token=csrf_token))
+        eq_(rv.status_code, 400)
+        eq_(json.loads(rv.data.decode('utf-8'))['error'], 'Invalid file type.')
+
+        rv = client.post('/admin/chunkedfileadmin/upload/chunked/',
+                         data=dict(filename='data.txt', csrf_token=csrf_token))
+        eq_(rv.status_code, 200)
+        upload = json.loads(rv.data.decode('utf-8'))
+
+        # Upload files are private
+        if hasattr(os, 'getuid'):
+            for name in os.listdir(upload_dir):
+                eq_(stat.S_IMODE(os.stat(op.join(upload_dir, name)).st_mode), 0o600)
+
+        # Chunks send CSRF token in a header
+        rv = client.put(upload['url'] + '?offset=0', data=b'0123')
+        eq_(rv.status_code, 400)
+
+        rv = client.put(upload['url'] + '?offset=0', data=b'0123',
+                        headers={'X-CSRFToken': csrf_token})
+        eq_(rv.status_code, 200)
+
+        rv = client.post(upload['complete_url'])
+        eq_(rv.status_code, 400)
+        ok_(not op.exists(op.join(path, 'data.txt')))
+
+        # Upload can not be completed through a different view
+        other = ChunkedFileAdmin(path, name='Other', endpoint='other')
+        other.storage.uploads.directory = upload_dir
+        admin.add_view(other)
+
+        rv = client.post(upload['complete_url'].replace('chunkedfileadmin', 'other'),
+                         data=dict(csrf_token=csrf_token))
+        eq_(rv.status_code, 404)
+
+        rv = client.post(upload['complete_url'], data=dict(csrf_token=csrf_token))
+        eq_(rv.status_code, 200)
+
+        with open(op.join(path, 'data.txt'), 'rb') as f:
+            eq_(f.read(), b'0123')
+
+        # Uploaded file is not private
+        with open(op.join(path, 'regular.txt'), 'w'):
+            pass
+
+        eq_(stat.S_IMODE(os.stat(op.join(path, 'data.txt')).st_mode),
+            stat.S_IMODE(os.stat(op.join(path, 'regular.txt')).st_mode))
+        eq_(fileadmin.get_file_mode(path), stat.S_IMODE(os.stat(op.join(path, 'regular.txt')).st_mode))
+        eq_(sorted(os.listdir(path)), ['data.txt', 'regular.txt'])
+    finally:
+        shutil.rmtree(path)
+        shutil.rmtree(upload_dir)
+
+
+def test_chunked_upload_adminlte():
+    path = tempfile.mkdtemp()
+
+    try:
+        app = Flask(__name__)
+        app.config['SECRET_KEY'] = '1'
+        admin = Admin(app, template_mode='adminlte')
+
+        class ChunkedFileAdmin(fileadmin.FileAdmin):
+            upload_chunk_size = 4
+
+        admin.add_view(ChunkedFileAdmin(path, name='Files'))
+
+        client = app.test_client()
+
+        rv = client.get('/admin/chunkedfileadmin/upload/')
+        eq_(rv.status_code, 200)
+        ok_('chunked_upload.js' in rv.data.decode('utf-8'))
+    finally:
+        shutil.rmtree(path)
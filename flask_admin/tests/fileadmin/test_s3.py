@@ -0,0 +1,106 @@
+from nose.tools import eq_, ok_
+from nose.plugins.skip import SkipTest
+
+try:
+    import boto
+    from moto import mock_s3_deprecated
+except ImportError:
+    raise SkipTest('S3 tests require boto and moto')
+
+from flask_admin.contrib.fileadmin.s3 import S3Storage
+
+
+class Upload(object):
+    def __init__(self, data):
+        from io import BytesIO
+        self.stream = BytesIO(data)
+
+
+def create_storage(cache_timeout=0, cache_size=1000):
+    conn = boto.s3.connect_to_region('us-east-1')
+    conn.create_bucket('files')
+
+    return S3Storage('files', 'us-east-1', 'key_id', 'secret_key',
+                     cache_timeout=cache_timeout, cache_size=cache_size)
+
+
+class CountingBucket(object):
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.bucket, name)
+
+        if name in ('list', 'get_all_keys', 'get_key'):
+            def wrapper(*args, **kwargs):
+                self.calls.append(name)
+                return attr(*args, **kwargs)
+            return wrapper
+
+        return attr
+
+
+@mock_s3_deprecated
+def test_exists():
+    storage = create_storage()
+
+    storage.make_dir('', 'dir')
+    storage.save_file('dir/a.txt', Upload(b'abc'))
+    storage.save_file('implicit/b.txt', Upload(b'abc'))
+
+    ok_(storage.path_exists(''))
+    ok_(storage.path_exists('dir'))
+    ok_(storage.path_exists('dir/a.txt'))
+    ok_(storage.path_exists('implicit'))
+    ok_(not storage.path_exists('missing'))
+
+    ok_(storage.is_dir('dir'))
+    ok_(storage.is_dir('implicit'))
+    ok_(not storage.is_dir('dir/a.txt'))
+
+    ok_(not storage._is_directory_empty('dir'))
+    storage.delete_file('dir/a.txt')
+    ok_(storage._is_directory_empty('dir'))
+
+
+@mock_s3_deprecated
+def test_cache():
+    storage = create_storage(cache_timeout=60)
+
+    storage.make_dir('', 'dir')
+    storage.save_file('dir/a.txt', Upload(b'abc'))
+
+    bucket = storage.bucket = CountingBucket(storage.bucket)
+
+    eq_([f[0] for f in storage.get_files('dir', 'dir')], ['a.txt'])
+    ok_(storage.path_exists('dir/a.txt'))
+    eq_(len(bucket.calls), 2)
+
+    # Listings and lookups are served from the cache
+    eq_([f[0] for f in storage.get_files('dir', 'dir')], ['a.txt'])
+    ok_(storage.path_exists('dir/a.txt'))
+    eq_(len(bucket.calls), 2)
+
+    # Changes clear the cache
+    storage.save_file('dir/b.txt', Upload(b'abc'))
+    eq_(sorted(f[0] for f in storage.get_files('dir', 'dir')), ['a.txt', 'b.txt'])
+    eq_(len(bucket.calls), 3)
+
+
+@mock_s3_deprecated
+def test_cache_size():
+    storage = create_storage(cache_timeout=60, cache_size=1)
+
+    storage.make_dir('', 'dir')
+    storage.save_file('dir/a.txt', Upload(b'abc'))
+
+    bucket = storage.bucket = CountingBucket(storage.bucket)
+
+    eq_([f[0] for f in storage.get_files('dir', 'dir')], ['a.txt'])
+    eq_([f[0] for f in storage.get_files('', '')], ['dir'])
+    eq_(len(bucket.calls), 2)
+
+    # Least recently used listing was evicted
+    eq_([f[0] for f in storage.get_files('dir', 'dir')], ['a.txt'])
+    eq_(len(bucket.calls), 3)
@@ -93,6 +93,7 @@ def test_model():
     p = json.loads(group)
     eq_(p['coordinates'][0], 125.8)
     eq_(p['coordinates'][1], 10.0)
+    ok_('{"type":"MultiPoint","coordinates":[[100.0,0.0],[101.0,1.0]]}' in html)
 
     url = '/admin/geomodel/edit/?id=%s' % model.id
     rv = client.get(url)
@@ -1196,3 +1196,104 @@ def test_export_csv():
     data = rv.data.decode('utf-8')
     eq_(rv.status_code, 200)
     ok_(len(data.splitlines()) > 21)
+
+
+def test_select_related():
+    app, db, admin = setup()
+    Model1, Model2 = create_models(db)
+
+    class Model3(db.Document):
+        name = db.StringField()
+        refs = db.ListField(db.ReferenceField(Model1))
+
+    Model3.objects.delete()
+
+    first = Model1('first').save()
+    second = Model1('second').save()
+
+    for x in range(3):
+        Model2('string_field_val_%s' % x, model1=first if x % 2 else second).save()
+
+    Model3(name='refs', refs=[second, first]).save()
+
+    view = CustomModelView(Model2, column_list=['string_field', 'model1'],
+                           export_chunk_size=2)
+    admin.add_view(view)
+
+    count, data = view.get_list(0, None, None, None, [])
+    eq_(count, 3)
+
+    # References are replaced with documents loaded in a single query
+    for model in data:
+        ok_(isinstance(model._data['model1'], Model1))
+
+    eq_(sorted(m.model1.test1 for m in data), ['first', 'second', 'second'])
+
+    # Export loads references for every chunk
+    count, data = view.get_export_list(None, None, None, [])
+    data = list(data)
+    eq_(len(data), 3)
+
+    for model in data:
+        ok_(isinstance(model._data['model1'], Model1))
+
+    view = CustomModelView(Model3, column_list=['name', 'refs'])
+    admin.add_view(view)
+
+    count, data = view.get_list(0, None, None, None, [])
+    eq_([m.test1 for m in data[0]._data['refs']], ['second', 'first'])
+
+    view = CustomModelView(Model2, column_list=['string_field', 'model1'],
+                           column_auto_select_related=False,
+                           endpoint='no_select_related')
+    admin.add_view(view)
+
+    count, data = view.get_list(0, None, None, None, [])
+    ok_(not isinstance(data[0]._data['model1'], Model1))
+
+
+def test_api_file_view():
+    app, db, admin = setup()
+
+    class Model4(db.Document):
+        name = db.StringField()
+        data = db.FileField()
+
+    Model4.objects.delete()
+
+    model = Model4(name='file')
+    model.data.put(b'0123456789', content_type='text/plain')
+    model.save()
+
+    view = CustomModelView(Model4)
+    admin.add_view(view)
+
+    client = app.test_client()
+
+    url = '/admin/model4/api/file/?id=%s&coll=fs' % model.data.grid_id
+
+    # File is streamed instead of being read into memory
+    rv = client.get(url)
+    eq_(rv.status_code, 200)
+    eq_(rv.mimetype, 'text/plain')
+    eq_(rv.data, b'0123456789')
+    eq_(rv.headers['Accept-Ranges'], 'bytes')
+    ok_(rv.is_streamed)
+
+    etag = rv.headers['ETag']
+    ok_(etag)
+
+    # Not modified
+    rv = client.get(url, headers={'If-None-Match': etag})
+    eq_(rv.status_code, 304)
+    eq_(rv.data, b'')
+
+    # Range request
+    rv = client.get(url, headers={'Range': 'bytes=2-5'})
+    eq_(rv.status_code, 206)
+    eq_(rv.data, b'2345')
+    eq_(rv.headers['Content-Range'], 'bytes 2-5/10')
+
+    # Missing file
+    rv = client.get('/admin/model4/api/file/?id=%s&coll=fs' % ('0' * 24))
+    eq_(rv.status_code, 404)
@@ -1069,3 +1069,51 @@ def test_export_csv():
     data = rv.data.decode('utf-8')
     eq_(rv.status_code, 200)
     ok_(len(data.splitlines()) > 21)
+
+
+def test_select_related():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    for x in range(3):
+        model1 = Model1('test1_val_%s' % x)
+        model1.save()
+
+        Model2('char_field_val_%s' % x, model1=model1).save()
+
+    Model2('char_field_empty').save()
+
+    view = CustomModelView(Model2, column_list=['char_field', 'model1'],
+                           column_default_sort='char_field')
+    admin.add_view(view)
+
+    queries = []
+    execute_sql = db.execute_sql
+
+    def counting_execute_sql(sql, *args, **kwargs):
+        queries.append(sql)
+        return execute_sql(sql, *args, **kwargs)
+
+    db.execute_sql = counting_execute_sql
+
+    count, data = view.get_list(0, None, None, None, [])
+    eq_(count, 4)
+
+    del queries[:]
+
+    # Related models are loaded by the list query
+    eq_([m.model1.test1 if m.model1 else None for m in data],
+        ['test1_val_0', 'test1_val_1', 'test1_val_2', None])
+    eq_(queries, [])
+
+    view = CustomModelView(Model2, column_list=['char_field', 'model1'],
+                           column_auto_select_related=False,
+                           endpoint='no_select_related')
+    admin.add_view(view)
+
+    count, data = view.get_list(0, None, None, None, [])
+
+    del queries[:]
+    data[0].model1
+    eq_(len(queries), 1)
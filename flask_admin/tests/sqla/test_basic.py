@@ -1,13 +1,22 @@
-from nose.tools import eq_, ok_, raises, assert_true
+import re
+import json
+import warnings
+
+from nose.tools import eq_, ok_, raises, assert_true, assert_raises
 
 from wtforms import fields, validators
 
-from flask_admin import form
+from flask import Flask
+from flask_admin import Admin, form
 from flask_admin._compat import as_unicode
 from flask_admin._compat import iteritems
-from flask_admin.contrib.sqla import ModelView, filters, tools
+from flask_admin.contrib.sqla import ModelView, filters, search, tools
+from flask_admin.model.cache import MemoryListCache
+from flask_admin.model.fields import AjaxSelectMultipleField
 from flask_babelex import Babel
+from flask_sqlalchemy import SQLAlchemy
 
+from sqlalchemy import event
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from . import setup
@@ -386,6 +395,404 @@ def test_complex_searchable_list_missing_children():
     ok_('magic string' in data)
 
 
+def test_search_backend():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    db.session.add(Model2('first apple', 5000))
+    db.session.add(Model2('second orange', 9000))
+    db.session.commit()
+
+    db.session.execute('CREATE VIRTUAL TABLE model2_fts USING fts5(string_field)')
+    db.session.execute('INSERT INTO model2_fts (rowid, string_field) SELECT id, string_field FROM model2')
+    db.session.commit()
+
+    view = CustomModelView(Model2, db.session,
+                           column_searchable_list=['string_field'],
+                           search_backend=search.SQLiteFTS5Search('model2_fts'))
+    admin.add_view(view)
+
+    count, data = view.get_list(0, None, None, 'apple', None)
+    eq_(count, 1)
+    eq_(data[0].string_field, 'first apple')
+
+    count, data = view.get_list(0, None, None, 'orange "second', None)
+    eq_(count, 1)
+    eq_(data[0].string_field, 'second orange')
+
+    count, data = view.get_list(0, None, None, 'apple orange', None)
+    eq_(count, 0)
+
+    # PostgreSQL full-text search criterion
+    from sqlalchemy.dialects import postgresql
+
+    backend = search.PostgresFullTextSearch('simple')
+    stmt = backend.get_criterion(Model2, [Model2.string_field, Model2.int_field], 'apple')
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    ok_('to_tsvector' in sql)
+    ok_('websearch_to_tsquery' in sql)
+    ok_('@@' in sql)
+
+    ok_(backend.get_criterion(Model2, [Model2.string_field], '  ') is None)
+
+    # Trigram search does not cast string columns
+    stmt = search.PostgresTrigramSearch().get_criterion(Model2, [Model2.string_field], 'apple')
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    ok_('CAST' not in sql)
+    ok_('ILIKE' in sql)
+
+
+def test_list_fast_template():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    view1 = CustomModelView(Model1, db.session, endpoint='list',
+                            column_editable_list=['test1'],
+                            can_view_details=True)
+    view2 = CustomModelView(Model1, db.session, endpoint='list_fast',
+                            column_editable_list=['test1'],
+                            can_view_details=True,
+                            list_template='admin/model/list_fast.html')
+    admin.add_view(view1)
+    admin.add_view(view2)
+
+    fill_db(db, Model1, Model2)
+
+    client = app.test_client()
+
+    def get_table(url):
+        rv = client.get(url)
+        eq_(rv.status_code, 200)
+
+        data = rv.data.decode('utf-8')
+        data = data[data.index('<table'):data.index('</table>')]
+
+        # Compare markup of both views, ignoring whitespace and view URLs
+        data = data.replace('/admin/list_fast/', '/admin/list/')
+        data = data.replace('%2Fadmin%2Flist_fast%2F', '%2Fadmin%2Flist%2F')
+        return re.sub(r'\s+', '', data)
+
+    table = get_table('/admin/list_fast/')
+    ok_('test1_val_1' in table)
+    ok_('data-role="x-editable"' in table)
+    eq_(table, get_table('/admin/list/'))
+
+    # Without row actions
+    view1.column_display_actions = view2.column_display_actions = False
+    eq_(get_table('/admin/list_fast/'), get_table('/admin/list/'))
+
+
+def test_list_fast_template_adminlte():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = '1'
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///'
+
+    db = SQLAlchemy(app)
+    admin = Admin(app, template_mode='adminlte')
+
+    Model1, Model2 = create_models(db)
+
+    view = CustomModelView(Model1, db.session, column_editable_list=['test1'],
+                           list_template='admin/model/list_fast.html')
+    admin.add_view(view)
+
+    fill_db(db, Model1, Model2)
+
+    client = app.test_client()
+
+    rv = client.get('/admin/model1/')
+    eq_(rv.status_code, 200)
+
+    data = rv.data.decode('utf-8')
+    ok_('test1_val_1' in data)
+    ok_('data-role="x-editable"' in data)
+    ok_('list-buttons-column' in data)
+
+
+def test_column_editable_list_lazy():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    class CountingView(CustomModelView):
+        list_form_count = 0
+
+        def list_form(self, obj=None):
+            self.list_form_count += 1
+            return super(CountingView, self).list_form(obj)
+
+    views = []
+    for model, columns in ((Model1, ['test1', 'bool_field']),
+                           (Model2, ['string_field', 'int_field', 'bool_field'])):
+        for lazy in (False, True):
+            endpoint = '%s_%s' % (model.__name__.lower(), 'lazy' if lazy else 'eager')
+            view = CountingView(model, db.session, endpoint=endpoint,
+                                column_editable_list=columns,
+                                column_editable_list_lazy=lazy)
+            admin.add_view(view)
+            views.append(view)
+
+    fill_db(db, Model1, Model2)
+
+    client = app.test_client()
+
+    def get_table(endpoint):
+        rv = client.get('/admin/%s/' % endpoint)
+        eq_(rv.status_code, 200)
+
+        data = rv.data.decode('utf-8')
+        data = data[data.index('<table'):data.index('</table>')]
+
+        return data.replace(endpoint, 'view')
+
+    for name in ('model1', 'model2'):
+        eager = get_table('%s_eager' % name)
+        ok_('data-role="x-editable' in eager)
+        eq_(get_table('%s_lazy' % name), eager)
+
+    # Lazy views create a single form per page
+    eq_(views[1].list_form_count, 1)
+    ok_(views[0].list_form_count > 1)
+
+    # Inline editing still works
+    rv = client.post('/admin/model2_lazy/ajax/update/', data={
+        'list_form_pk': '1',
+        'int_field': '42',
+    })
+    eq_(rv.status_code, 200)
+    eq_(db.session.query(Model2).get(1).int_field, 42)
+
+
+def test_eager_load():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    view1 = CustomModelView(Model1, db.session, endpoint='model1',
+                            column_list=['test1', 'model2'],
+                            column_details_list=['test1', 'model2'],
+                            can_view_details=True)
+    view2 = CustomModelView(Model2, db.session, endpoint='model2',
+                            column_list=['string_field', 'model1.test1'])
+    view3 = CustomModelView(Model2, db.session, endpoint='explicit',
+                            column_list=['string_field'],
+                            eager_load={'list': ['model1.model2']})
+    admin.add_view(view1)
+    admin.add_view(view2)
+    admin.add_view(view3)
+
+    eq_(view1._auto_joins, ['model2'])
+    eq_(view2._auto_joins, ['model1'])
+    eq_(len(view2._eager_load['edit']), 1)
+    eq_(len(view3._eager_load['list']), 1)
+
+    for i in range(5):
+        parent = Model1(u'parent%s' % i)
+        db.session.add_all([parent,
+                            Model2(u'child%s_1' % i, model1=parent),
+                            Model2(u'child%s_2' % i, model1=parent)])
+    db.session.commit()
+
+    client = app.test_client()
+
+    def count_queries(url):
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        db.session.remove()
+
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            rv = client.get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        eq_(rv.status_code, 200)
+        return len(queries)
+
+    # Count, page and collection queries, regardless of the number of rows
+    eq_(count_queries('/admin/model1/'), 3)
+    eq_(count_queries('/admin/model1/details/?id=1'), 2)
+
+    # Many-to-one relations are joined
+    eq_(count_queries('/admin/model2/'), 2)
+
+    # Dotted paths are resolved to chained options
+    eq_(count_queries('/admin/explicit/'), 3)
+
+    # Loader options are only used by the view that needs them
+    db.session.remove()
+    model = view1.get_one('1')
+    ok_('model2' not in model.__dict__)
+
+    # Overridden get_one without loader options
+    class CustomGetOneView(CustomModelView):
+        def get_one(self, id):
+            self.loaded = id
+            return super(CustomGetOneView, self).get_one(id)
+
+    view4 = CustomGetOneView(Model1, db.session, endpoint='custom',
+                             column_details_list=['test1', 'model2'],
+                             can_view_details=True)
+    admin.add_view(view4)
+
+    eq_(count_queries('/admin/custom/details/?id=1'), 2)
+    eq_(view4.loaded, '1')
+
+
+def test_list_cache():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    class CountingView(CustomModelView):
+        get_list_count = 0
+
+        def get_list(self, *args, **kwargs):
+            self.get_list_count += 1
+            return super(CountingView, self).get_list(*args, **kwargs)
+
+    view = CountingView(Model1, db.session,
+                        column_list=['test1'],
+                        column_searchable_list=['test1'],
+                        column_default_sort='test1',
+                        form_columns=['test1'],
+                        list_cache=MemoryListCache())
+    admin.add_view(view)
+
+    fill_db(db, Model1, Model2)
+
+    client = app.test_client()
+
+    rv = client.get('/admin/model1/')
+    eq_(rv.status_code, 200)
+    eq_(view.get_list_count, 1)
+
+    # Same page is loaded from the cache
+    rv = client.get('/admin/model1/')
+    eq_(rv.status_code, 200)
+    eq_(view.get_list_count, 1)
+    data = rv.data.decode('utf-8')
+    ok_('test1_val_1' in data)
+    ok_(data.index('test1_val_1') < data.index('test1_val_2'))
+
+    # Different search is not cached yet
+    rv = client.get('/admin/model1/?search=test1_val_1')
+    eq_(rv.status_code, 200)
+    eq_(view.get_list_count, 2)
+
+    # Creating a record invalidates cached pages
+    rv = client.post('/admin/model1/new/', data=dict(test1='test1_cached'))
+    eq_(rv.status_code, 302)
+
+    rv = client.get('/admin/model1/')
+    eq_(view.get_list_count, 3)
+    ok_('test1_cached' in rv.data.decode('utf-8'))
+
+    # So does deleting a record
+    model = db.session.query(Model1).filter_by(test1='test1_cached').one()
+    rv = client.post('/admin/model1/delete/', data=dict(id=model.id))
+    eq_(rv.status_code, 302)
+
+    rv = client.get('/admin/model1/')
+    eq_(view.get_list_count, 4)
+    ok_('test1_cached' not in rv.data.decode('utf-8'))
+
+    # Scope is a part of the cache key
+    view.get_list_cache_scope = lambda: 'other'
+    rv = client.get('/admin/model1/')
+    eq_(view.get_list_count, 5)
+
+
+def test_to_many_search_and_filters():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    view = CustomModelView(Model1, db.session,
+                           column_searchable_list=['test1', 'model2.string_field'],
+                           column_filters=['model2'])
+    admin.add_view(view)
+
+    fill_db(db, Model1, Model2)
+
+    parent = Model1('parent')
+    db.session.add_all([
+        parent,
+        Model2('child_a', int_field=1, model1=parent),
+        Model2('child_b', int_field=2, model1=parent),
+        Model2('child_c', int_field=2),
+    ])
+    db.session.commit()
+
+    def get_filter(cls, name):
+        for idx, flt in enumerate(view._filters):
+            if type(flt) is cls and flt.column.key == name:
+                return idx
+
+    like_idx = get_filter(filters.FilterLike, 'string_field')
+    equal_idx = get_filter(filters.IntEqualFilter, 'int_field')
+
+    def get_list(search=None, filters=None):
+        count, data = view.get_list(0, None, None, search, filters or [])
+        eq_(count, len(data))
+        return [m.test1 for m in data]
+
+    # Every record is returned once, even if many related records match
+    eq_(get_list('child'), ['parent'])
+
+    # Records without related records are still found by their own columns
+    eq_(get_list('test1_val_3'), ['test1_val_3'])
+
+    eq_(get_list(filters=[(like_idx, 'string_field', 'child')]), ['parent'])
+
+    # Filters on the same path should match the same related record
+    eq_(get_list(filters=[(like_idx, 'string_field', 'child_b'),
+                          (equal_idx, 'int_field', '2')]), ['parent'])
+    eq_(get_list(filters=[(like_idx, 'string_field', 'child_a'),
+                          (equal_idx, 'int_field', '2')]), [])
+
+
+def test_to_many_legacy_filter():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    class LegacyFilter(filters.BaseSQLAFilter):
+        def apply(self, query, value):
+            return query.filter(self.column == value)
+
+        def operation(self):
+            return 'legacy'
+
+    view = CustomModelView(Model1, db.session,
+                           column_filters=[LegacyFilter(Model2.string_field, 'String')])
+    admin.add_view(view)
+
+    parent = Model1('parent')
+    db.session.add_all([
+        parent,
+        Model1('other'),
+        Model2('child_a', model1=parent),
+        Model2('child_b'),
+    ])
+    db.session.commit()
+
+    # Filter without `alias` argument is applied to the joined list query
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        count, data = view.get_list(0, None, None, None, [(0, 'string', 'child_a')])
+
+    eq_(count, 1)
+    eq_([m.test1 for m in data], ['parent'])
+    ok_(any('alias' in str(x.message) for x in w))
+
+
 def test_column_editable_list():
     app, db, admin = setup()
 
@@ -1672,6 +2079,136 @@ def test_multiple_delete():
     eq_(M1.query.count(), 0)
 
 
+def test_multiple_delete_chunks():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    db.session.add_all([M1('%s' % i) for i in range(7)])
+    db.session.commit()
+
+    class ModelView(CustomModelView):
+        def on_models_delete(self, models):
+            self.chunks.append(sorted(m.test1 for m in models))
+
+        def after_model_delete(self, model):
+            self.deleted.append(model.test1)
+
+    view = ModelView(M1, db.session, action_chunk_size=3, endpoint='slow')
+    view.chunks = []
+    view.deleted = []
+    admin.add_view(view)
+
+    count = view.delete_many(['1', '2', '3', '4', '100'])
+    eq_(count, 4)
+    eq_(view.chunks, [['0', '1', '2'], ['3']])
+    eq_(sorted(view.deleted), ['0', '1', '2', '3'])
+    eq_(M1.query.count(), 3)
+
+    view = ModelView(M1, db.session, action_chunk_size=3, fast_mass_delete=True,
+                     endpoint='fast')
+    view.chunks = []
+    view.deleted = []
+    admin.add_view(view)
+
+    ids = [str(m.id) for m in M1.query.all()]
+
+    client = app.test_client()
+
+    rv = client.post('/admin/fast/action/', data=dict(action='delete', rowid=ids))
+    eq_(rv.status_code, 302)
+    eq_(view.chunks, [['4', '5', '6']])
+    eq_(sorted(view.deleted), ['4', '5', '6'])
+    eq_(M1.query.count(), 0)
+
+
+def test_multiple_delete_custom_delete_model():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    db.session.add_all([M1('%s' % i) for i in range(3)])
+    db.session.commit()
+
+    class ModelView(CustomModelView):
+        def delete_model(self, model):
+            self.deleted.append(model.test1)
+            return super(ModelView, self).delete_model(model)
+
+    view = ModelView(M1, db.session, action_chunk_size=2)
+    view.deleted = []
+    admin.add_view(view)
+
+    ids = [str(m.id) for m in M1.query.all()]
+
+    client = app.test_client()
+
+    rv = client.post('/admin/model1/action/', data=dict(action='delete', rowid=ids))
+    eq_(rv.status_code, 302)
+    eq_(sorted(view.deleted), ['0', '1', '2'])
+    eq_(M1.query.count(), 0)
+
+
+def test_multiple_delete_errors():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    db.session.add_all([M1('%s' % i) for i in range(3)])
+    db.session.commit()
+
+    class ModelView(CustomModelView):
+        def on_model_delete(self, model):
+            if model.test1 == '1':
+                raise validators.ValidationError('protected')
+
+    view = ModelView(M1, db.session, action_chunk_size=2)
+    admin.add_view(view)
+
+    ids = [str(m.id) for m in M1.query.all()]
+
+    client = app.test_client()
+
+    # hook error vetoes the whole delete
+    rv = client.post('/admin/model1/action/', data=dict(action='delete', rowid=ids),
+                     follow_redirects=True)
+    eq_(rv.status_code, 200)
+    data = rv.data.decode('utf-8')
+    ok_('Failed to delete records. protected' in data)
+    eq_(M1.query.count(), 3)
+
+
+def test_multiple_delete_batch_hook_veto():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    db.session.add_all([M1('%s' % i) for i in range(3)])
+    db.session.commit()
+
+    class ModelView(CustomModelView):
+        def on_models_delete(self, models):
+            self.chunks.append(len(models))
+
+            if len(self.chunks) > 1:
+                raise ValueError('vetoed')
+
+        def on_model_delete(self, model):
+            self.deleted.append(model.test1)
+
+    ids = [str(m.id) for m in M1.query.all()]
+
+    for fast in (False, True):
+        view = ModelView(M1, db.session, action_chunk_size=2, fast_mass_delete=fast,
+                         endpoint='veto%s' % fast)
+        view.chunks = []
+        view.deleted = []
+        admin.add_view(view)
+
+        assert_raises(ValueError, view.delete_many, ids)
+
+        # no fallback to per-record deletes
+        eq_(view.chunks, [2, 1])
+        eq_(view.deleted, [])
+        eq_(M1.query.count(), 3)
+
+
 def test_default_sort():
     app, db, admin = setup()
     M1, _ = create_models(db)
@@ -2049,6 +2586,151 @@ def test_ajax_fk_multi():
     eq_(len(mdl.model1), 1)
 
 
+def test_ajax_lookup_options():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    view = CustomModelView(Model2, db.session, url='view',
+                           form_ajax_refs={
+                               'model1': {
+                                   'fields': ['test1'],
+                                   'search_backend': search.PrefixSearch(),
+                                   'min_length': 2,
+                                   'max_limit': 3,
+                                   'cache_timeout': 60,
+                                   'cache_scope': lambda: scope[0]
+                               }
+                           })
+    admin.add_view(view)
+
+    scope = ['first']
+
+    db.session.add_all([Model1(u'Foo'), Model1(u'foobar'), Model1(u'barfoo'),
+                        Model1(u'f%o')])
+    db.session.add_all([Model1(u'item%s' % i) for i in range(5)])
+    db.session.commit()
+
+    client = app.test_client()
+
+    def lookup(query, **kwargs):
+        rv = client.get('/admin/view/ajax/lookup/', query_string=dict(name='model1', query=query, **kwargs))
+        eq_(rv.status_code, 200)
+        return sorted(name for _, name in json.loads(rv.data.decode('utf-8')))
+
+    # Case-insensitive prefix match
+    eq_(lookup(u'foo'), [u'Foo', u'foobar'])
+
+    # Wildcards are matched literally
+    eq_(lookup(u'f%'), [u'f%o'])
+
+    # Short terms do not run a query
+    eq_(lookup(u'f'), [])
+
+    # Limit is capped
+    eq_(len(lookup(u'item', limit=100)), 3)
+
+    # Results are cached
+    db.session.add(Model1(u'food'))
+    db.session.commit()
+    eq_(lookup(u'foo'), [u'Foo', u'foobar'])
+
+    # Cached results are not shared between scopes
+    scope[0] = 'second'
+    eq_(lookup(u'foo'), [u'Foo', u'foobar', u'food'])
+
+    view._form_ajax_refs['model1']._cache = None
+    eq_(lookup(u'foo'), [u'Foo', u'foobar', u'food'])
+
+
+def test_ajax_get_many():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    view = CustomModelView(Model2, db.session, url='view',
+                           form_ajax_refs={'model1': {'fields': ['test1']}})
+    admin.add_view(view)
+
+    first, second = Model1(u'first'), Model1(u'second')
+    db.session.add_all([first, second])
+    db.session.commit()
+
+    loader = view._form_ajax_refs['model1']
+
+    # Order of the keys is preserved, missing models are None
+    eq_(loader.get_many([as_unicode(second.id), as_unicode(first.id), u'999']),
+        [second, first, None])
+    eq_(loader.get_many([]), [])
+
+    class AjaxForm(form.BaseForm):
+        model1 = AjaxSelectMultipleField(loader)
+
+    field = AjaxForm().model1
+
+    field.process_formdata([u'%s,%s' % (second.id, first.id)])
+    eq_(field.data, [second, first])
+    ok_(not field._invalid_formdata)
+
+    field.process_formdata([u'%s,999' % first.id])
+    eq_(field.data, [first])
+    ok_(field._invalid_formdata)
+
+
+def test_ajax_fk_threshold():
+    app, db, admin = setup()
+
+    Model1, Model2 = create_models(db)
+
+    model = Model1(u'first')
+    model2 = Model1(u'foo', u'bar')
+    db.session.add_all([model, model2])
+    db.session.commit()
+
+    model_id, model2_id = model.id, model2.id
+
+    # related table is small enough for a regular select
+    view = CustomModelView(Model2, db.session, endpoint='small',
+                           form_ajax_refs_threshold=2)
+    admin.add_view(view)
+
+    eq_(view.create_form().model1.__class__.__name__, u'QuerySelectField')
+
+    # forms scaffolded after the create form are not forced to AJAX
+    ok_(u'model1' not in view._form_ajax_refs)
+    eq_(view.edit_form().model1.__class__.__name__, u'QuerySelectField')
+
+    # decision is remembered until it expires
+    db.session.add(Model1(u'bar'))
+    db.session.commit()
+
+    eq_(view.create_form().model1.__class__.__name__, u'QuerySelectField')
+
+    view.form_ajax_refs_threshold_timeout = 0
+    view._create_form_class.model1._decision = None
+    eq_(view.create_form().model1.__class__.__name__, u'AjaxSelectField')
+
+    # related table is too large, use AJAX select
+    view = CustomModelView(Model2, db.session, endpoint='large',
+                           form_ajax_refs_threshold=1)
+    admin.add_view(view)
+
+    ok_(u'model1' in view._form_ajax_threshold_refs)
+    eq_(view.create_form().model1.__class__.__name__, u'AjaxSelectField')
+    eq_(view.edit_form().model1.__class__.__name__, u'AjaxSelectField')
+
+    client = app.test_client()
+
+    req = client.get(u'/admin/large/ajax/lookup/?name=model1&query=foo')
+    eq_(req.data.decode('utf-8'), u'[[%s, "foo"]]' % model2_id)
+
+    req = client.post('/admin/large/new/', data={u'model1': as_unicode(model_id)})
+    eq_(req.status_code, 302)
+
+    mdl = db.session.query(Model2).first()
+    eq_(mdl.model1.id, model_id)
+
+
 def test_safe_redirect():
     app, db, admin = setup()
     Model1, _ = create_models(db)
@@ -2094,6 +2776,87 @@ def test_simple_list_pager():
     assert_true(count is None)
 
 
+def test_count_strategy():
+    app, db, admin = setup()
+    Model1, _ = create_models(db)
+
+    db.session.add_all([Model1('test1'), Model1('test2')])
+    db.session.commit()
+
+    # cached count
+    view = CustomModelView(Model1, db.session, count_strategy='cached',
+                           column_searchable_list=['test1'], endpoint='cached')
+    admin.add_view(view)
+
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 2)
+
+    db.session.add(Model1('test3'))
+    db.session.commit()
+
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 2)
+
+    count, _ = view.get_list(0, None, None, 'test3', None)
+    eq_(count, 1)
+
+    # counts are not shared between scopes
+    view.get_list_cache_scope = lambda: 'tenant'
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 3)
+    del view.get_list_cache_scope
+
+    # invalidation drops remembered counts
+    view.invalidate_list_cache()
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 3)
+
+    # expired counts are not used
+    view.count_cache_timeout = 0
+    view._count_cache.clear()
+
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 3)
+
+    db.session.add(Model1('test4'))
+    db.session.commit()
+
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 4)
+
+    # planner estimate is not available for sqlite, falls back to exact count
+    view = CustomModelView(Model1, db.session, count_strategy='estimate',
+                           endpoint='estimate')
+    admin.add_view(view)
+
+    count, _ = view.get_list(0, None, None, None, None)
+    eq_(count, 4)
+
+    # lazy count
+    view = CustomModelView(Model1, db.session, count_strategy='lazy',
+                           column_searchable_list=['test1'], endpoint='lazy')
+    admin.add_view(view)
+
+    count, _ = view.get_list(0, None, None, None, None)
+    ok_(count is None)
+
+    client = app.test_client()
+
+    rv = client.get('/admin/lazy/')
+    eq_(rv.status_code, 200)
+    ok_(b'/admin/lazy/ajax/count/' in rv.data)
+
+    rv = client.get('/admin/lazy/ajax/count/')
+    eq_(rv.status_code, 200)
+    eq_(json.loads(rv.data.decode('utf-8')), {'count': 4})
+
+    rv = client.get('/admin/lazy/ajax/count/?search=test3')
+    eq_(json.loads(rv.data.decode('utf-8')), {'count': 1})
+
+    rv = client.get('/admin/cached/ajax/count/')
+    eq_(rv.status_code, 404)
+
+
 def test_unlimited_page_size():
     app, db, admin = setup()
     M1, _ = create_models(db)
@@ -2265,3 +3028,196 @@ def test_export_csv():
     data = rv.data.decode('utf-8')
     eq_(rv.status_code, 200)
     ok_(len(data.splitlines()) > 21)
+
+    # test export streamed in chunks
+    view = CustomModelView(Model1, db.session, can_export=True,
+                           column_list=['test1', 'test2'], export_chunk_size=3,
+                           endpoint='chunked')
+    admin.add_view(view)
+
+    rv = client.get('/admin/chunked/export/csv/')
+    chunked_data = rv.data.decode('utf-8')
+    eq_(rv.status_code, 200)
+    eq_(chunked_data, data)
+
+    count, rows = view.get_export_list(None, None, None, None)
+    ok_(not isinstance(rows, list))
+    eq_(len(list(rows)), count)
+
+
+def test_keyset_pagination():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    db.session.add_all([M1('%02d' % (i % 3), test2='item%02d' % i) for i in range(7)])
+    db.session.commit()
+
+    view = CustomModelView(M1, db.session, keyset_pagination=True, page_size=3,
+                           column_list=['test1', 'test2'])
+    admin.add_view(view)
+
+    # first page
+    _, data = view.get_list(None, None, None, None, None, page_size=4)
+    data, prev_cursor, next_cursor = view.get_list_cursors(data, None, 3)
+    eq_([m.test2 for m in data], ['item00', 'item01', 'item02'])
+    ok_(prev_cursor is None)
+    ok_(next_cursor is not None)
+
+    # next page
+    _, data = view.get_list(None, None, None, None, None, page_size=4, cursor=next_cursor)
+    data, prev_cursor, next_cursor = view.get_list_cursors(data, next_cursor, 3)
+    eq_([m.test2 for m in data], ['item03', 'item04', 'item05'])
+
+    # last page
+    cursor = next_cursor
+    _, data = view.get_list(None, None, None, None, None, page_size=4, cursor=cursor)
+    data, _, next_cursor = view.get_list_cursors(data, cursor, 3)
+    eq_([m.test2 for m in data], ['item06'])
+    ok_(next_cursor is None)
+
+    # previous page
+    _, data = view.get_list(None, None, None, None, None, page_size=4, cursor=prev_cursor)
+    data, prev_cursor, _ = view.get_list_cursors(data, prev_cursor, 3)
+    eq_([m.test2 for m in data], ['item00', 'item01', 'item02'])
+    ok_(prev_cursor is None)
+
+    # sorting by column with duplicate values uses primary key as tie breaker
+    seen = []
+    cursor = None
+    while True:
+        _, data = view.get_list(None, 'test1', True, None, None, page_size=4, cursor=cursor)
+        data, _, cursor = view.get_list_cursors(data, cursor, 3)
+        seen.extend(m.test2 for m in data)
+        if cursor is None:
+            break
+
+    eq_(seen, ['item05', 'item02', 'item04', 'item01', 'item06', 'item03', 'item00'])
+
+    # list view emits cursor links instead of page numbers
+    client = app.test_client()
+
+    rv = client.get('/admin/model1/')
+    eq_(rv.status_code, 200)
+    data = rv.data.decode('utf-8')
+    ok_('item02' in data)
+    ok_('item03' not in data)
+    ok_('cursor=' in data)
+    ok_('page=1' not in data)
+
+    # malformed cursor falls back to the first page
+    rv = client.get('/admin/model1/?cursor=garbage')
+    eq_(rv.status_code, 200)
+    ok_('item00' in rv.data.decode('utf-8'))
+
+
+def test_keyset_pagination_nulls():
+    app, db, admin = setup()
+    M1, _ = create_models(db)
+
+    # NULL values of the sort column cross page boundaries
+    db.session.add_all([M1(None if i % 2 else '%02d' % i, test2='item%02d' % i) for i in range(7)])
+    db.session.commit()
+
+    view = CustomModelView(M1, db.session, keyset_pagination=True, page_size=2,
+                           column_list=['test1', 'test2'],
+                           column_sortable_list=['test1'])
+    admin.add_view(view)
+
+    # NULL criteria are only added for nullable columns
+    ok_(view._is_nullable_column(M1.test1))
+    ok_(not view._is_nullable_column(M1.id))
+    ok_(not view._is_nullable_column(M1.__table__.c.id))
+
+    def walk(sort_desc):
+        pages = []
+        cursor = None
+        while True:
+            _, data = view.get_list(None, 'test1', sort_desc, None, None, page_size=3, cursor=cursor)
+            data, prev_cursor, cursor = view.get_list_cursors(data, cursor, 2)
+            pages.append(([m.test2 for m in data], prev_cursor))
+            if cursor is None:
+                return pages
+
+    # SQLite puts NULLs before other values in ascending order
+    pages = walk(False)
+    eq_(sum([p for p, _ in pages], []),
+        ['item01', 'item03', 'item05', 'item00', 'item02', 'item04', 'item06'])
+
+    # Previous page cursor from a page that starts with NULL
+    _, data = view.get_list(None, 'test1', False, None, None, page_size=3, cursor=pages[1][1])
+    data, _, _ = view.get_list_cursors(data, pages[1][1], 2)
+    eq_([m.test2 for m in data], pages[0][0])
+
+    pages = walk(True)
+    eq_(sum([p for p, _ in pages], []),
+        ['item06', 'item04', 'item02', 'item00', 'item05', 'item03', 'item01'])
+
+    _, data = view.get_list(None, 'test1', True, None, None, page_size=3, cursor=pages[2][1])
+    data, _, _ = view.get_list_cursors(data, pages[2][1], 2)
+    eq_([m.test2 for m in data], pages[1][0])
+
+    # list view follows next page links
+    client = app.test_client()
+
+    seen = []
+    url = '/admin/model1/?sort=0'
+    while True:
+        rv = client.get(url)
+        eq_(rv.status_code, 200)
+        data = rv.data.decode('utf-8')
+        seen.append(re.findall(r'item\d\d', data))
+
+        match = re.search(r'href="([^"]*cursor=[^"]*)"[^>]*>\s*(?:&raquo;|&gt;|\xbb)', data)
+        if not match:
+            break
+
+        url = match.group(1).replace('&amp;', '&')
+
+    eq_(seen, [['item01', 'item03'], ['item05', 'item00'], ['item02', 'item04'], ['item06']])
+
+
+def test_auto_projection():
+    app, db, admin = setup()
+    Model1, Model2 = create_models(db)
+    fill_db(db, Model1, Model2)
+
+    from sqlalchemy import inspect
+
+    view = CustomModelView(Model2, db.session, column_auto_projection=True,
+                           column_list=['string_field', 'model1'],
+                           column_export_list=['int_field'])
+    admin.add_view(view)
+
+    _, data = view.get_list(0, None, None, None, None)
+    ok_(data)
+
+    unloaded = inspect(data[0]).unloaded
+    ok_('string_field' not in unloaded)
+    ok_('model1_id' not in unloaded)
+    ok_('int_field' in unloaded)
+    ok_('float_field' in unloaded)
+
+    db.session.expunge_all()
+
+    _, rows = view.get_export_list(None, None, None, None)
+    unloaded = inspect(next(rows)).unloaded
+    ok_('int_field' not in unloaded)
+    ok_('string_field' in unloaded)
+
+    client = app.test_client()
+    rv = client.get('/admin/model2/')
+    eq_(rv.status_code, 200)
+    ok_('test2_val_1' in rv.data.decode('utf-8'))
+
+    # virtual columns disable projection
+    view = CustomModelView(Model2, db.session, column_auto_projection=True,
+                           column_list=['string_field', 'virtual'],
+                           column_formatters=dict(virtual=lambda v, c, m, p: m.int_field),
+                           endpoint='virtual')
+
+    db.session.expunge_all()
+
+    _, data = view.get_list(0, None, None, None, None)
+    unloaded = inspect(data[0]).unloaded
+    ok_('int_field' not in unloaded)
+    ok_('float_field' not in unloaded)
@@ -1,5 +1,6 @@
 import os
 import os.path as op
+import logging
 
 from io import BytesIO
 
@@ -248,6 +249,119 @@ def test_image_upload_field():
             ok_(my_form.validate())
 
 
+def test_image_thumbnails():
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    app = Flask(__name__)
+
+    path = _create_temp()
+
+    def _remove_testimages():
+        for name in ('test1.jpg', 'test1_thumb.jpg', 'test1_thumb_large.jpg'):
+            safe_delete(path, name)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    class TestForm(form.BaseForm):
+        upload = form.ImageUploadField('Upload',
+                                       base_path=path,
+                                       thumbnail_size=(10, 10, True),
+                                       thumbnail_sizes={'large': (40, 40, False)},
+                                       thumbnail_executor=executor)
+
+    class TestLazyForm(form.BaseForm):
+        upload = form.ImageUploadField('Upload',
+                                       base_path=path,
+                                       thumbnail_size=(10, 10, True),
+                                       thumbnail_sizes={'large': (40, 40, False)},
+                                       lazy_thumbnails=True)
+
+    class Dummy(object):
+        pass
+
+    def _create_image():
+        data = BytesIO()
+        form.upload.Image.new('RGB', (80, 60), (255, 0, 0)).save(data, 'JPEG')
+        data.seek(0)
+        return data
+
+    _remove_testimages()
+
+    # Thumbnails are generated by the executor
+    with app.test_request_context(method='POST', data={'upload': (_create_image(), 'test1.jpg')}):
+        my_form = TestForm(helpers.get_form_data())
+        ok_(my_form.validate())
+
+        dummy = Dummy()
+        my_form.populate_obj(dummy)
+
+    executor.shutdown(wait=True)
+
+    eq_(dummy.upload, 'test1.jpg')
+    eq_(form.upload.Image.open(op.join(path, 'test1_thumb.jpg')).size, (10, 10))
+    ok_(max(form.upload.Image.open(op.join(path, 'test1_thumb_large.jpg')).size) <= 40)
+
+    _remove_testimages()
+
+    # Lazy thumbnails are generated on the first request
+    with app.test_request_context(method='POST', data={'upload': (_create_image(), 'test1.jpg')}):
+        my_form = TestLazyForm(helpers.get_form_data())
+        ok_(my_form.validate())
+
+        dummy = Dummy()
+        my_form.populate_obj(dummy)
+
+    ok_(op.exists(op.join(path, 'test1.jpg')))
+    ok_(not op.exists(op.join(path, 'test1_thumb.jpg')))
+
+    my_form = TestLazyForm()
+    eq_(my_form.upload.get_thumbnail('test1.jpg', 'large'), op.join(path, 'test1_thumb_large.jpg'))
+    ok_(op.exists(op.join(path, 'test1_thumb_large.jpg')))
+
+    # Deletion removes all thumbnails
+    with app.test_request_context(method='POST', data={'_upload-delete': 'checked'}):
+        my_form = TestLazyForm(helpers.get_form_data())
+        ok_(my_form.validate())
+        my_form.populate_obj(dummy)
+
+    ok_(not op.exists(op.join(path, 'test1.jpg')))
+    ok_(not op.exists(op.join(path, 'test1_thumb_large.jpg')))
+
+    # Errors of the background thumbnails are logged
+    class FailingExecutor(object):
+        def submit(self, func, *args):
+            future = Future()
+            future.set_exception(IOError('Thumbnail failed'))
+            return future
+
+    class TestFailingForm(form.BaseForm):
+        upload = form.ImageUploadField('Upload',
+                                       base_path=path,
+                                       thumbnail_size=(10, 10, True),
+                                       thumbnail_executor=FailingExecutor())
+
+    records = []
+
+    class Handler(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    handler = Handler()
+    logging.getLogger('flask-admin.upload').addHandler(handler)
+
+    try:
+        with app.test_request_context(method='POST', data={'upload': (_create_image(), 'test1.jpg')}):
+            my_form = TestFailingForm(helpers.get_form_data())
+            ok_(my_form.validate())
+            my_form.populate_obj(dummy)
+    finally:
+        logging.getLogger('flask-admin.upload').removeHandler(handler)
+
+    eq_(records, ['Failed to generate thumbnail: Thumbnail failed'])
+
+    _remove_testimages()
+
+
 def test_relative_path():
     app = Flask(__name__)
 
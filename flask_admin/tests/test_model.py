@@ -1,3 +1,9 @@
+import os
+import json
+import stat
+import time
+import tempfile
+
 import wtforms
 
 from nose.tools import eq_, ok_
@@ -11,7 +17,7 @@ from wtforms import fields
 
 from flask_admin import Admin, form
 from flask_admin._compat import iteritems, itervalues
-from flask_admin.model import base, filters
+from flask_admin.model import base, filters, jobs
 from flask_admin.model.template import macro
 
 
@@ -745,6 +751,135 @@ def test_export_csv():
     eq_(rv.status_code, 500)
 
 
+def test_export_async():
+    app, admin = setup()
+    client = app.test_client()
+
+    view_data = {
+        1: Model(1, "col1_1", "col2_1"),
+        2: Model(2, "col1_2", "col2_2"),
+        3: Model(3, "col1_3", "col2_3"),
+    }
+
+    # async export is disabled
+    view = MockModelView(Model, view_data, can_export=True,
+                         column_list=['col1', 'col2'], endpoint='sync')
+    admin.add_view(view)
+
+    rv = client.get('/admin/sync/export/csv/async/')
+    eq_(rv.status_code, 404)
+
+    registry = jobs.JobRegistry(directory=tempfile.mkdtemp())
+    view = MockModelView(Model, view_data, can_export=True, export_async=True,
+                         export_chunk_size=2, job_registry=registry,
+                         column_list=['col1', 'col2'])
+    admin.add_view(view)
+
+    rv = client.get('/admin/model/export/csv/async/')
+    eq_(rv.status_code, 200)
+    job = json.loads(rv.data.decode('utf-8'))
+    ok_(job['status'] in (jobs.JOB_PENDING, jobs.JOB_RUNNING, jobs.JOB_DONE))
+
+    for _ in range(50):
+        rv = client.get(job['status_url'])
+        eq_(rv.status_code, 200)
+        job = json.loads(rv.data.decode('utf-8'))
+
+        if job['status'] != jobs.JOB_PENDING and job['status'] != jobs.JOB_RUNNING:
+            break
+
+        time.sleep(0.1)
+
+    eq_(job['status'], jobs.JOB_DONE)
+    eq_(job['progress'], 3)
+    eq_(job['total'], 3)
+
+    rv = client.get(job['download_url'])
+    eq_(rv.status_code, 200)
+    eq_(rv.mimetype, 'text/csv')
+    ok_('attachment' in rv.headers['Content-Disposition'])
+    eq_(rv.data.decode('utf-8'),
+        "Col1,Col2\r\n"
+        "col1_1,col2_1\r\n"
+        "col1_2,col2_2\r\n"
+        "col1_3,col2_3\r\n")
+    rv.close()
+
+    # job files are private
+    if hasattr(os, 'getuid'):
+        eq_(stat.S_IMODE(os.stat(registry.get_path(job['id'], 'json')).st_mode), 0o600)
+        eq_(stat.S_IMODE(os.stat(registry.get_path(job['id'], 'data')).st_mode), 0o600)
+
+    # unknown jobs
+    rv = client.get('/admin/model/export/job/%s/' % ('0' * 32))
+    eq_(rv.status_code, 404)
+    rv = client.get('/admin/model/export/job/..%2Fjob/download/')
+    eq_(rv.status_code, 404)
+
+    # jobs of other views
+    other = MockModelView(Model, view_data, can_export=True, export_async=True,
+                          job_registry=registry, endpoint='other')
+    admin.add_view(other)
+
+    rv = client.get('/admin/other/export/job/%s/' % job['id'])
+    eq_(rv.status_code, 404)
+    rv = client.get('/admin/other/export/job/%s/download/' % job['id'])
+    eq_(rv.status_code, 404)
+
+    # jobs of other users
+    view.get_job_user = lambda: 'other'
+
+    rv = client.get(job['status_url'])
+    eq_(rv.status_code, 404)
+    rv = client.get(job['download_url'])
+    eq_(rv.status_code, 404)
+
+
+def test_job_registry_directory():
+    directory = os.path.join(tempfile.mkdtemp(), 'jobs')
+    registry = jobs.JobRegistry(directory=directory)
+
+    job = registry.create('test', endpoint='model', user=1)
+
+    if hasattr(os, 'getuid'):
+        eq_(stat.S_IMODE(os.stat(directory).st_mode) & 0o077, 0)
+
+    job = registry.get(job.id)
+    eq_(job.endpoint, 'model')
+    eq_(job.user, 1)
+
+
+def test_list_value():
+    class SubModel(Model):
+        pass
+
+    view = MockModelView(
+        Model,
+        column_formatters={'SubModel.col2': lambda v, c, m, p: 'sub'},
+        column_type_formatters={int: lambda view, value: value * 10},
+        column_choices={'col3': [(3, 'three')]},
+    )
+
+    model = Model(1, c1=1, c2=2, c3=3)
+    eq_(view.get_list_value(None, model, 'col1'), 10)
+    eq_(view.get_list_value(None, model, 'col2'), 20)
+    eq_(view.get_list_value(None, model, 'col3'), 'three')
+
+    # type formatters are resolved by the concrete value type
+    model.col1 = True
+    eq_(view.get_list_value(None, model, 'col1'), 10)
+    model.col1 = 'text'
+    eq_(view.get_list_value(None, model, 'col1'), 'text')
+
+    # class specific formatters
+    sub_model = SubModel(2, c2=2)
+    eq_(view.get_list_value(None, sub_model, 'col2'), 'sub')
+    eq_(view.get_list_value(None, model, 'col2'), 20)
+
+    # export uses its own formatters
+    eq_(view.get_export_value(model, 'col2'), 2)
+
+
 def test_list_row_actions():
     app, admin = setup()
     client = app.test_client()
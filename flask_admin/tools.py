@@ -1,3 +1,4 @@
+import os
 import sys
 import traceback
 
@@ -101,6 +102,63 @@ def get_dict_attr(obj, attr, default=None):
     return default
 
 
+def iterchunks(iter, size):
+    """
+        Split enumerable into lists with at most `size` items.
+
+        :param iter:
+            Enumerable
+        :param size:
+            Maximum number of items in a list
+    """
+    chunk = []
+
+    for item in iter:
+        chunk.append(item)
+
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def make_private_dir(path):
+    """
+        Create directory that is only accessible by the current user.
+
+        Raises exception if directory already exists and belongs to a
+        different user.
+
+        :param path:
+            Directory path
+    """
+    try:
+        os.makedirs(path, 0o700)
+    except OSError:
+        # Directory was created by another thread or process
+        if not os.path.isdir(path):
+            raise
+
+    if hasattr(os, 'getuid') and os.stat(path).st_uid != os.getuid():
+        raise Exception('Directory %s belongs to a different user.' % path)
+
+
+def open_private_file(path, mode='wb'):
+    """
+        Create or truncate file that is only readable and writable by the
+        current user and open it for writing.
+
+        :param path:
+            File path
+        :param mode:
+            File mode for `os.fdopen`
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    return os.fdopen(os.open(path, flags, 0o600), mode)
+
+
 def escape(value):
     return (as_unicode(value)
             .replace(CHAR_ESCAPE, CHAR_ESCAPE + CHAR_ESCAPE)